@@ -0,0 +1,11 @@
+"""Benchmarks de los gestores y de `JsonStorage` sobre datasets sintéticos.
+
+- `generador`: datasets deterministas de 1k a 1M empleados con contratos.
+- `ejecucion`: mide cada operación y guarda los resultados en JSON.
+- `comparacion`: compara resultados contra una línea base y marca regresiones.
+
+Uso (desde la raíz del repositorio, con ``src`` en el ``PYTHONPATH``)::
+
+    python -m benchmarks run --sizes 1000,10000 --output base.json
+    python -m benchmarks run --sizes 1000,10000 --baseline base.json
+"""
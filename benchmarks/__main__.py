@@ -0,0 +1,115 @@
+"""Línea de comandos de los benchmarks: ``python -m benchmarks``."""
+from typing import List, Optional, Tuple
+import sys
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from .comparacion import DIFERENCIA_MINIMA, TOLERANCIA, comparar
+from .ejecucion import OPERACIONES, cargar_resultados, ejecutar, guardar_resultados
+from .generador import TAMANOS, escribir_dataset
+
+console = Console()
+
+DIRECTORIO_DATOS = "benchmarks/datos"
+ARCHIVO_RESULTADOS = "benchmarks/resultados/ultimo.json"
+
+
+def _ms(segundos: float) -> str:
+    return f"{segundos * 1000:.3f}"
+
+
+def _print_resultados(resultados: dict) -> None:
+    table = Table(title="Benchmarks (ms)")
+    for columna in ("Tamaño", "Operación", "Mínimo", "Mediana", "Media"):
+        table.add_column(columna)
+    for r in resultados["resultados"]:
+        table.add_row(str(r["tamano"]), r["operacion"], _ms(r["minimo"]), _ms(r["mediana"]), _ms(r["media"]))
+    console.print(table)
+
+
+def _print_comparacion(filas: List[dict]) -> bool:
+    """Imprimir la comparación y retornar True si hubo alguna regresión."""
+    table = Table(title="Comparación con la línea base (mediana, ms)")
+    for columna in ("Tamaño", "Operación", "Base", "Actual", "Cambio"):
+        table.add_column(columna)
+    for f in filas:
+        cambio = f"{f['cambio']:+.1%}"
+        if f["regresion"]:
+            cambio = f"[bold red]{cambio} REGRESIÓN[/bold red]"
+        table.add_row(str(f["tamano"]), f["operacion"], _ms(f["base"]), _ms(f["actual"]), cambio)
+    console.print(table)
+    regresiones = sum(f["regresion"] for f in filas)
+    if regresiones:
+        console.print(f":x: {regresiones} operaciones más lentas que la línea base")
+    else:
+        console.print(":white_check_mark: Sin regresiones")
+    return bool(regresiones)
+
+
+@click.group()
+def main():
+    """Benchmarks del gestor de empleados sobre datasets sintéticos."""
+    pass
+
+
+@main.command(name="generate")
+@click.option("--size", "tamano", type=click.IntRange(min=1), required=True, help="Cantidad de empleados")
+@click.option("--seed", "semilla", type=int, default=0, help="Semilla del generador")
+@click.option("--output", "salida", required=True, help="Archivo JSON a crear")
+def cli_generate(tamano: int, semilla: int, salida: str):
+    """Generar un dataset sintético de empleados."""
+    escribir_dataset(salida, tamano, semilla)
+    console.print(f":white_check_mark: {tamano} empleados escritos en [bold]{salida}[/bold]")
+
+
+@main.command(name="run")
+@click.option("--sizes", "tamanos", default=",".join(str(t) for t in TAMANOS[:3]), help="Tamaños separados por coma")
+@click.option("--repeat", "repeticiones", type=click.IntRange(min=1), default=5, help="Repeticiones por operación")
+@click.option("--op", "operaciones", multiple=True, type=click.Choice([n for n, _ in OPERACIONES]), help="Medir solo estas operaciones")
+@click.option("--seed", "semilla", type=int, default=0, help="Semilla del generador")
+@click.option("--data-dir", "directorio_datos", default=DIRECTORIO_DATOS, help="Directorio de los datasets generados")
+@click.option("--output", "salida", default=ARCHIVO_RESULTADOS, help="Archivo JSON de resultados")
+@click.option("--baseline", "base", default=None, help="Resultados previos contra los que comparar")
+@click.option("--tolerance", "tolerancia", type=float, default=TOLERANCIA, help="Aumento relativo permitido")
+def cli_run(
+    tamanos: str,
+    repeticiones: int,
+    operaciones: Tuple[str, ...],
+    semilla: int,
+    directorio_datos: str,
+    salida: str,
+    base: Optional[str],
+    tolerancia: float
+):
+    """Medir las operaciones y guardar los resultados.
+
+    Con --baseline termina con código 1 si alguna operación empeoró.
+    """
+    try:
+        lista_tamanos = [int(t) for t in tamanos.split(",") if t.strip()]
+    except ValueError:
+        raise click.BadParameter("deben ser enteros separados por coma", param_hint="--sizes")
+    resultados = ejecutar(lista_tamanos, directorio_datos, repeticiones, operaciones or None, semilla)
+    guardar_resultados(salida, resultados)
+    _print_resultados(resultados)
+    console.print(f"Resultados guardados en [bold]{salida}[/bold]")
+    if base is not None and _print_comparacion(comparar(cargar_resultados(base), resultados, tolerancia)):
+        sys.exit(1)
+
+
+@main.command(name="compare")
+@click.argument("base")
+@click.argument("actual")
+@click.option("--tolerance", "tolerancia", type=float, default=TOLERANCIA, help="Aumento relativo permitido")
+@click.option("--min-diff", "diferencia_minima", type=float, default=DIFERENCIA_MINIMA, help="Aumento mínimo en segundos para reportar")
+def cli_compare(base: str, actual: str, tolerancia: float, diferencia_minima: float):
+    """Comparar dos archivos de resultados; código 1 si hay regresiones."""
+    filas = comparar(cargar_resultados(base), cargar_resultados(actual), tolerancia, diferencia_minima)
+    if _print_comparacion(filas):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Comparación de resultados de benchmarks contra una línea base."""
+from typing import Any, Dict, List, Tuple
+
+# Aumento relativo de la mediana a partir del cual se considera una regresión
+TOLERANCIA = 0.25
+
+# Diferencias absolutas menores a esta (en segundos) se consideran ruido
+DIFERENCIA_MINIMA = 0.0005
+
+
+def _por_clave(resultados: Dict[str, Any]) -> Dict[Tuple[int, str], Dict[str, Any]]:
+    return {(r["tamano"], r["operacion"]): r for r in resultados.get("resultados", [])}
+
+
+def comparar(
+    base: Dict[str, Any],
+    actual: Dict[str, Any],
+    tolerancia: float = TOLERANCIA,
+    diferencia_minima: float = DIFERENCIA_MINIMA
+) -> List[Dict[str, Any]]:
+    """Comparar las medianas de `actual` contra las de `base`.
+
+    Args:
+        base: Resultados de referencia (formato de `ejecutar`)
+        actual: Resultados nuevos
+        tolerancia: Aumento relativo permitido (0.25 = 25 %)
+        diferencia_minima: Aumento absoluto en segundos por debajo del cual
+                           no se reporta regresión
+
+    Returns:
+        Una fila {"tamano", "operacion", "base", "actual", "cambio",
+        "regresion"} por cada operación presente en ambos resultados, en el
+        orden de `actual`. "cambio" es la variación relativa de la mediana.
+    """
+    anteriores = _por_clave(base)
+    filas = []
+    for clave, resultado in _por_clave(actual).items():
+        anterior = anteriores.get(clave)
+        if anterior is None:
+            continue
+        antes, ahora = anterior["mediana"], resultado["mediana"]
+        cambio = (ahora - antes) / antes if antes > 0 else 0.0
+        filas.append({
+            "tamano": clave[0],
+            "operacion": clave[1],
+            "base": antes,
+            "actual": ahora,
+            "cambio": cambio,
+            "regresion": cambio > tolerancia and ahora - antes > diferencia_minima,
+        })
+    return filas
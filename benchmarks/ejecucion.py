@@ -0,0 +1,183 @@
+"""Medición de las operaciones de los gestores y de `JsonStorage`.
+
+Cada operación se ejecuta `repeticiones` veces sobre una copia del dataset
+(las escrituras lo modifican) con la caché ya cargada, y se registran el
+mínimo, la mediana y la media de los tiempos en segundos.
+"""
+from datetime import datetime
+from pathlib import Path
+from statistics import mean, median
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import json
+import platform
+import random
+import shutil
+import tempfile
+import time
+
+from employee_manager import gestor_contratos, gestor_empleados
+from employee_manager.json_storage import SECUENCIA_EMPLEADOS, JsonStorage
+from employee_manager.reportes import obtener_empleados_con_contratos_vencidos
+
+from .generador import CARGOS, FECHA_REFERENCIA, dataset
+
+Operacion = Callable[[JsonStorage, "Contexto"], Any]
+
+
+class Contexto:
+    """Estado compartido por las operaciones de una medición.
+
+    Args:
+        ids: Ids de los empleados del dataset
+        semilla: Semilla para elegir empleados al azar
+    """
+
+    def __init__(self, ids: List[int], semilla: int = 0):
+        self.rng = random.Random(semilla)
+        self.ids = ids
+        self._por_eliminar = ids[:]
+        self.rng.shuffle(self._por_eliminar)
+        self._eliminados = set()
+        self._id_directo = 10 ** 9
+
+    def cualquiera(self) -> int:
+        """Id de un empleado existente elegido al azar."""
+        while True:
+            id_empleado = self.rng.choice(self.ids)
+            if id_empleado not in self._eliminados:
+                return id_empleado
+
+    def a_eliminar(self) -> int:
+        """Id de un empleado que todavía no fue eliminado; se da por eliminado."""
+        id_empleado = self._por_eliminar.pop()
+        self._eliminados.add(id_empleado)
+        return id_empleado
+
+    def id_nuevo(self) -> int:
+        """Id libre para agregar registros sin pasar por la secuencia."""
+        self._id_directo += 1
+        return self._id_directo
+
+
+def _cargar_sin_cache(storage: JsonStorage, ctx: Contexto) -> None:
+    storage.invalidate_cache()
+    storage.load_json()
+
+
+# Operaciones medidas, en el orden en que se ejecutan
+OPERACIONES: Tuple[Tuple[str, Operacion], ...] = (
+    ("storage.load_json", _cargar_sin_cache),
+    ("storage.get_all", lambda s, ctx: s.get_all()),
+    ("storage.get_by_id", lambda s, ctx: s.get_by_id(ctx.cualquiera())),
+    ("storage.iter_empleados", lambda s, ctx: sum(1 for _ in s.iter_empleados())),
+    ("storage.query_cargo", lambda s, ctx: s.query(cargo=ctx.rng.choice(CARGOS), limit=50)),
+    ("storage.query_nombre", lambda s, ctx: s.query(nombre_prefix="Mar", order_by="nombre", limit=50)),
+    ("storage.buscar_por_nombre", lambda s, ctx: s.buscar_por_nombre("Maria Lopes")),
+    ("storage.contratos_vencidos", lambda s, ctx: s.contratos_vencidos(
+        gestor_contratos._limite_vencimiento(FECHA_REFERENCIA))),
+    ("storage.reservar_ids", lambda s, ctx: s.reservar_ids(SECUENCIA_EMPLEADOS)),
+    ("storage.add", lambda s, ctx: s.add({"id": ctx.id_nuevo(), "nombre": "Bench", "cargo": "QA", "contratos": []})),
+    ("storage.update", lambda s, ctx: s.update(ctx.cualquiera(), {"cargo": ctx.rng.choice(CARGOS)})),
+    ("storage.delete", lambda s, ctx: s.delete(ctx.a_eliminar())),
+    ("gestor.agregar_empleado", lambda s, ctx: gestor_empleados.agregar_empleado("Bench Empleado", "QA", s)),
+    ("gestor.buscar_empleado", lambda s, ctx: gestor_empleados.buscar_empleado(ctx.cualquiera(), s)),
+    ("gestor.asociar_contrato", lambda s, ctx: gestor_contratos.asociar_contrato(
+        ctx.cualquiera(), "2024-01-01", "2024-12-31", 3000, s)),
+    ("gestor.eliminar_empleado", lambda s, ctx: gestor_empleados.eliminar_empleado(ctx.a_eliminar(), s)),
+    ("gestor.listar_contratos_vencidos", lambda s, ctx: gestor_contratos.listar_contratos_vencidos(
+        s, FECHA_REFERENCIA)),
+    ("reportes.obtener_empleados_con_contratos_vencidos", lambda s, ctx: obtener_empleados_con_contratos_vencidos(
+        s, FECHA_REFERENCIA)),
+)
+
+
+def medir(funcion: Callable[[], Any], repeticiones: int) -> Dict[str, float]:
+    """Ejecutar `funcion` `repeticiones` veces y resumir los tiempos en segundos."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return {"minimo": min(tiempos), "mediana": median(tiempos), "media": mean(tiempos)}
+
+
+def medir_dataset(
+    ruta: Path,
+    repeticiones: int = 5,
+    operaciones: Optional[Sequence[str]] = None,
+    semilla: int = 0
+) -> List[Dict[str, Any]]:
+    """Medir las operaciones sobre una copia del dataset `ruta`.
+
+    Args:
+        ruta: Archivo de empleados generado con `escribir_dataset`
+        repeticiones: Veces que se ejecuta cada operación
+        operaciones: Nombres de las operaciones a medir (None para todas)
+        semilla: Semilla para elegir los empleados de cada operación
+
+    Returns:
+        Lista de resultados {"operacion", "repeticiones", "minimo", "mediana", "media"}
+
+    Lanza ValueError si alguna operación no existe.
+    """
+    disponibles = dict(OPERACIONES)
+    if operaciones is not None:
+        desconocidas = sorted(set(operaciones) - set(disponibles))
+        if desconocidas:
+            raise ValueError(f"Operaciones desconocidas: {', '.join(desconocidas)}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        copia = Path(tmpdir) / ruta.name
+        shutil.copyfile(ruta, copia)
+        storage = JsonStorage(str(copia))
+        ctx = Contexto([e["id"] for e in storage.get_all()], semilla)
+        resultados = []
+        for nombre, operacion in OPERACIONES:
+            if operaciones is not None and nombre not in operaciones:
+                continue
+            tiempos = medir(lambda: operacion(storage, ctx), repeticiones)
+            resultados.append({"operacion": nombre, "repeticiones": repeticiones, **tiempos})
+        return resultados
+
+
+def ejecutar(
+    tamanos: Sequence[int],
+    directorio_datos: str,
+    repeticiones: int = 5,
+    operaciones: Optional[Sequence[str]] = None,
+    semilla: int = 0
+) -> Dict[str, Any]:
+    """Medir las operaciones para cada tamaño de dataset.
+
+    Los datasets se generan en `directorio_datos` la primera vez y se
+    reutilizan en las siguientes ejecuciones.
+
+    Returns:
+        Diccionario {"meta", "resultados"} listo para `guardar_resultados`;
+        cada resultado incluye además el campo "tamano".
+    """
+    resultados = []
+    for tamano in tamanos:
+        ruta = dataset(directorio_datos, tamano, semilla)
+        for resultado in medir_dataset(ruta, repeticiones, operaciones, semilla):
+            resultados.append({"tamano": tamano, **resultado})
+    return {
+        "meta": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "semilla": semilla,
+        },
+        "resultados": resultados,
+    }
+
+
+def guardar_resultados(ruta: str, resultados: Dict[str, Any]) -> None:
+    """Guardar los resultados de `ejecutar` como JSON."""
+    path = Path(ruta)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(resultados, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def cargar_resultados(ruta: str) -> Dict[str, Any]:
+    """Leer resultados guardados con `guardar_resultados`."""
+    return json.loads(Path(ruta).read_text(encoding="utf-8"))
@@ -0,0 +1,117 @@
+"""Generación determinista de datasets sintéticos de empleados.
+
+Con la misma cantidad y semilla se obtiene siempre el mismo archivo, de modo
+que las mediciones de distintas ejecuciones son comparables. El archivo se
+escribe de forma incremental (un empleado por línea), sin armar el documento
+completo en memoria, y con las secuencias de ids ya guardadas en 'meta'.
+"""
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+import json
+import random
+
+from employee_manager.json_storage import SECUENCIA_CONTRATOS, SECUENCIA_EMPLEADOS
+
+# Tamaños estándar de los datasets
+TAMANOS = (1_000, 10_000, 100_000, 1_000_000)
+
+# Fecha de referencia con la que se consultan los contratos vencidos
+FECHA_REFERENCIA = "2024-06-01"
+
+CARGOS = (
+    "Desarrollador", "QA", "Analista", "Diseñador", "Soporte",
+    "Contador", "Vendedor", "Gerente", "Recursos Humanos", "Administrativo",
+)
+NOMBRES = (
+    "Ana", "Luis", "María", "Juan", "Carlos", "Lucía", "Pedro", "Sofía", "Jorge", "Valentina",
+    "Andrés", "Camila", "Diego", "Martina", "Pablo", "Florencia", "Martín", "Julieta", "Tomás", "Eva",
+)
+APELLIDOS = (
+    "Pérez", "González", "Rodríguez", "López", "Fernández", "García", "Martínez", "Sánchez",
+    "Romero", "Díaz", "Álvarez", "Torres", "Ruiz", "Gómez", "Herrera", "Castro",
+)
+
+# Distribución de contratos por empleado: la mayoría tiene uno o dos
+CONTRATOS_POR_EMPLEADO = (0, 1, 2, 3, 4, 5)
+PESOS_CONTRATOS = (10, 35, 25, 15, 10, 5)
+
+_INICIO_MAS_TEMPRANO = date(2012, 1, 1)
+_DIAS_DE_INICIO = (date(2024, 12, 31) - _INICIO_MAS_TEMPRANO).days
+
+
+def _contratos(rng: random.Random, cantidad: int, primer_id: int) -> List[Dict[str, Any]]:
+    """Contratos consecutivos de un empleado, de 6 meses a 3 años cada uno."""
+    contratos = []
+    inicio = _INICIO_MAS_TEMPRANO + timedelta(days=rng.randrange(_DIAS_DE_INICIO))
+    for i in range(cantidad):
+        fin = inicio + timedelta(days=rng.randint(180, 1095))
+        contratos.append({
+            "id_contrato": primer_id + i,
+            "fecha_inicio": inicio.isoformat(),
+            "fecha_fin": fin.isoformat(),
+            "salario": round(rng.uniform(1500, 9000), 2),
+        })
+        inicio = fin + timedelta(days=rng.randint(1, 60))
+    return contratos
+
+
+def _cantidades_de_contratos(cantidad: int, semilla: int) -> List[int]:
+    """Cantidad de contratos de cada empleado."""
+    return random.Random(semilla).choices(CONTRATOS_POR_EMPLEADO, PESOS_CONTRATOS, k=cantidad)
+
+
+def generar_empleados(cantidad: int, semilla: int = 0) -> Iterator[Dict[str, Any]]:
+    """Generar `cantidad` empleados con ids 1..cantidad y sus contratos.
+
+    Args:
+        cantidad: Cantidad de empleados
+        semilla: Semilla de los generadores aleatorios
+
+    Returns:
+        Iterador de diccionarios con el formato de `JsonStorage`
+    """
+    rng = random.Random(semilla + 1)
+    siguiente_contrato = 101
+    for id_empleado, num_contratos in enumerate(_cantidades_de_contratos(cantidad, semilla), start=1):
+        yield {
+            "id": id_empleado,
+            "nombre": f"{rng.choice(NOMBRES)} {rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}",
+            "cargo": rng.choice(CARGOS),
+            "contratos": _contratos(rng, num_contratos, siguiente_contrato),
+        }
+        siguiente_contrato += num_contratos
+
+
+def escribir_dataset(ruta: str, cantidad: int, semilla: int = 0) -> Path:
+    """Escribir un archivo de empleados para `JsonStorage` con `cantidad` empleados.
+
+    Args:
+        ruta: Archivo a crear (se reemplaza si existe)
+        cantidad: Cantidad de empleados
+        semilla: Semilla de los generadores aleatorios
+
+    Returns:
+        Ruta del archivo escrito
+    """
+    path = Path(ruta)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "version": 1,
+        SECUENCIA_EMPLEADOS: cantidad + 1,
+        SECUENCIA_CONTRATOS: 101 + sum(_cantidades_de_contratos(cantidad, semilla)),
+    }
+    with path.open("w", encoding="utf-8") as fh:
+        fh.write('{"meta": ' + json.dumps(meta) + ', "empleados": [')
+        for i, empleado in enumerate(generar_empleados(cantidad, semilla)):
+            fh.write(("\n" if i == 0 else ",\n") + json.dumps(empleado, ensure_ascii=False))
+        fh.write("\n]}\n")
+    return path
+
+
+def dataset(directorio: str, cantidad: int, semilla: int = 0) -> Path:
+    """Retornar el dataset de `cantidad` empleados, generándolo si aún no existe."""
+    path = Path(directorio) / f"empleados_{cantidad}_{semilla}.json"
+    if not path.exists():
+        escribir_dataset(str(path), cantidad, semilla)
+    return path
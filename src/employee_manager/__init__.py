@@ -1,5 +1,36 @@
-"""Paquete principal del gestor de empleados."""
+"""Paquete principal del gestor de empleados.
 
-from . import models, json_storage, gestor_empleados, gestor_contratos, reportes
+Los submódulos se importan la primera vez que se accede a ellos
+(``employee_manager.reportes``, ``from employee_manager import gestor_async``),
+de modo que importar el paquete no carga numpy, asyncio ni sqlite3 si no se
+usan.
+"""
+from importlib import import_module
+from typing import Any, List
 
-__all__ = ["models", "json_storage", "gestor_empleados", "gestor_contratos", "reportes"]
+__all__ = [
+    "models",
+    "metricas",
+    "concurrencia",
+    "json_storage",
+    "journal_storage",
+    "sqlite_storage",
+    "sharded_storage",
+    "async_storage",
+    "gestor_empleados",
+    "gestor_contratos",
+    "gestor_async",
+    "reportes",
+    "importador",
+]
+
+
+def __getattr__(nombre: str) -> Any:
+    if nombre in __all__:
+        # import_module deja el submódulo como atributo del paquete: solo se carga una vez
+        return import_module(f".{nombre}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,173 @@
+"""Acceso asíncrono al storage de empleados para servicios asyncio.
+
+`AsyncJsonStorage` envuelve un `JsonStorage` y ejecuta cada operación en un
+executor de hilos acotado, de modo que la E/S de archivos y el parseo JSON no
+bloquean el event loop:
+
+- Las lecturas idénticas que llegan mientras otra igual está en curso esperan
+  el mismo resultado en lugar de volver a cargar el archivo.
+- Las lecturas corren a la vez entre sí; cada escritura espera a que terminen
+  las lecturas en curso y se ejecuta sola, porque `JsonStorage` no admite
+  escrituras desde varios hilos (ver `_LectoresEscritor`).
+"""
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from .json_storage import JsonStorage
+
+# Hilos del executor propio: permite varias lecturas a la vez; las escrituras van de a una
+HILOS_POR_DEFECTO = 4
+
+
+class _LectoresEscritor:
+    """Bloqueo de asyncio con varios lectores simultáneos o un único escritor.
+
+    Un escritor en espera impide que entren lectores nuevos, para que un
+    flujo continuo de lecturas no postergue las escrituras indefinidamente.
+    """
+
+    def __init__(self):
+        self._condicion = asyncio.Condition()
+        self._lectores = 0
+        self._escritores_en_espera = 0
+        self._escribiendo = False
+
+    @asynccontextmanager
+    async def lectura(self) -> AsyncIterator[None]:
+        async with self._condicion:
+            await self._condicion.wait_for(
+                lambda: not self._escribiendo and not self._escritores_en_espera
+            )
+            self._lectores += 1
+        try:
+            yield
+        finally:
+            async with self._condicion:
+                self._lectores -= 1
+                self._condicion.notify_all()
+
+    @asynccontextmanager
+    async def escritura(self) -> AsyncIterator[None]:
+        async with self._condicion:
+            self._escritores_en_espera += 1
+            try:
+                await self._condicion.wait_for(lambda: not self._escribiendo and not self._lectores)
+            finally:
+                self._escritores_en_espera -= 1
+            self._escribiendo = True
+        try:
+            yield
+        finally:
+            async with self._condicion:
+                self._escribiendo = False
+                self._condicion.notify_all()
+
+
+class AsyncJsonStorage:
+    """Versión asíncrona de `JsonStorage`.
+
+    Args:
+        file_path: Archivo JSON de empleados
+        executor: Executor compartido donde correr las operaciones. Si es
+                  None se crea uno propio de `HILOS_POR_DEFECTO` hilos, que
+                  se cierra con `close()`.
+        storage: Storage síncrono a envolver (por defecto un `JsonStorage`
+                 sobre `file_path`)
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        executor: Optional[Executor] = None,
+        storage: Optional[JsonStorage] = None
+    ):
+        self.storage = storage if storage is not None else JsonStorage(file_path)
+        self._executor_propio = executor is None
+        self._executor = executor or ThreadPoolExecutor(max_workers=HILOS_POR_DEFECTO, thread_name_prefix="json-storage")
+        self._bloqueo = _LectoresEscritor()
+        self._en_curso: Dict[Tuple, asyncio.Future] = {}
+
+    async def __aenter__(self) -> "AsyncJsonStorage":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        # close() espera las operaciones en curso: se espera fuera del event loop
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def close(self) -> None:
+        """Liberar el executor si fue creado por esta instancia.
+
+        Espera a que terminen las operaciones en curso; desde una corrutina
+        usar ``async with`` para no bloquear el event loop.
+        """
+        if self._executor_propio:
+            self._executor.shutdown(wait=True)
+
+    async def _ejecutar(self, funcion: Callable, *args: Any, exclusivo: bool) -> Any:
+        """Ejecutar `funcion(*args)` en el executor.
+
+        Con `exclusivo` ninguna otra operación corre a la vez; si no, solo se
+        excluyen las escrituras.
+        """
+        bloqueo = self._bloqueo.escritura() if exclusivo else self._bloqueo.lectura()
+        async with bloqueo:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, funcion, *args)
+
+    async def leer(self, funcion: Callable, *args: Any) -> Any:
+        """Ejecutar una lectura, compartiendo el resultado con lecturas idénticas en curso.
+
+        Los argumentos deben ser hashables. Los registros retornados pueden
+        estar compartidos con otros lectores: no deben modificarse.
+        """
+        clave = (funcion, args)
+        tarea = self._en_curso.get(clave)
+        if tarea is None:
+            tarea = asyncio.ensure_future(self._ejecutar(funcion, *args, exclusivo=False))
+            self._en_curso[clave] = tarea
+
+            def _terminar(t: asyncio.Future) -> None:
+                if self._en_curso.get(clave) is t:
+                    del self._en_curso[clave]
+            tarea.add_done_callback(_terminar)
+        # shield: cancelar a un lector no cancela la carga que esperan los demás
+        return await asyncio.shield(tarea)
+
+    async def escribir(self, funcion: Callable, *args: Any) -> Any:
+        """Ejecutar una escritura; las escrituras nunca se combinan entre sí."""
+        return await self._ejecutar(funcion, *args, exclusivo=True)
+
+    async def get_all(self) -> List[Dict[str, Any]]:
+        """Retornar todos los registros."""
+        return await self.leer(self.storage.get_all)
+
+    async def get_by_id(self, record_id: Any) -> Optional[Dict[str, Any]]:
+        """Retornar el registro con el id dado, o None si no existe."""
+        return await self.leer(self.storage.get_by_id, record_id)
+
+    async def contratos_vencidos(self, limite: int) -> List[Dict[str, Any]]:
+        """Retornar los contratos con fecha de fin anterior al ordinal `limite`."""
+        return await self.leer(self.storage.contratos_vencidos, limite)
+
+    async def add(self, record: Dict[str, Any]) -> None:
+        """Agregar un registro.
+
+        Lanza ValueError si el registro ya existe (basado en el campo 'id').
+        """
+        await self.escribir(self.storage.add, record)
+
+    async def update(self, record_id: Any, updates: Dict[str, Any]) -> None:
+        """Actualizar un registro por id.
+
+        Lanza ValueError si el registro no existe o si se intenta cambiar el id.
+        """
+        await self.escribir(self.storage.update, record_id, updates)
+
+    async def delete(self, record_id: Any) -> None:
+        """Eliminar un registro por id.
+
+        Lanza ValueError si el registro no existe.
+        """
+        await self.escribir(self.storage.delete, record_id)
@@ -0,0 +1,106 @@
+"""Control de concurrencia entre procesos que comparten los archivos de datos.
+
+- `BloqueoArchivo`: bloqueo lector/escritor con ``fcntl.flock`` sobre un
+  archivo auxiliar ``<archivo>.lock``. Varios lectores pueden leer a la vez;
+  un escritor espera a que terminen y los excluye mientras escribe. Donde
+  ``fcntl`` no existe (Windows) el bloqueo no hace nada.
+- `ConflictoDeVersion`: la escritura se basó en una versión del documento que
+  otro proceso ya modificó.
+- `con_reintentos`: repetir una operación completa (leer, validar, escribir)
+  mientras falle por conflicto de versión.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TypeVar
+import os
+import random
+import time
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - plataformas sin fcntl
+    fcntl = None
+
+T = TypeVar("T")
+
+_LIBRE, _COMPARTIDO, _EXCLUSIVO = 0, 1, 2
+
+
+class ConflictoDeVersion(RuntimeError):
+    """Otro proceso modificó el documento después de que esta instancia lo leyó."""
+
+
+class BloqueoArchivo:
+    """Bloqueo compartido/exclusivo entre procesos sobre un archivo `.lock`.
+
+    Es reentrante dentro de la misma instancia: pedir un nivel ya concedido
+    no vuelve a bloquear, y pedir el exclusivo teniendo el compartido lo
+    convierte hasta salir del bloque. No protege entre hilos de un mismo
+    proceso que usen la misma instancia.
+    """
+
+    def __init__(self, ruta: Path):
+        self.ruta = Path(ruta)
+        self._fd: Optional[int] = None
+        self._nivel = _LIBRE
+
+    @contextmanager
+    def compartido(self) -> Iterator[None]:
+        """Mantener un bloqueo de lectura mientras dure el bloque."""
+        with self._bloquear(_COMPARTIDO):
+            yield
+
+    @contextmanager
+    def exclusivo(self) -> Iterator[None]:
+        """Mantener un bloqueo de escritura mientras dure el bloque."""
+        with self._bloquear(_EXCLUSIVO):
+            yield
+
+    def _flock(self, nivel: int) -> None:
+        """Llevar el bloqueo del archivo al nivel indicado."""
+        if fcntl is None:
+            return
+        if nivel == _LIBRE:
+            if self._fd is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+                os.close(self._fd)
+                self._fd = None
+            return
+        if self._fd is None:
+            try:
+                self._fd = os.open(self.ruta, os.O_RDWR | os.O_CREAT, 0o644)
+            except OSError:
+                # Directorio inexistente o de solo lectura: no hay con quién coordinar
+                return
+        fcntl.flock(self._fd, fcntl.LOCK_EX if nivel == _EXCLUSIVO else fcntl.LOCK_SH)
+
+    @contextmanager
+    def _bloquear(self, nivel: int) -> Iterator[None]:
+        if self._nivel >= nivel:
+            yield
+            return
+        anterior = self._nivel
+        self._flock(nivel)
+        self._nivel = nivel
+        try:
+            yield
+        finally:
+            self._nivel = anterior
+            self._flock(anterior)
+
+
+def con_reintentos(operacion: Callable[[], T], intentos: int = 10, espera: float = 0.005) -> T:
+    """Ejecutar `operacion()` repitiéndola si lanza `ConflictoDeVersion`.
+
+    Entre intentos espera un tiempo aleatorio que se duplica en cada intento,
+    para que los procesos en conflicto no vuelvan a chocar. Si todos los
+    intentos fallan se relanza el último conflicto.
+    """
+    for intento in range(intentos):
+        try:
+            return operacion()
+        except ConflictoDeVersion:
+            if intento == intentos - 1:
+                raise
+            time.sleep(random.uniform(0, espera * 2 ** intento))
+    raise ValueError("La cantidad de intentos debe ser al menos 1")
@@ -0,0 +1,61 @@
+"""Conversión de fechas de contratos entre texto YYYY-MM-DD y ordinales.
+
+Las fechas se guardan como texto, pero las validaciones, índices y reportes
+trabajan con ordinales (`date.toordinal()`): enteros que se comparan sin volver
+a parsear. El texto ISO solo se reconstruye al mostrar resultados.
+"""
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Optional
+
+FORMATO_FECHA = "%Y-%m-%d"
+
+
+@lru_cache(maxsize=65536)
+def _parsear(fecha: str) -> int:
+    """Convertir un texto YYYY-MM-DD a ordinal.
+
+    Las fechas canónicas (10 caracteres) se descomponen directamente; el resto
+    pasa por `strptime`, que acepta también meses y días sin cero inicial.
+    """
+    anio, mes, dia = fecha[:4], fecha[5:7], fecha[8:]
+    if (
+        len(fecha) == 10
+        and fecha.isascii()
+        and fecha[4] == "-"
+        and fecha[7] == "-"
+        and anio.isdigit()
+        and mes.isdigit()
+        and dia.isdigit()
+    ):
+        # Fechas imposibles (p. ej. 2024-02-30) lanzan ValueError igual que strptime
+        return date(int(anio), int(mes), int(dia)).toordinal()
+    return datetime.strptime(fecha, FORMATO_FECHA).toordinal()
+
+
+def a_ordinal(fecha: Any) -> int:
+    """Retornar el ordinal de una fecha YYYY-MM-DD.
+
+    Lanza ValueError si la fecha no es un texto con ese formato.
+    """
+    if not isinstance(fecha, str):
+        raise ValueError(f"Fecha inválida: {fecha!r}")
+    return _parsear(fecha)
+
+
+def a_ordinal_o_none(fecha: Any) -> Optional[int]:
+    """Retornar el ordinal de una fecha YYYY-MM-DD, o None si es inválida."""
+    try:
+        return a_ordinal(fecha)
+    except ValueError:
+        return None
+
+
+def desde_ordinal(ordinal: int) -> str:
+    """Retornar el texto ISO YYYY-MM-DD de un ordinal."""
+    return date.fromordinal(ordinal).isoformat()
+
+
+def hoy_ordinal() -> int:
+    """Retornar el ordinal de la fecha actual."""
+    return date.today().toordinal()
@@ -0,0 +1,49 @@
+"""Versiones asíncronas de las funciones de los gestores.
+
+Cada función ejecuta la versión síncrona de `gestor_empleados` o
+`gestor_contratos` sobre el storage envuelto por un `AsyncJsonStorage`:
+
+- agregar_empleado(nombre, cargo) → dict
+- buscar_empleado(id) → dict
+- asociar_contrato(id_empleado, fecha_inicio, fecha_fin, salario) → dict
+- listar_contratos_vencidos() → list
+
+Las consultas idénticas concurrentes comparten una sola ejecución; las
+operaciones que modifican datos se serializan, por lo que la asignación de ids
+no se pisa entre tareas.
+"""
+from typing import Dict, List, Optional
+
+from . import gestor_contratos, gestor_empleados
+from .async_storage import AsyncJsonStorage
+
+
+async def agregar_empleado(nombre: str, cargo: str, storage: AsyncJsonStorage) -> Dict:
+    """Agregar un nuevo empleado (ver `gestor_empleados.agregar_empleado`)."""
+    return await storage.escribir(gestor_empleados.agregar_empleado, nombre, cargo, storage.storage)
+
+
+async def buscar_empleado(id: int, storage: AsyncJsonStorage) -> Optional[Dict]:
+    """Buscar un empleado por ID (ver `gestor_empleados.buscar_empleado`)."""
+    return await storage.leer(gestor_empleados.buscar_empleado, id, storage.storage)
+
+
+async def asociar_contrato(
+    id_empleado: int,
+    fecha_inicio: str,
+    fecha_fin: str,
+    salario: float,
+    storage: AsyncJsonStorage
+) -> Dict:
+    """Asociar un contrato a un empleado (ver `gestor_contratos.asociar_contrato`)."""
+    return await storage.escribir(
+        gestor_contratos.asociar_contrato, id_empleado, fecha_inicio, fecha_fin, salario, storage.storage
+    )
+
+
+async def listar_contratos_vencidos(
+    storage: AsyncJsonStorage,
+    fecha_referencia: str = None
+) -> List[Dict]:
+    """Listar los contratos vencidos (ver `gestor_contratos.listar_contratos_vencidos`)."""
+    return await storage.leer(gestor_contratos.listar_contratos_vencidos, storage.storage, fecha_referencia)
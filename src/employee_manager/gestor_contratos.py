@@ -4,33 +4,34 @@ Implementación según especificación:
 - asociar_contrato(id_empleado, fecha_inicio, fecha_fin, salario) → dict
 - listar_contratos_vencidos() → list
 """
-from typing import Dict, List
-from datetime import datetime
+from itertools import repeat
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
-from .json_storage import JsonStorage
+from .json_storage import JsonStorage, SECUENCIA_CONTRATOS
+from .concurrencia import con_reintentos
+from .metricas import instrumentar
+from .fechas import a_ordinal, a_ordinal_o_none, hoy_ordinal
 from .gestor_empleados import buscar_empleado
 
 
-def _get_next_contract_id(empleado: Dict) -> int:
-    """Obtener el siguiente ID de contrato para un empleado."""
-    contratos = empleado.get("contratos", [])
-    if not contratos:
-        return 101  # Empezar desde 101 como en el ejemplo
-    max_id = max((c.get("id_contrato", 0) for c in contratos), default=100)
-    return max_id + 1
+def _get_next_contract_id(storage: JsonStorage) -> int:
+    """Reservar el siguiente ID de contrato (la secuencia empieza en 101 como en el ejemplo)."""
+    return storage.reservar_ids(SECUENCIA_CONTRATOS)
 
 
-def _validate_date_format(date_str: str, field_name: str = "fecha") -> None:
+def _validate_date_format(date_str: str, field_name: str = "fecha") -> int:
     """Validar que una fecha esté en formato YYYY-MM-DD.
     
+    Retorna la fecha como ordinal para compararla sin volver a parsearla.
     Lanza ValueError si el formato es inválido.
     """
     try:
-        datetime.strptime(date_str, "%Y-%m-%d")
-    except (ValueError, TypeError):
+        return a_ordinal(date_str)
+    except ValueError:
         raise ValueError(f"{field_name} debe estar en formato YYYY-MM-DD")
 
 
+@instrumentar()
 def asociar_contrato(
     id_empleado: int,
     fecha_inicio: str,
@@ -55,46 +56,128 @@ def asociar_contrato(
     - Las fechas tienen formato inválido
     - La fecha de fin es anterior a la fecha de inicio
     - El salario es negativo
+
+    La lectura y las validaciones no bloquean el archivo; si otro proceso lo
+    modifica antes de escribir, la operación completa se repite.
     """
-    # Validar que el empleado existe
-    empleado = buscar_empleado(id_empleado, storage)
-    if empleado is None:
-        raise ValueError(f"Empleado con id '{id_empleado}' no existe")
+    return con_reintentos(
+        lambda: _asociar_contrato(id_empleado, fecha_inicio, fecha_fin, salario, storage)
+    )
+
+
+def _asociar_contrato(
+    id_empleado: int,
+    fecha_inicio: str,
+    fecha_fin: str,
+    salario: float,
+    storage: JsonStorage
+) -> Dict:
+    """Un intento de `asociar_contrato` sobre una sola lectura del storage."""
+    with storage.batch():
+        # Validar que el empleado existe
+        empleado = buscar_empleado(id_empleado, storage)
+        if empleado is None:
+            raise ValueError(f"Empleado con id '{id_empleado}' no existe")
     
-    # Validar formato de fechas
-    _validate_date_format(fecha_inicio, "Fecha de inicio")
-    _validate_date_format(fecha_fin, "Fecha de fin")
+        # Validar formato de fechas
+        inicio = _validate_date_format(fecha_inicio, "Fecha de inicio")
+        fin = _validate_date_format(fecha_fin, "Fecha de fin")
     
-    # Validar que fecha_fin sea posterior a fecha_inicio
-    inicio_dt = datetime.strptime(fecha_inicio, "%Y-%m-%d")
-    fin_dt = datetime.strptime(fecha_fin, "%Y-%m-%d")
-    if fin_dt < inicio_dt:
-        raise ValueError("La fecha de fin debe ser posterior a la fecha de inicio")
+        # Validar que fecha_fin sea posterior a fecha_inicio
+        if fin < inicio:
+            raise ValueError("La fecha de fin debe ser posterior a la fecha de inicio")
     
-    # Validar salario
-    if salario < 0:
-        raise ValueError("El salario no puede ser negativo")
+        # Validar salario
+        if salario < 0:
+            raise ValueError("El salario no puede ser negativo")
     
-    # Crear el contrato
-    id_contrato = _get_next_contract_id(empleado)
-    contrato = {
-        "id_contrato": id_contrato,
-        "fecha_inicio": fecha_inicio,
-        "fecha_fin": fecha_fin,
-        "salario": salario
-    }
+        # Crear el contrato
+        id_contrato = _get_next_contract_id(storage)
+        contrato = {
+            "id_contrato": id_contrato,
+            "fecha_inicio": fecha_inicio,
+            "fecha_fin": fecha_fin,
+            "salario": salario
+        }
     
-    # Agregar el contrato al empleado
-    contratos = empleado.get("contratos", [])
-    contratos.append(contrato)
+        # Agregar el contrato al empleado sin modificar el registro leído del storage
+        contratos = [*empleado.get("contratos", []), contrato]
     
-    # Actualizar solo el campo contratos del empleado en el storage
-    storage.update(id_empleado, {"contratos": contratos})
+        # Actualizar solo el campo contratos del empleado en el storage
+        storage.update(id_empleado, {"contratos": contratos})
     
-    return contrato
+        return contrato
 
 
-def listar_contratos_vencidos(storage: JsonStorage, fecha_referencia: str = None) -> List[Dict]:
+def _limite_vencimiento(fecha_referencia: Optional[str]) -> Optional[int]:
+    """Retornar el ordinal desde el cual un contrato deja de estar vencido.
+
+    Sin fecha de referencia es mañana: todo contrato que termina hoy o antes
+    ya terminó respecto del momento actual (las fechas de fin no tienen hora).
+    Retorna None si la fecha de referencia es inválida.
+    """
+    if fecha_referencia is None:
+        return hoy_ordinal() + 1
+    return a_ordinal_o_none(fecha_referencia)
+
+
+def _filtrar_vencidos(empleados: Iterable[Dict], limite: int, desde: Optional[int] = None) -> List[Dict]:
+    """Recorrer los empleados y retornar sus contratos con fecha de fin anterior a `limite`.
+
+    Si se indica `desde`, solo los contratos cuya fecha de fin es igual o
+    posterior a ese ordinal.
+    """
+    contratos_vencidos = []
+    
+    for empleado in empleados:
+        contratos = empleado.get("contratos", [])
+        for contrato in contratos:
+            fin = a_ordinal_o_none(contrato.get("fecha_fin"))
+            # Se ignoran contratos sin fecha de fin o con fecha inválida
+            if fin is not None and fin < limite and (desde is None or fin >= desde):
+                # Incluir información del empleado en el contrato vencido
+                contrato_vencido = {
+                    **contrato,
+                    "id_empleado": empleado.get("id"),
+                    "nombre_empleado": empleado.get("nombre"),
+                    "cargo_empleado": empleado.get("cargo")
+                }
+                contratos_vencidos.append(contrato_vencido)
+    
+    return contratos_vencidos
+
+
+def _sobre_archivo(ruta: str, funcion: Callable[..., List], *args: Any) -> List:
+    """Aplicar `funcion(empleados, *args)` a los empleados de un archivo JSON (en un proceso hijo)."""
+    return funcion(JsonStorage(ruta, cache=False).iter_empleados(), *args)
+
+
+def _recorrer_en_paralelo(storage: JsonStorage, workers: int, funcion: Callable[..., List], *args: Any) -> List:
+    """Aplicar `funcion(empleados, *args)` en `workers` procesos y concatenar los resultados.
+
+    Solo un storage repartido en shards se recorre en paralelo: cada proceso
+    lee y recorre un archivo. Con otro storage se recorre en este proceso,
+    porque enviar los empleados a los procesos cuesta más que filtrarlos.
+    `funcion` debe estar definida a nivel de módulo.
+    """
+    if not hasattr(storage, "rutas_shards"):
+        return funcion(storage.iter_empleados(), *args)
+    # Importado aquí: multiprocessing solo hace falta con workers > 1
+    from concurrent.futures import ProcessPoolExecutor
+
+    extra = [repeat(a) for a in args]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partes = executor.map(_sobre_archivo, storage.rutas_shards, repeat(funcion), *extra)
+        return [r for parte in partes for r in parte]
+
+
+@instrumentar()
+def listar_contratos_vencidos(
+    storage: JsonStorage,
+    fecha_referencia: str = None,
+    incremental: bool = False,
+    workers: int = 1
+) -> List[Dict]:
     """Listar todos los contratos vencidos.
     
     Un contrato se considera vencido si su fecha_fin es anterior a la fecha de referencia
@@ -103,38 +186,31 @@ def listar_contratos_vencidos(storage: JsonStorage, fecha_referencia: str = None
     Args:
         storage: Storage de empleados
         fecha_referencia: Fecha de referencia en formato YYYY-MM-DD (opcional)
+        incremental: Si es True, recorre los empleados con `iter_empleados`
+                     sin cargar el documento completo en memoria
+        workers: Con más de 1 y un storage en shards, reparte el filtro
+                 entre ese número de procesos (uno por shard) y ordena el
+                 resultado por fecha de fin. Con otro storage se ignora
         
     Returns:
         Lista de diccionarios con los contratos vencidos
+
+    Si el storage expone `contratos_vencidos` (el índice ordenado de
+    `JsonStorage` o el índice SQL de `SqliteStorage`) y no se pide el modo
+    incremental, el filtro se delega en él y el resultado queda ordenado por
+    fecha de fin.
     """
-    if fecha_referencia is None:
-        ref_date = datetime.now()
-    else:
-        try:
-            ref_date = datetime.strptime(fecha_referencia, "%Y-%m-%d")
-        except (ValueError, TypeError):
-            return []  # Fecha inválida, retornar lista vacía
-    
-    empleados = storage.get_all()
-    contratos_vencidos = []
+    limite = _limite_vencimiento(fecha_referencia)
+    if limite is None:
+        return []  # Fecha inválida, retornar lista vacía
     
-    for empleado in empleados:
-        contratos = empleado.get("contratos", [])
-        for contrato in contratos:
-            fecha_fin_str = contrato.get("fecha_fin")
-            if fecha_fin_str:
-                try:
-                    fecha_fin = datetime.strptime(fecha_fin_str, "%Y-%m-%d")
-                    if fecha_fin < ref_date:
-                        # Incluir información del empleado en el contrato vencido
-                        contrato_vencido = {
-                            **contrato,
-                            "id_empleado": empleado.get("id"),
-                            "nombre_empleado": empleado.get("nombre"),
-                            "cargo_empleado": empleado.get("cargo")
-                        }
-                        contratos_vencidos.append(contrato_vencido)
-                except (ValueError, TypeError):
-                    continue  # Ignorar fechas inválidas
-    
-    return contratos_vencidos
+    if workers > 1 and hasattr(storage, "rutas_shards"):
+        contratos_vencidos = _recorrer_en_paralelo(storage, workers, _filtrar_vencidos, limite)
+        contratos_vencidos.sort(key=lambda c: a_ordinal(c["fecha_fin"]))
+        return contratos_vencidos
+    if incremental:
+        return _filtrar_vencidos(storage.iter_empleados(), limite)
+    if hasattr(storage, "contratos_vencidos"):
+        # El storage filtra por su cuenta con un índice sobre fecha_fin
+        return storage.contratos_vencidos(limite)
+    return _filtrar_vencidos(storage.get_all(), limite)
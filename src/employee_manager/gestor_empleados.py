@@ -5,21 +5,37 @@ Implementación según especificación:
 - eliminar_empleado(id) → bool
 - buscar_empleado(id) → dict
 """
-from typing import Dict, Optional
+from heapq import nsmallest
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 
-from .json_storage import JsonStorage
+from .json_storage import JsonStorage, SECUENCIA_EMPLEADOS
+from .concurrencia import con_reintentos
+from .metricas import instrumentar
+from .indices import UMBRAL_SIMILITUD, similitud, trigramas
 
 
-def _get_next_id(storage: JsonStorage) -> int:
-    """Obtener el siguiente ID disponible para un empleado."""
-    empleados = storage.get_all()
-    if not empleados:
-        return 1
-    max_id = max((emp.get("id", 0) for emp in empleados), default=0)
-    return max_id + 1
+def _get_next_id(storage: JsonStorage, cantidad: int = 1) -> int:
+    """Reservar el siguiente ID de empleado (o `cantidad` IDs consecutivos) y retornar el primero."""
+    return storage.reservar_ids(SECUENCIA_EMPLEADOS, cantidad)
 
 
+def _validar_empleado(nombre: str, cargo: str) -> None:
+    """Validar los datos de un empleado nuevo.
+
+    Lanza ValueError si el nombre o el cargo no son texto o están vacíos.
+    """
+    if not isinstance(nombre, str):
+        raise ValueError("El nombre debe ser texto")
+    if not isinstance(cargo, str):
+        raise ValueError("El cargo debe ser texto")
+    if not nombre or not nombre.strip():
+        raise ValueError("El nombre no puede estar vacío")
+    if not cargo or not cargo.strip():
+        raise ValueError("El cargo no puede estar vacío")
+
+
+@instrumentar()
 def agregar_empleado(nombre: str, cargo: str, storage: JsonStorage) -> Dict:
     """Agregar un nuevo empleado.
     
@@ -32,24 +48,28 @@ def agregar_empleado(nombre: str, cargo: str, storage: JsonStorage) -> Dict:
         Dict con los datos del empleado agregado
         
     Lanza ValueError si los datos son inválidos.
+    Si otro proceso escribe entre la lectura del siguiente id y la escritura,
+    la operación se repite sobre los datos actualizados.
     """
-    if not nombre or not nombre.strip():
-        raise ValueError("El nombre no puede estar vacío")
-    if not cargo or not cargo.strip():
-        raise ValueError("El cargo no puede estar vacío")
+    _validar_empleado(nombre, cargo)
     
-    empleado_id = _get_next_id(storage)
-    empleado = {
-        "id": empleado_id,
-        "nombre": nombre.strip(),
-        "cargo": cargo.strip(),
-        "contratos": []
-    }
+    def _agregar() -> Dict:
+        # El lote escribe la reserva del id y el empleado juntos
+        with storage.batch():
+            empleado_id = _get_next_id(storage)
+            empleado = {
+                "id": empleado_id,
+                "nombre": nombre.strip(),
+                "cargo": cargo.strip(),
+                "contratos": []
+            }
+            storage.add(empleado)
+        return empleado
     
-    storage.add(empleado)
-    return empleado
+    return con_reintentos(_agregar)
 
 
+@instrumentar()
 def eliminar_empleado(id: int, storage: JsonStorage) -> bool:
     """Eliminar un empleado por id.
     
@@ -61,12 +81,13 @@ def eliminar_empleado(id: int, storage: JsonStorage) -> bool:
         True si se eliminó correctamente, False si no se encontró
     """
     try:
-        storage.delete(id)
+        con_reintentos(lambda: storage.delete(id))
         return True
     except ValueError:
         return False
 
 
+@instrumentar()
 def buscar_empleado(id: int, storage: JsonStorage) -> Optional[Dict]:
     """Buscar un empleado por id.
     
@@ -77,13 +98,10 @@ def buscar_empleado(id: int, storage: JsonStorage) -> Optional[Dict]:
     Returns:
         Dict con los datos del empleado si existe, None en caso contrario
     """
-    empleados = storage.get_all()
-    for emp in empleados:
-        if emp.get("id") == id:
-            return emp
-    return None
+    return storage.get_by_id(id)
 
 
+@instrumentar()
 def listar_empleados(storage: JsonStorage) -> list:
     """Listar todos los empleados.
     
@@ -94,3 +112,83 @@ def listar_empleados(storage: JsonStorage) -> list:
         Lista de diccionarios con los datos de los empleados
     """
     return storage.get_all()
+
+
+def iterar_empleados(storage: JsonStorage) -> Iterator[Dict]:
+    """Iterar los empleados uno a uno.
+
+    A diferencia de `listar_empleados`, no requiere cargar todos los empleados
+    en memoria: el storage los entrega de forma incremental.
+    
+    Args:
+        storage: Storage de empleados
+        
+    Returns:
+        Iterador de diccionarios con los datos de los empleados
+    """
+    return storage.iter_empleados()
+
+
+@instrumentar()
+def consultar_empleados(
+    storage: JsonStorage,
+    cargo: Optional[str] = None,
+    nombre_prefix: Optional[str] = None,
+    order_by: str = "id",
+    pagina: int = 1,
+    tamano_pagina: Optional[int] = None
+) -> list:
+    """Consultar empleados por cargo y/o prefijo de nombre, ordenados y paginados.
+    
+    Args:
+        storage: Storage de empleados
+        cargo: Cargo exacto a filtrar (opcional)
+        nombre_prefix: Prefijo del nombre, sin distinguir mayúsculas (opcional)
+        order_by: "id", "nombre" o "cargo"; con "-" delante, descendente
+        pagina: Número de página, empezando en 1
+        tamano_pagina: Empleados por página (None para todos)
+        
+    Returns:
+        Lista de diccionarios con los empleados de la página
+        
+    Lanza ValueError si la página no es positiva o el orden es inválido.
+    """
+    if pagina < 1:
+        raise ValueError("La página debe ser al menos 1")
+    offset = 0 if tamano_pagina is None else (pagina - 1) * tamano_pagina
+    return storage.query(
+        cargo=cargo,
+        nombre_prefix=nombre_prefix,
+        order_by=order_by,
+        limit=tamano_pagina,
+        offset=offset
+    )
+
+
+@instrumentar()
+def buscar_por_nombre(texto: str, storage: JsonStorage, limit: int = 10) -> List[Dict]:
+    """Buscar empleados por nombre tolerando errores de tipeo.
+    
+    Args:
+        texto: Nombre o parte del nombre a buscar
+        storage: Storage de empleados
+        limit: Cantidad máxima de resultados
+        
+    Returns:
+        Lista de dicts {"empleado", "similitud"} de mayor a menor similitud
+        
+    Si el storage mantiene un índice de trigramas (`buscar_por_nombre`) se
+    usa; en otro caso se comparan los trigramas de todos los nombres.
+    """
+    if hasattr(storage, "buscar_por_nombre"):
+        return storage.buscar_por_nombre(texto, limit)
+    consulta = trigramas(texto)
+    candidatos = (
+        {"empleado": emp, "similitud": similitud(consulta, trigramas(emp.get("nombre")))}
+        for emp in storage.iter_empleados()
+    )
+    return nsmallest(
+        limit,
+        (c for c in candidatos if c["similitud"] >= UMBRAL_SIMILITUD),
+        key=lambda c: (-c["similitud"], c["empleado"].get("id"))
+    )
@@ -0,0 +1,186 @@
+"""Importación masiva de empleados y contratos desde archivos CSV o JSONL.
+
+Los archivos se leen de forma incremental y se procesan por lotes: cada lote se
+valida fila por fila con las mismas reglas que `agregar_empleado` y
+`asociar_contrato`, y se escribe en el storage una sola vez. Si otro proceso
+escribe entre la lectura y la escritura de un lote, el lote se repite completo
+(ver `concurrencia.con_reintentos`).
+
+Formato de entrada (según la extensión: ``.csv`` o JSON por línea):
+- empleados: columnas ``nombre`` y ``cargo``
+- contratos: columnas ``id_empleado``, ``fecha_inicio``, ``fecha_fin`` y ``salario``
+"""
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import csv
+import json
+import time
+
+from .concurrencia import con_reintentos
+from .json_storage import JsonStorage
+from .gestor_empleados import _get_next_id, _validar_empleado
+from .gestor_contratos import asociar_contrato
+
+
+Fila = Tuple[int, Dict[str, Any], Optional[str]]
+
+
+def _leer_filas(ruta: str) -> Iterator[Fila]:
+    """Iterar (número de fila, datos, error) de un archivo CSV o JSONL sin cargarlo entero.
+
+    Las líneas que no son un objeto JSON se entregan con datos vacíos y el
+    motivo en `error`, para que se reporten como error de esa fila en lugar de
+    interrumpir la importación.
+    """
+    path = Path(ruta)
+    with path.open("r", encoding="utf-8", newline="") as fh:
+        if path.suffix.lower() == ".csv":
+            # La fila 1 es la cabecera
+            for numero, fila in enumerate(csv.DictReader(fh), start=2):
+                yield numero, fila, None
+            return
+        for numero, linea in enumerate(fh, start=1):
+            if not linea.strip():
+                continue
+            try:
+                fila = json.loads(linea)
+            except json.JSONDecodeError as exc:
+                yield numero, {}, f"JSON inválido: {exc.msg}"
+                continue
+            if not isinstance(fila, dict):
+                yield numero, {}, "JSON inválido: la fila debe ser un objeto"
+                continue
+            yield numero, fila, None
+
+
+def _lotes(filas: Iterator[Fila], tamano_lote: int) -> Iterator[List[Fila]]:
+    """Agrupar las filas en listas de a lo sumo `tamano_lote` elementos."""
+    while True:
+        lote = list(islice(filas, tamano_lote))
+        if not lote:
+            return
+        yield lote
+
+
+def _resultado(ruta: str, filas: int, errores: List[Dict[str, Any]], inicio: float) -> Dict[str, Any]:
+    """Construir el resumen de una importación."""
+    return {
+        "archivo": ruta,
+        "filas": filas,
+        "importadas": filas - len(errores),
+        "errores": errores,
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+def importar_empleados(ruta: str, storage: JsonStorage, tamano_lote: int = 1000) -> Dict[str, Any]:
+    """Importar empleados desde un archivo CSV o JSONL.
+
+    Los ids de cada lote se reservan en bloque con una sola llamada a la
+    secuencia de empleados.
+
+    Args:
+        ruta: Archivo con columnas nombre y cargo
+        storage: Storage de empleados
+        tamano_lote: Cantidad de filas que se escriben juntas
+
+    Returns:
+        Dict con archivo, filas, importadas, errores (fila, error) y segundos
+    """
+    inicio = time.perf_counter()
+    errores: List[Dict[str, Any]] = []
+    filas = 0
+    for lote in _lotes(_leer_filas(ruta), tamano_lote):
+        validas = []
+        for numero, fila, error in lote:
+            filas += 1
+            nombre = fila.get("nombre") or ""
+            cargo = fila.get("cargo") or ""
+            try:
+                if error:
+                    raise ValueError(error)
+                _validar_empleado(nombre, cargo)
+            except ValueError as exc:
+                errores.append({"archivo": ruta, "fila": numero, "error": str(exc)})
+                continue
+            validas.append((nombre.strip(), cargo.strip()))
+        if validas:
+            con_reintentos(lambda: _escribir_empleados(validas, storage))
+    return _resultado(ruta, filas, errores, inicio)
+
+
+def _escribir_empleados(validas: List[Tuple[str, str]], storage: JsonStorage) -> None:
+    """Agregar un lote de empleados ya validados en una sola escritura."""
+    with storage.batch():
+        primer_id = _get_next_id(storage, len(validas))
+        for desplazamiento, (nombre, cargo) in enumerate(validas):
+            storage.add({
+                "id": primer_id + desplazamiento,
+                "nombre": nombre,
+                "cargo": cargo,
+                "contratos": []
+            })
+
+
+def importar_contratos(ruta: str, storage: JsonStorage, tamano_lote: int = 1000) -> Dict[str, Any]:
+    """Importar contratos desde un archivo CSV o JSONL.
+
+    Cada fila se asocia con `asociar_contrato`, por lo que aplica las mismas
+    validaciones (empleado existente, fechas y salario).
+
+    Args:
+        ruta: Archivo con columnas id_empleado, fecha_inicio, fecha_fin y salario
+        storage: Storage de empleados
+        tamano_lote: Cantidad de filas que se escriben juntas
+
+    Returns:
+        Dict con archivo, filas, importadas, errores (fila, error) y segundos
+    """
+    inicio = time.perf_counter()
+    errores: List[Dict[str, Any]] = []
+    filas = 0
+    for lote in _lotes(_leer_filas(ruta), tamano_lote):
+        filas += len(lote)
+        errores += con_reintentos(lambda: _escribir_contratos(ruta, lote, storage))
+    return _resultado(ruta, filas, errores, inicio)
+
+
+def _escribir_contratos(
+    ruta: str,
+    lote: List[Fila],
+    storage: JsonStorage
+) -> List[Dict[str, Any]]:
+    """Asociar los contratos de un lote en una sola escritura y retornar los errores por fila."""
+    errores = []
+    with storage.batch():
+        for numero, fila, error in lote:
+            try:
+                if error:
+                    raise ValueError(error)
+                try:
+                    id_empleado = int(fila.get("id_empleado"))
+                except (TypeError, ValueError):
+                    raise ValueError("id_empleado debe ser un número entero")
+                try:
+                    salario = float(fila.get("salario"))
+                except (TypeError, ValueError):
+                    raise ValueError("salario debe ser un número")
+                asociar_contrato(
+                    id_empleado,
+                    fila.get("fecha_inicio"),
+                    fila.get("fecha_fin"),
+                    salario,
+                    storage
+                )
+            except ValueError as exc:
+                errores.append({"archivo": ruta, "fila": numero, "error": str(exc)})
+    return errores
+
+
+def escribir_errores(ruta: str, errores: List[Dict[str, Any]]) -> None:
+    """Escribir los errores por fila en un archivo CSV (archivo, fila, error)."""
+    with open(ruta, "w", encoding="utf-8", newline="") as fh:
+        writer = csv.DictWriter(fh, fieldnames=["archivo", "fila", "error"])
+        writer.writeheader()
+        writer.writerows(errores)
@@ -0,0 +1,204 @@
+"""Índices en memoria que el storage mantiene sobre la lista de empleados.
+
+Los índices se construyen a partir de la lista de empleados y se actualizan de
+forma incremental en cada add/update/delete, para responder consultas sin
+recorrer todos los registros.
+"""
+from bisect import bisect_left, insort
+from collections import Counter
+from heapq import nsmallest
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import unicodedata
+
+from .fechas import a_ordinal_o_none
+
+
+class IndiceVencimientos:
+    """Lista ordenada de (fecha_fin, id_empleado, id_contrato).
+
+    La fecha de fin se guarda como ordinal, decodificada una sola vez al
+    indexar el contrato. Permite obtener los contratos que vencen antes de una
+    fecha con una búsqueda binaria. Los contratos sin fecha de fin o con fecha
+    inválida no se indexan.
+    """
+
+    def __init__(self, empleados: Iterable[Dict[str, Any]] = ()):
+        claves = []
+        for empleado in empleados:
+            claves.extend(self._claves_de(empleado))
+        claves.sort()
+        self._claves: List[Tuple[int, Any, Any]] = claves
+
+    def __len__(self) -> int:
+        return len(self._claves)
+
+    @staticmethod
+    def _claves_de(empleado: Dict[str, Any]) -> List[Tuple[int, Any, Any]]:
+        """Retornar las claves de índice de los contratos de un empleado."""
+        claves = []
+        for contrato in empleado.get("contratos", []):
+            fecha_fin = a_ordinal_o_none(contrato.get("fecha_fin"))
+            if fecha_fin is not None:
+                claves.append((fecha_fin, empleado.get("id"), contrato.get("id_contrato")))
+        return claves
+
+    def agregar_empleado(self, empleado: Dict[str, Any]) -> None:
+        """Indexar los contratos de un empleado."""
+        for clave in self._claves_de(empleado):
+            insort(self._claves, clave)
+
+    def quitar_empleado(self, empleado: Dict[str, Any]) -> None:
+        """Quitar del índice los contratos de un empleado."""
+        for clave in self._claves_de(empleado):
+            i = bisect_left(self._claves, clave)
+            if i < len(self._claves) and self._claves[i] == clave:
+                del self._claves[i]
+
+    def antes_de(self, limite: int) -> List[Tuple[int, Any, Any]]:
+        """Retornar las claves con fecha de fin anterior al ordinal `limite`."""
+        return self._claves[:bisect_left(self._claves, (limite,))]
+
+
+class IndiceCargos:
+    """Índice invertido cargo -> ids de empleados, ordenados por id."""
+
+    def __init__(self, empleados: Iterable[Dict[str, Any]] = ()):
+        self._ids: Dict[Any, List[Any]] = {}
+        for empleado in empleados:
+            self._ids.setdefault(empleado.get("cargo"), []).append(empleado.get("id"))
+        for ids in self._ids.values():
+            ids.sort()
+
+    def agregar_empleado(self, empleado: Dict[str, Any]) -> None:
+        """Indexar un empleado bajo su cargo."""
+        insort(self._ids.setdefault(empleado.get("cargo"), []), empleado.get("id"))
+
+    def quitar_empleado(self, empleado: Dict[str, Any]) -> None:
+        """Quitar un empleado del índice."""
+        ids = self._ids.get(empleado.get("cargo"), [])
+        i = bisect_left(ids, empleado.get("id"))
+        if i < len(ids) and ids[i] == empleado.get("id"):
+            del ids[i]
+
+    def ids(self, cargo: str) -> List[Any]:
+        """Retornar los ids de los empleados con el cargo dado, en orden de id."""
+        return self._ids.get(cargo, [])
+
+
+def clave_nombre(nombre: Optional[str]) -> str:
+    """Normalizar un nombre para ordenar y buscar sin distinguir mayúsculas."""
+    return (nombre or "").casefold()
+
+
+class IndiceNombres:
+    """Lista ordenada de (nombre normalizado, id) para búsquedas por prefijo."""
+
+    def __init__(self, empleados: Iterable[Dict[str, Any]] = ()):
+        claves = [self._clave_de(e) for e in empleados]
+        claves.sort()
+        self._claves: List[Tuple[str, Any]] = claves
+
+    @staticmethod
+    def _clave_de(empleado: Dict[str, Any]) -> Tuple[str, Any]:
+        """Retornar la clave de índice de un empleado."""
+        return (clave_nombre(empleado.get("nombre")), empleado.get("id"))
+
+    def agregar_empleado(self, empleado: Dict[str, Any]) -> None:
+        """Indexar el nombre de un empleado."""
+        insort(self._claves, self._clave_de(empleado))
+
+    def quitar_empleado(self, empleado: Dict[str, Any]) -> None:
+        """Quitar el nombre de un empleado del índice."""
+        clave = self._clave_de(empleado)
+        i = bisect_left(self._claves, clave)
+        if i < len(self._claves) and self._claves[i] == clave:
+            del self._claves[i]
+
+    def con_prefijo(self, prefijo: str) -> List[Any]:
+        """Retornar, en orden de nombre, los ids cuyo nombre empieza con `prefijo`."""
+        prefijo = clave_nombre(prefijo)
+        ids = []
+        for i in range(bisect_left(self._claves, (prefijo,)), len(self._claves)):
+            nombre, id_empleado = self._claves[i]
+            if not nombre.startswith(prefijo):
+                break
+            ids.append(id_empleado)
+        return ids
+
+
+# Similitud mínima por defecto para considerar que dos nombres se parecen
+UMBRAL_SIMILITUD = 0.3
+
+
+def trigramas(texto: Optional[str]) -> FrozenSet[str]:
+    """Retornar los trigramas de un texto para comparaciones aproximadas.
+
+    El texto se pasa a minúsculas y sin tildes; cada palabra se rellena con
+    dos espacios al inicio y uno al final, de modo que también cuentan sus
+    primeras letras (como en pg_trgm).
+    """
+    normalizado = unicodedata.normalize("NFKD", (texto or "").casefold())
+    normalizado = "".join(c for c in normalizado if not unicodedata.combining(c))
+    resultado: Set[str] = set()
+    for palabra in normalizado.split():
+        relleno = f"  {palabra} "
+        resultado.update(relleno[i:i + 3] for i in range(len(relleno) - 2))
+    return frozenset(resultado)
+
+
+def similitud(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Similitud de Jaccard entre dos conjuntos de trigramas (0 a 1)."""
+    if not a or not b:
+        return 0.0
+    comunes = len(a & b)
+    return comunes / (len(a) + len(b) - comunes)
+
+
+class IndiceTrigramas:
+    """Índice invertido trigrama -> ids de empleados sobre el campo nombre.
+
+    Permite buscar nombres parecidos a un texto (tolerando errores de tipeo)
+    contando los trigramas compartidos solo con los empleados que tienen
+    alguno en común, sin comparar contra todos los nombres.
+    """
+
+    def __init__(self, empleados: Iterable[Dict[str, Any]] = ()):
+        self._ids: Dict[str, Set[Any]] = {}
+        self._trigramas: Dict[Any, FrozenSet[str]] = {}
+        for empleado in empleados:
+            self.agregar_empleado(empleado)
+
+    def agregar_empleado(self, empleado: Dict[str, Any]) -> None:
+        """Indexar el nombre de un empleado."""
+        id_empleado = empleado.get("id")
+        propios = trigramas(empleado.get("nombre"))
+        self._trigramas[id_empleado] = propios
+        for trigrama in propios:
+            self._ids.setdefault(trigrama, set()).add(id_empleado)
+
+    def quitar_empleado(self, empleado: Dict[str, Any]) -> None:
+        """Quitar el nombre de un empleado del índice."""
+        id_empleado = empleado.get("id")
+        for trigrama in self._trigramas.pop(id_empleado, ()):
+            ids = self._ids[trigrama]
+            ids.discard(id_empleado)
+            if not ids:
+                del self._ids[trigrama]
+
+    def buscar(self, texto: str, limite: int = 10, umbral: float = UMBRAL_SIMILITUD) -> List[Tuple[float, Any]]:
+        """Retornar hasta `limite` pares (similitud, id) con similitud >= `umbral`.
+
+        Ordenados de mayor a menor similitud y, a igual similitud, por id.
+        """
+        consulta = trigramas(texto)
+        if not consulta:
+            return []
+        comunes: Counter = Counter()
+        for trigrama in consulta:
+            comunes.update(self._ids.get(trigrama, ()))
+        candidatos = []
+        for id_empleado, cantidad in comunes.items():
+            valor = cantidad / (len(consulta) + len(self._trigramas[id_empleado]) - cantidad)
+            if valor >= umbral:
+                candidatos.append((valor, id_empleado))
+        return nsmallest(limite, candidatos, key=lambda c: (-c[0], c[1]))
@@ -0,0 +1,299 @@
+"""Almacenamiento JSON con bitácora de solo anexado.
+
+`JournalStorage` expone la misma interfaz CRUD que `JsonStorage`, pero en lugar
+de reescribir el documento completo en cada operación guarda:
+
+- una instantánea del documento en el mismo formato que `JsonStorage`, y
+- un archivo ``<archivo>.journal`` con una línea JSON por cada add/update/delete.
+  La bitácora nunca se comprime, para poder anexar líneas; el formato de la
+  instantánea (ver `JsonStorage`) sí se respeta.
+
+Al abrir se carga la instantánea y se reproducen las operaciones de la
+bitácora hasta la primera línea incompleta o inválida; antes de anexar, esa
+cola se recorta para que las entradas nuevas no queden detrás de ella. Cada ``compact_every`` operaciones la bitácora se compacta en una
+nueva instantánea.
+"""
+from pathlib import Path
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
+import json
+import os
+import zlib
+
+from . import metricas
+from .json_storage import JsonStorage, _abrir_texto, _leer_meta
+
+
+def _entradas(fh: IO[bytes]) -> Iterator[Tuple[Dict[str, Any], int]]:
+    """Iterar (entrada, posición donde termina su línea) de la bitácora.
+
+    Se detiene en la primera línea sin salto de línea final (escritura
+    interrumpida) o que no se puede parsear: lo que sigue no se aplica.
+    """
+    fin = 0
+    for linea in fh:
+        if not linea.endswith(b"\n"):
+            return
+        try:
+            entrada = json.loads(linea)
+        except ValueError:
+            return
+        fin += len(linea)
+        yield entrada, fin
+
+
+class JournalStorage(JsonStorage):
+    """Storage con instantánea + bitácora de operaciones.
+
+    Cada entrada de la bitácora lleva un número de secuencia; la instantánea
+    registra en ``meta.journal_seq`` la última secuencia que incluye, de modo
+    que una compactación interrumpida no vuelve a aplicar operaciones. La
+    secuencia cumple además el papel de ``meta.version`` para detectar
+    escrituras concurrentes de otros procesos.
+    """
+
+    def __init__(self, file_path: str, compact_every: int = 1000, formato: Optional[str] = None):
+        super().__init__(file_path, cache=True, formato=formato)
+        self.journal_path = Path(f"{self.file_path}.journal")
+        self.compact_every = compact_every
+        # Firma de la bitácora y bytes ya aplicados al documento en memoria
+        self._journal_firma: Optional[Tuple[int, int, int]] = None
+        self._journal_fin = 0
+        # Lo último que se sabe de la bitácora en disco: (firma, fin de la
+        # última entrada válida, mayor secuencia hasta ahí); evita releerla entera
+        self._journal_disco: Optional[Tuple[Tuple[int, int, int], int, int]] = None
+        self._seq = 0
+        self._pendientes = 0
+
+    def _firma_journal(self) -> Optional[Tuple[int, int, int]]:
+        """Retornar la firma del archivo de bitácora, o None si no existe."""
+        try:
+            st = self.journal_path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def invalidate_cache(self) -> None:
+        """Descartar el documento en memoria para forzar instantánea + reproducción."""
+        super().invalidate_cache()
+        self._journal_firma = None
+        self._journal_fin = 0
+        self._journal_disco = None
+
+    @metricas.instrumentar("storage.load_json")
+    def load_json(self) -> Dict[str, Any]:
+        """Retornar el documento: instantánea más las operaciones de la bitácora.
+
+        Solo se relee cuando cambia la instantánea o la bitácora en disco. Si
+        solo se anexaron entradas a la bitácora, se aplican las nuevas sobre
+        el documento en memoria.
+        """
+        if (
+            self._cache_data is None
+            or self._firma_archivo() != self._cache_firma
+            or self._firma_journal() != self._journal_firma
+        ):
+            with self._relectura, self._bloqueo.compartido():
+                firma = self._firma_archivo()
+                firma_journal = self._firma_journal()
+                if self._cache_data is not None and firma == self._cache_firma:
+                    if firma_journal != self._journal_firma and self._solo_anexada(firma_journal):
+                        self._pendientes += self._reproducir(self._cache_data, self._journal_fin)
+                    elif firma_journal != self._journal_firma:
+                        self._recargar()
+                else:
+                    self._recargar()
+                self._cache_firma = firma
+                self._journal_firma = firma_journal
+                if firma_journal is not None:
+                    self._journal_disco = (firma_journal, self._journal_fin, self._seq)
+        return self._cache_data
+
+    def _recargar(self) -> None:
+        """Leer la instantánea y reproducir la bitácora completa."""
+        data = self._leer_archivo()
+        self._seq = data.get("meta", {}).get("journal_seq", 0)
+        self._pendientes = self._reproducir(data, 0)
+        self._cache_data = data
+        self._fragmentos = {}
+
+    def _solo_anexada(self, firma_journal: Optional[Tuple[int, int, int]]) -> bool:
+        """Indicar si la bitácora actual es la ya aplicada con entradas agregadas al final."""
+        if firma_journal is None or firma_journal[1] < self._journal_fin:
+            return False
+        return self._journal_firma is None or self._journal_firma[2] == firma_journal[2]
+
+    def iter_empleados(self, tamano_bloque: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+        """Iterar los empleados del documento en memoria.
+
+        La instantánea sola no refleja las operaciones de la bitácora, por lo
+        que no se parsea de forma incremental.
+        """
+        yield from self.get_all()
+
+    def _reproducir(self, data: Dict[str, Any], desde: int) -> int:
+        """Aplicar sobre `data` las entradas de la bitácora posteriores a la instantánea.
+
+        Lee desde el byte `desde` (el fin de una entrada ya aplicada) y deja en
+        `_journal_fin` el fin de la última entrada válida. Retorna la cantidad
+        de entradas aplicadas. Una última línea incompleta (escritura
+        interrumpida) se ignora.
+        """
+        self._journal_fin = desde
+        if not self.journal_path.exists():
+            return 0
+        aplicadas = 0
+        with self.journal_path.open("rb") as fh:
+            fh.seek(desde)
+            for entrada, fin in _entradas(fh):
+                self._journal_fin = desde + fin
+                if entrada.get("seq", 0) <= self._seq:
+                    continue
+                self._aplicar(data, entrada)
+                self._seq = entrada["seq"]
+                aplicadas += 1
+        return aplicadas
+
+    def _aplicar(self, data: Dict[str, Any], entrada: Dict[str, Any]) -> None:
+        """Aplicar una entrada de la bitácora sobre el documento en memoria.
+
+        Mantiene al día los índices, ya que el documento puede ser el que
+        está en caché.
+        """
+        empleados = data.setdefault("empleados", [])
+        op = entrada.get("op")
+        if op == "add":
+            record = entrada["record"]
+            empleados.append(record)
+            self._indice(empleados).setdefault(record.get("id"), len(empleados) - 1)
+            for secundario in self._secundarios.values():
+                secundario.agregar_empleado(record)
+        elif op == "update":
+            pos = self._indice(empleados).get(entrada["id"])
+            if pos is not None:
+                anterior = empleados[pos]
+                empleados[pos] = {**anterior, **entrada["updates"]}
+                for secundario in self._secundarios.values():
+                    secundario.quitar_empleado(anterior)
+                    secundario.agregar_empleado(empleados[pos])
+        elif op == "delete":
+            self._indice(empleados)
+            restantes = []
+            for rec in empleados:
+                if rec.get("id") == entrada["id"]:
+                    for secundario in self._secundarios.values():
+                        secundario.quitar_empleado(rec)
+                else:
+                    restantes.append(rec)
+            self._reindexar_ids(restantes)
+            data["empleados"] = restantes
+        elif op == "reservar":
+            data.setdefault("meta", {})[entrada["secuencia"]] = entrada["siguiente"]
+
+    def _version_cargada(self, data: Dict[str, Any]) -> int:
+        """Retornar la última secuencia incluida en el documento en memoria."""
+        return self._seq
+
+    def _version_en_disco(self) -> int:
+        """Retornar la última secuencia guardada: la de la bitácora o, si está vacía, la de la instantánea."""
+        seq = 0
+        try:
+            with _abrir_texto(self.file_path) as fh:
+                seq = _leer_meta(fh).get("journal_seq", 0)
+        except (ValueError, OSError, EOFError, zlib.error):
+            pass
+        return max(seq, self._estado_journal()[1])
+
+    def _estado_journal(self) -> Tuple[int, int]:
+        """Retornar (fin de la última entrada válida, mayor secuencia) de la bitácora en disco.
+
+        Si la bitácora no cambió desde la última vez no se lee; si solo
+        creció, se leen únicamente los bytes nuevos. Debe llamarse con un
+        bloqueo tomado.
+        """
+        firma = self._firma_journal()
+        if firma is None:
+            return 0, 0
+        conocido = self._journal_disco
+        if conocido is not None and conocido[0] == firma:
+            return conocido[1], conocido[2]
+        desde, seq = 0, 0
+        if conocido is not None and conocido[0][2] == firma[2] and firma[1] >= conocido[1]:
+            desde, seq = conocido[1], conocido[2]
+        fin = desde
+        try:
+            with self.journal_path.open("rb") as fh:
+                fh.seek(desde)
+                for entrada, leido in _entradas(fh):
+                    seq = max(seq, entrada.get("seq", 0))
+                    fin = desde + leido
+        except OSError:
+            return 0, 0
+        self._journal_disco = (firma, fin, seq)
+        return fin, seq
+
+    def _confirmar(self, data: Dict[str, Any], operaciones: List[Dict[str, Any]]) -> None:
+        """Anexar las operaciones a la bitácora en una sola escritura y compactar si corresponde."""
+        with metricas.medir("json.serializar"):
+            contenido = "".join(
+                json.dumps({"seq": i, **operacion}, ensure_ascii=False) + "\n"
+                for i, operacion in enumerate(operaciones, start=self._seq + 1)
+            ).encode("utf-8")
+        try:
+            with metricas.medir("disco.escribir"):
+                inicio = self._recortar_cola()
+                with self.journal_path.open("ab") as fh:
+                    fh.write(contenido)
+            metricas.sumar(metricas.BYTES_ESCRITOS, len(contenido))
+        except Exception:
+            self.invalidate_cache()
+            raise
+        self._seq += len(operaciones)
+        self._pendientes += len(operaciones)
+        self._journal_fin = inicio + len(contenido)
+        self._journal_firma = self._firma_journal()
+        self._journal_disco = (self._journal_firma, self._journal_fin, self._seq)
+        if self._pendientes >= self.compact_every:
+            self.compact()
+
+    def _recortar_cola(self) -> int:
+        """Truncar la bitácora tras su última entrada válida y retornar su tamaño.
+
+        Una escritura interrumpida deja una línea incompleta; si se anexara
+        detrás de ella, la reproducción se detendría ahí y perdería también
+        las entradas nuevas. Debe llamarse con el bloqueo exclusivo tomado.
+        """
+        firma = self._firma_journal()
+        if firma is None:
+            return 0
+        fin, seq = self._estado_journal()
+        if fin < firma[1]:
+            os.truncate(self.journal_path, fin)
+            self._journal_disco = (self._firma_journal(), fin, seq)
+        return fin
+
+    def save_json(self, data: Dict[str, Any]) -> None:
+        """Escribir `data` como nueva instantánea y vaciar la bitácora.
+
+        La instantánea se reemplaza de forma atómica (ver `JsonStorage.save_json`)
+        antes de borrar la bitácora.
+        """
+        data.setdefault("meta", {})["journal_seq"] = self._seq
+        with self._bloqueo.exclusivo():
+            super().save_json(data)
+            try:
+                if self.journal_path.exists():
+                    self.journal_path.unlink()
+            except Exception:
+                self.invalidate_cache()
+                raise
+        self._pendientes = 0
+        self._cache_data = data
+        self._cache_firma = self._firma_archivo()
+        self._journal_firma = None
+        self._journal_fin = 0
+        self._journal_disco = None
+
+    def compact(self) -> None:
+        """Consolidar la bitácora en una nueva instantánea."""
+        with self._bloqueo.exclusivo():
+            self.save_json(self.load_json())
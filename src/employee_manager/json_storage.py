@@ -4,9 +4,414 @@ Este módulo debe proporcionar una clase `JsonStorage` para operaciones CRUD sob
 archivos JSON. Por ahora solo contiene esqueletos y docstrings; implementaremos
 los métodos punto por punto según lo vayamos definiendo.
 """
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+import gzip
+import io
 import json
+import os
+import threading
+import zlib
+
+from . import metricas
+from .concurrencia import BloqueoArchivo, ConflictoDeVersion
+from .indices import (
+    UMBRAL_SIMILITUD,
+    IndiceCargos,
+    IndiceNombres,
+    IndiceTrigramas,
+    IndiceVencimientos,
+    clave_nombre,
+)
+from .models import ContractTable
+
+_DECODER = json.JSONDecoder()
+_ESPACIOS = " \t\n\r"
+
+# Secuencias de ids guardadas en 'meta' y primer valor de cada una
+SECUENCIA_EMPLEADOS = "next_id"
+SECUENCIA_CONTRATOS = "next_contract_id"
+_PRIMER_VALOR = {SECUENCIA_EMPLEADOS: 1, SECUENCIA_CONTRATOS: 101}
+
+# Formatos del archivo: JSON indentado, JSON sin espacios, o este último comprimido
+FORMATOS = ("pretty", "compact", "gzip", "zlib")
+FORMATO_POR_DEFECTO = "pretty"
+_MAGIA_GZIP = b"\x1f\x8b"
+# Nivel de compresión: el de zlib por defecto, mucho más rápido que el máximo
+_NIVEL_COMPRESION = 6
+# Fracción de fragmentos de registros reemplazados o eliminados que se tolera
+# en la caché antes de recorrerla para descartarlos
+_MAX_OBSOLETOS = 0.25
+
+
+class _LectorIncremental:
+    """Buffer de texto sobre un archivo que se rellena bajo demanda.
+
+    Solo conserva en memoria el fragmento aún no consumido más el bloque leído,
+    de modo que el consumo de memoria no depende del tamaño del archivo.
+    """
+
+    def __init__(self, fh: IO[str], tamano_bloque: int):
+        self._fh = fh
+        self._tamano_bloque = tamano_bloque
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def rellenar(self) -> bool:
+        """Leer otro bloque descartando lo ya consumido. Retorna False en EOF."""
+        if self.eof:
+            return False
+        bloque = self._fh.read(self._tamano_bloque)
+        if not bloque:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + bloque
+        self.pos = 0
+        return True
+
+    def siguiente_caracter(self) -> str:
+        """Saltar espacios y retornar el siguiente carácter sin consumirlo ('' en EOF)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _ESPACIOS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.rellenar():
+                return ""
+
+    def consumir(self, caracter: str) -> None:
+        """Consumir el carácter esperado o lanzar ValueError."""
+        if self.siguiente_caracter() != caracter:
+            raise ValueError(f"Se esperaba {caracter!r} en el JSON")
+        self.pos += 1
+
+    def valor(self) -> Any:
+        """Decodificar el siguiente valor JSON completo, leyendo más bloques si hace falta."""
+        self.siguiente_caracter()
+        while True:
+            try:
+                valor, fin = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.rellenar():
+                    raise
+                continue
+            # Un valor que termina justo al final del buffer puede estar truncado
+            # (p. ej. un número); se confirma leyendo otro bloque
+            if fin == len(self.buf) and self.rellenar():
+                continue
+            self.pos = fin
+            return valor
+
+
+def _iterar_empleados(fh: IO[str], tamano_bloque: int) -> Iterator[Dict[str, Any]]:
+    """Recorrer la lista 'empleados' de un documento JSON elemento por elemento.
+
+    Acepta el formato {"empleados": [...]} (en cualquier posición entre las
+    claves) y la lista antigua [...]. Lanza ValueError si el JSON es inválido.
+    """
+    lector = _LectorIncremental(fh, tamano_bloque)
+    inicio = lector.siguiente_caracter()
+    if inicio == "{":
+        lector.consumir("{")
+        while True:
+            if lector.siguiente_caracter() == "}":
+                return
+            clave = lector.valor()
+            lector.consumir(":")
+            if clave == "empleados" and lector.siguiente_caracter() == "[":
+                break
+            lector.valor()  # Otras claves (p. ej. "meta") se descartan
+            if lector.siguiente_caracter() == ",":
+                lector.consumir(",")
+    elif inicio != "[":
+        raise ValueError("El documento JSON no contiene una lista de empleados")
+
+    lector.consumir("[")
+    if lector.siguiente_caracter() == "]":
+        return
+    while True:
+        empleado = lector.valor()
+        if isinstance(empleado, dict):
+            yield empleado
+        if lector.siguiente_caracter() != ",":
+            lector.consumir("]")
+            return
+        lector.consumir(",")
+
+
+def _compresion(cabecera: bytes) -> Optional[str]:
+    """Detectar por sus primeros bytes si un archivo está comprimido ("gzip"/"zlib").
+
+    Un documento JSON empieza con '{', '[' o espacios, que nunca coinciden con
+    la cabecera de gzip ni con una cabecera zlib válida.
+    """
+    if cabecera[:2] == _MAGIA_GZIP:
+        return "gzip"
+    if len(cabecera) >= 2 and cabecera[0] & 0x0F == 8 and int.from_bytes(cabecera[:2], "big") % 31 == 0:
+        return "zlib"
+    return None
+
+
+def _validar_formato(formato: str) -> None:
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: '{formato}' (opciones: {', '.join(FORMATOS)})")
+
+
+def _codificar(valor: Any, formato: str, nivel: int = 0) -> bytes:
+    """Codificar un valor como JSON tal como aparece a la profundidad `nivel`.
+
+    En formato indentado las líneas siguientes a la primera llevan la sangría
+    del nivel, de modo que el fragmento puede insertarse tal cual en el documento.
+    """
+    if formato == "pretty":
+        texto = json.dumps(valor, ensure_ascii=False, indent=2)
+        if nivel:
+            texto = texto.replace("\n", "\n" + "  " * nivel)
+        return texto.encode("utf-8")
+    return json.dumps(valor, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _codificar_empleado(empleado: Dict[str, Any], formato: str) -> bytes:
+    """Codificar un empleado como fragmento de la lista 'empleados' del archivo.
+
+    El fragmento empieza con el separador que lo precede en la lista (coma y,
+    en formato indentado, salto de línea y sangría): `_ensamblar` los une sin
+    copiarlos dos veces y obtiene los mismos bytes que `json.dumps` sobre el
+    documento completo.
+    """
+    if formato == "pretty":
+        return b",\n    " + _codificar(empleado, formato, 2)
+    return b"," + _codificar(empleado, formato)
+
+
+def _ensamblar(documento: Dict[str, Any], fragmentos: List[bytes], formato: str) -> bytes:
+    """Armar el JSON del documento con la lista 'empleados' ya codificada.
+
+    Las partes se unen una sola vez: la lista puede ocupar cientos de MB.
+    Al primer fragmento se le quita la coma inicial (ver `_codificar_empleado`).
+    """
+    if not documento:
+        return b"{}"
+    indentado = formato == "pretty"
+    separador, dos_puntos = (b",\n  ", b": ") if indentado else (b",", b":")
+    partes = [b"{\n  " if indentado else b"{"]
+    for clave, valor in documento.items():
+        if len(partes) > 1:
+            partes.append(separador)
+        partes += [_codificar(clave, formato), dos_puntos]
+        if clave != "empleados":
+            partes.append(_codificar(valor, formato, 1))
+        elif not fragmentos:
+            partes.append(b"[]")
+        else:
+            partes += [b"[", fragmentos[0][1:]]
+            partes += fragmentos[1:]
+            partes.append(b"\n  ]" if indentado else b"]")
+    partes.append(b"\n}" if indentado else b"}")
+    return b"".join(partes)
+
+
+def _fragmentos(
+    empleados: List[Dict[str, Any]],
+    formato: str,
+    cache: Dict[int, Tuple[Dict[str, Any], bytes]]
+) -> List[bytes]:
+    """Retornar los fragmentos de `empleados`, codificando solo los que no están en `cache`.
+
+    La caché va por identidad del registro: add y update dejan en la lista un
+    diccionario nuevo, que se codifica; los demás reutilizan su fragmento. Las
+    entradas de registros que ya no están se descartan cuando superan la
+    fracción `_MAX_OBSOLETOS` de la cantidad de empleados.
+    """
+    obtener = cache.get
+    fragmentos = []
+    agregar = fragmentos.append
+    for empleado in empleados:
+        # La entrada guarda el registro, así que su id() no puede reutilizarse
+        entrada = obtener(id(empleado))
+        if entrada is None:
+            entrada = cache[id(empleado)] = (empleado, _codificar_empleado(empleado, formato))
+        agregar(entrada[1])
+    if len(cache) > len(empleados) * (1 + _MAX_OBSOLETOS):
+        vigentes = {id(empleado) for empleado in empleados}
+        for clave in [clave for clave in cache if clave not in vigentes]:
+            del cache[clave]
+    return fragmentos
+
+
+def _serializar(
+    documento: Dict[str, Any],
+    formato: str,
+    cache: Optional[Dict[int, Tuple[Dict[str, Any], bytes]]] = None
+) -> bytes:
+    """Convertir el documento a los bytes del archivo en el formato dado.
+
+    Args:
+        documento: Documento a guardar
+        formato: Uno de `FORMATOS`
+        cache: Fragmentos de empleados ya codificados (ver `_fragmentos`) en
+               el mismo formato sin comprimir; si es None se codifica el
+               documento completo
+    """
+    base = "pretty" if formato == "pretty" else "compact"
+    with metricas.medir("json.serializar"):
+        empleados = documento.get("empleados") if isinstance(documento, dict) else None
+        if cache is not None and isinstance(empleados, list):
+            contenido = _ensamblar(documento, _fragmentos(empleados, base, cache), base)
+        else:
+            contenido = _codificar(documento, base)
+    if formato in ("pretty", "compact"):
+        return contenido
+    with metricas.medir("compresion"):
+        if formato == "gzip":
+            # mtime=0: el mismo documento produce siempre los mismos bytes
+            return gzip.compress(contenido, _NIVEL_COMPRESION, mtime=0)
+        return zlib.compress(contenido, _NIVEL_COMPRESION)
+
+
+def _descomprimir(contenido: bytes) -> Tuple[bytes, Optional[str]]:
+    """Retornar (JSON sin comprimir, compresión detectada o None)."""
+    compresion = _compresion(contenido[:2])
+    if compresion is None:
+        return contenido, None
+    with metricas.medir("descompresion"):
+        if compresion == "gzip":
+            return gzip.decompress(contenido), compresion
+        return zlib.decompress(contenido), compresion
+
+
+class _Descompresor(io.RawIOBase):
+    """Archivo binario de solo lectura que descomprime `fh` a medida que se lee."""
+
+    def __init__(self, fh: IO[bytes], compresion: str, tamano_bloque: int = 1 << 16):
+        # wbits 16 + MAX_WBITS: formato gzip; MAX_WBITS: formato zlib
+        self._fh = fh
+        self._descompresor = zlib.decompressobj(zlib.MAX_WBITS + (16 if compresion == "gzip" else 0))
+        self._tamano_bloque = tamano_bloque
+        self._pendiente = b""
+        self._posicion = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while self._posicion == len(self._pendiente):
+            bloque = self._fh.read(self._tamano_bloque)
+            self._pendiente = self._descompresor.decompress(bloque) if bloque else self._descompresor.flush()
+            self._posicion = 0
+            if not bloque and not self._pendiente:
+                return 0
+        n = min(len(buffer), len(self._pendiente) - self._posicion)
+        buffer[:n] = self._pendiente[self._posicion:self._posicion + n]
+        self._posicion += n
+        return n
+
+    def close(self) -> None:
+        self._fh.close()
+        super().close()
+
+
+def _abrir_texto(path: Path) -> IO[str]:
+    """Abrir un archivo de empleados para leerlo como texto, comprimido o no.
+
+    La descompresión es incremental, así que `_iterar_empleados` y
+    `_leer_meta` siguen sin cargar el documento completo.
+    """
+    fh = path.open("rb")
+    try:
+        compresion = _compresion(fh.peek(2)[:2])
+        binario = fh if compresion is None else io.BufferedReader(_Descompresor(fh, compresion))
+        return io.TextIOWrapper(binario, encoding="utf-8")
+    except Exception:
+        fh.close()
+        raise
+
+
+def inicializar_archivo(ruta: str, formato: str = FORMATO_POR_DEFECTO) -> None:
+    """Crear (o vaciar) un archivo de empleados sin registros en el formato dado.
+
+    Lanza ValueError si el formato no es uno de `FORMATOS`.
+    """
+    _validar_formato(formato)
+    documento = {"meta": {"formato": formato}, "empleados": []} if formato != FORMATO_POR_DEFECTO else {"empleados": []}
+    path = Path(ruta)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(_serializar(documento, formato))
+
+
+def _leer_meta(fh: IO[str], tamano_bloque: int = 1 << 12) -> Dict[str, Any]:
+    """Leer la clave 'meta' de un documento JSON sin parsear el resto.
+
+    `save_json` siempre escribe 'meta' como primera clave, por lo que basta con
+    el primer bloque. Retorna {} si el documento no empieza con 'meta' (por
+    ejemplo un archivo antiguo {"empleados": [...]}), sin leer la lista.
+    """
+    lector = _LectorIncremental(fh, tamano_bloque)
+    if lector.siguiente_caracter() != "{":
+        return {}
+    lector.consumir("{")
+    if lector.siguiente_caracter() != '"' or lector.valor() != "meta":
+        return {}
+    lector.consumir(":")
+    valor = lector.valor()
+    return valor if isinstance(valor, dict) else {}
+
+
+# Claves de ordenamiento de `query`; el id desempata para un orden estable entre backends
+CLAVES_ORDEN = {
+    "id": lambda e: e.get("id"),
+    "nombre": lambda e: (clave_nombre(e.get("nombre")), e.get("id")),
+    "cargo": lambda e: (e.get("cargo") or "", e.get("id")),
+}
+
+
+def _copiar_registro(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Copiar un registro y sus contratos para guardarlo sin compartirlo con el llamador.
+
+    La caché de fragmentos supone que los registros guardados no cambian.
+    """
+    copia = dict(record)
+    contratos = copia.get("contratos")
+    if isinstance(contratos, list):
+        copia["contratos"] = [dict(c) if isinstance(c, dict) else c for c in contratos]
+    return copia
+
+
+def _validar_consulta(order_by: str, limit: Optional[int], offset: int) -> Tuple[str, bool]:
+    """Validar los parámetros de `query` y retornar (campo de orden, descendente).
+
+    Lanza ValueError si el campo de orden no existe o limit/offset son negativos.
+    """
+    campo = order_by[1:] if order_by.startswith("-") else order_by
+    if campo not in CLAVES_ORDEN:
+        raise ValueError(f"No se puede ordenar por '{order_by}' (usar {', '.join(CLAVES_ORDEN)})")
+    if (limit is not None and limit < 0) or offset < 0:
+        raise ValueError("limit y offset no pueden ser negativos")
+    return campo, order_by.startswith("-")
+
+
+def _validar_reserva(secuencia: str, cantidad: int) -> None:
+    """Lanza ValueError si la secuencia no existe o la cantidad no es positiva."""
+    if secuencia not in _PRIMER_VALOR:
+        raise ValueError(f"Secuencia desconocida: '{secuencia}'")
+    if cantidad < 1:
+        raise ValueError("La cantidad de ids a reservar debe ser al menos 1")
+
+
+def _siguiente_libre(empleados: Iterable[Dict[str, Any]], secuencia: str) -> int:
+    """Calcular el siguiente valor de una secuencia recorriendo los registros.
+
+    Solo se usa la primera vez, con documentos guardados antes de que existieran
+    las secuencias. Los ids no enteros se ignoran.
+    """
+    if secuencia == SECUENCIA_CONTRATOS:
+        ids = (c.get("id_contrato") for e in empleados for c in e.get("contratos", []))
+    else:
+        ids = (e.get("id") for e in empleados)
+    mayor = max((i for i in ids if isinstance(i, int)), default=0)
+    return max(mayor + 1, _PRIMER_VALOR[secuencia])
 
 
 class JsonStorage:
@@ -16,64 +421,378 @@ class JsonStorage:
     - load_json
     - save_json
     - get_all
+    - iter_empleados
+    - get_by_id
     - add
     - update
     - delete
+    - batch
 
     Mantener nombres en snake_case.
+
+    Por defecto el documento parseado se mantiene en memoria y solo se vuelve
+    a leer cuando cambia la firma del archivo (mtime, tamaño o inodo). Con
+    ``cache=False`` cada operación relee el archivo completo.
+
+    Con la caché activa los registros devueltos son los del documento en
+    memoria: no deben modificarse directamente, sino a través de ``update``.
+
+    Varios procesos pueden compartir el archivo: las lecturas toman un
+    bloqueo compartido y las escrituras uno exclusivo (``<archivo>.lock``).
+    El documento lleva un contador ``meta.version``; si al escribir la
+    versión en disco ya no es la que se leyó, la escritura se descarta y se
+    lanza `ConflictoDeVersion` para que el llamador repita la operación
+    (ver `concurrencia.con_reintentos`).
+
+    El archivo puede guardarse en cualquiera de `FORMATOS`: JSON indentado
+    (por defecto), compacto, o compacto comprimido con gzip o zlib. Al leer,
+    la compresión se detecta por los primeros bytes; al escribir se conserva
+    el formato del archivo salvo que se indique `formato`.
+
+    Con la caché activa cada escritura guarda el JSON de cada empleado; la
+    siguiente solo codifica los registros agregados o reemplazados por
+    add/update y reutiliza el resto, a cambio de mantener esos bytes en
+    memoria junto al documento.
     """
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, cache: bool = True, formato: Optional[str] = None):
+        if formato is not None:
+            _validar_formato(formato)
         self.file_path = Path(file_path)
+        self.cache = cache
+        # Formato de escritura forzado; None conserva el del archivo
+        self.formato = formato
+        self._compresion_leida: Optional[str] = None
+        self._cache_data: Optional[Dict[str, Any]] = None
+        self._cache_firma: Optional[Tuple[int, int, int]] = None
+        # Índice id -> posición, válido solo para la lista de la que se construyó
+        self._indice_lista: Optional[List[Dict[str, Any]]] = None
+        self._indice_ids: Dict[Any, int] = {}
+        # Índices secundarios (por nombre) construidos bajo demanda para la misma lista
+        self._secundarios: Dict[str, Any] = {}
+        # Fragmento JSON de cada empleado ya escrito, por id() del registro, y su formato
+        self._fragmentos: Dict[int, Tuple[Dict[str, Any], bytes]] = {}
+        self._formato_fragmentos: Optional[str] = None
+        # Copia de trabajo y operaciones pendientes mientras hay un lote abierto
+        self._lote_data: Optional[Dict[str, Any]] = None
+        self._lote_ops: List[Dict[str, Any]] = []
+        self._bloqueo = BloqueoArchivo(self.file_path.with_name(self.file_path.name + ".lock"))
+        # Las relecturas del archivo se hacen de a un hilo: así varios hilos
+        # pueden leer a la vez (ver `AsyncJsonStorage`), aunque no escribir
+        self._relectura = threading.Lock()
+
+    def _firma_archivo(self) -> Optional[Tuple[int, int, int]]:
+        """Retornar (mtime_ns, tamaño, inodo) del archivo, o None si no existe."""
+        try:
+            st = self.file_path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
 
+    def invalidate_cache(self) -> None:
+        """Descartar el documento en caché para forzar una relectura."""
+        self._cache_data = None
+        self._cache_firma = None
+        self._fragmentos = {}
+
+    @metricas.instrumentar("storage.load_json")
     def load_json(self) -> Dict[str, Any]:
         """Cargar y retornar el diccionario con la clave 'empleados'.
 
         Retornar estructura con lista vacía si el archivo no existe o el JSON es inválido.
+        Si la caché está activa y el archivo no cambió, retorna el documento en memoria.
         """
+        if not self.cache:
+            with self._relectura, self._bloqueo.compartido():
+                return self._leer_archivo()
+        firma = self._firma_archivo()
+        if self._cache_data is None or firma != self._cache_firma:
+            with self._relectura, self._bloqueo.compartido():
+                # Con el bloqueo tomado nadie escribe entre la firma y la lectura
+                firma = self._firma_archivo()
+                # Otro hilo lector pudo haber releído mientras se esperaba
+                if self._cache_data is None or firma != self._cache_firma:
+                    self._cache_data = self._leer_archivo()
+                    self._cache_firma = firma
+                    # Los fragmentos eran de los registros del documento anterior
+                    self._fragmentos = {}
+        return self._cache_data
+
+    def _leer_archivo(self) -> Dict[str, Any]:
+        """Leer y parsear el archivo JSON sin pasar por la caché."""
         if not self.file_path.exists():
             return {"empleados": []}
         try:
-            with self.file_path.open("r", encoding="utf-8") as fh:
-                data = json.load(fh)
-                if isinstance(data, dict) and "empleados" in data:
-                    return data
-                # Si es una lista antigua, convertirla
-                if isinstance(data, list):
-                    return {"empleados": data}
-                return {"empleados": []}
-        except (json.JSONDecodeError, OSError):
+            with metricas.medir("disco.leer"):
+                contenido = self.file_path.read_bytes()
+            metricas.sumar(metricas.BYTES_LEIDOS, len(contenido))
+            contenido, self._compresion_leida = _descomprimir(contenido)
+            with metricas.medir("json.parsear"):
+                data = json.loads(contenido)
+            if isinstance(data, dict) and "empleados" in data:
+                return data
+            # Si es una lista antigua, convertirla
+            if isinstance(data, list):
+                return {"empleados": data}
+            return {"empleados": []}
+        except (ValueError, OSError, EOFError, zlib.error):
             # En caso de JSON inválido o problemas de lectura, retornar estructura vacía
             return {"empleados": []}
 
+    @metricas.instrumentar("storage.save_json")
     def save_json(self, data: Dict[str, Any]) -> None:
         """Guardar el diccionario con la clave 'empleados' en archivo JSON.
 
-        Se asegura que la carpeta padre exista y escribe JSON con indentación.
+        Se asegura que la carpeta padre exista y escribe en el formato de
+        `formato_de_escritura`, que queda registrado en ``meta.formato``. El
+        documento se escribe en un archivo temporal que reemplaza al original
+        de forma atómica, con 'meta' como primera clave.
         """
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.file_path.open("w", encoding="utf-8") as fh:
-            json.dump(data, fh, ensure_ascii=False, indent=2)
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        formato = self.formato_de_escritura(data)
+        documento = data
+        if isinstance(data, dict):
+            if formato != FORMATO_POR_DEFECTO:
+                data.setdefault("meta", {})["formato"] = formato
+            elif "formato" in data.get("meta", {}):
+                del data["meta"]["formato"]
+            if "meta" in data:
+                documento = {"meta": data["meta"], **data}
+        try:
+            contenido = _serializar(documento, formato, self._cache_fragmentos(formato))
+            with self._bloqueo.exclusivo():
+                with metricas.medir("disco.escribir"):
+                    tmp_path.write_bytes(contenido)
+                    os.replace(tmp_path, self.file_path)
+            metricas.sumar(metricas.BYTES_ESCRITOS, len(contenido))
+        except Exception:
+            # El documento en memoria pudo quedar distinto al del disco
+            self.invalidate_cache()
+            raise
+        if self.cache:
+            self._cache_data = data
+            self._cache_firma = self._firma_archivo()
+
+    def _cache_fragmentos(self, formato: str) -> Optional[Dict[int, Tuple[Dict[str, Any], bytes]]]:
+        """Retornar la caché de fragmentos para escribir en `formato`, o None sin caché.
+
+        Los formatos comprimidos comparten los fragmentos del compacto.
+        """
+        if not self.cache:
+            return None
+        base = "pretty" if formato == "pretty" else "compact"
+        if base != self._formato_fragmentos:
+            self._fragmentos = {}
+            self._formato_fragmentos = base
+        return self._fragmentos
+
+    def formato_de_escritura(self, data: Dict[str, Any]) -> str:
+        """Formato con el que se guardará `data`.
+
+        El indicado al crear el storage; si no, el registrado en
+        ``meta.formato``, la compresión detectada al leer el archivo o
+        `FORMATO_POR_DEFECTO`.
+        """
+        meta = data.get("meta", {}) if isinstance(data, dict) else {}
+        return (
+            self.formato
+            or meta.get("formato")
+            or self._compresion_leida
+            or FORMATO_POR_DEFECTO
+        )
+
+    def _documento(self) -> Dict[str, Any]:
+        """Retornar el documento sobre el que operan las lecturas y escrituras.
+
+        Dentro de un lote es la copia de trabajo; fuera de él, `load_json()`.
+        """
+        if self._lote_data is not None:
+            return self._lote_data
+        return self.load_json()
+
+    def _persistir(self, data: Dict[str, Any], operacion: Dict[str, Any]) -> None:
+        """Persistir el documento tras aplicar una operación add/update/delete.
+
+        Dentro de un lote la operación solo se acumula hasta el cierre.
+        """
+        if self._lote_data is not None:
+            self._lote_ops.append(operacion)
+            return
+        self._confirmar_vigente(data, [operacion])
+
+    def _version_cargada(self, data: Dict[str, Any]) -> int:
+        """Retornar la versión del documento tal como se leyó."""
+        return data.get("meta", {}).get("version", 0)
+
+    def _version_en_disco(self) -> int:
+        """Retornar la versión del documento guardado, leyendo solo su 'meta'."""
+        try:
+            with _abrir_texto(self.file_path) as fh:
+                return _leer_meta(fh).get("version", 0)
+        except (ValueError, OSError, EOFError, zlib.error):
+            return 0
+
+    def _confirmar_vigente(self, data: Dict[str, Any], operaciones: List[Dict[str, Any]]) -> None:
+        """Confirmar las operaciones si nadie escribió desde que se leyó `data`.
+
+        Lanza ConflictoDeVersion (y descarta la caché, que ya incluye los
+        cambios rechazados) si la versión en disco cambió.
+        """
+        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._bloqueo.exclusivo():
+            if self._version_en_disco() != self._version_cargada(data):
+                self.invalidate_cache()
+                raise ConflictoDeVersion(
+                    f"'{self.file_path}' fue modificado por otro proceso; repetir la operación"
+                )
+            self._confirmar(data, operaciones)
+
+    def _confirmar(self, data: Dict[str, Any], operaciones: List[Dict[str, Any]]) -> None:
+        """Escribir en disco el resultado de las operaciones dadas.
+
+        JsonStorage reescribe el documento completo incrementando
+        ``meta.version``; otros backends pueden registrar solo las operaciones.
+        """
+        meta = data.setdefault("meta", {})
+        meta["version"] = meta.get("version", 0) + 1
+        self.save_json(data)
+
+    @contextmanager
+    def batch(self) -> Iterator["JsonStorage"]:
+        """Agrupar varias operaciones add/update/delete en una sola escritura.
+
+        Dentro del bloque las operaciones se aplican sobre una copia de trabajo
+        en memoria, visible para get_all/get_by_id. Al salir sin errores se
+        escribe una única vez; si se lanza una excepción los cambios se
+        descartan. Los lotes anidados se integran en el lote exterior.
+
+        Ejemplo::
+
+            with storage.batch():
+                for nombre, cargo in nuevos:
+                    agregar_empleado(nombre, cargo, storage)
+        """
+        if self._lote_data is not None:
+            yield self
+            return
+        self._lote_data = self.load_json()
+        self._lote_ops = []
+        try:
+            yield self
+        except BaseException:
+            modificado = bool(self._lote_ops)
+            self._lote_data = None
+            self._lote_ops = []
+            if modificado:
+                # La copia de trabajo pudo ser el documento en caché
+                self.invalidate_cache()
+            raise
+        data, operaciones = self._lote_data, self._lote_ops
+        self._lote_data = None
+        self._lote_ops = []
+        if operaciones:
+            self._confirmar_vigente(data, operaciones)
+
+    def _indice(self, empleados: List[Dict[str, Any]]) -> Dict[Any, int]:
+        """Retornar el índice id -> posición para la lista dada.
+
+        El índice se reconstruye solo cuando la lista cambia (por ejemplo tras
+        recargar el archivo); add, update y delete lo mantienen al día. Al
+        reconstruirse se descartan también los índices secundarios.
+        """
+        if self._indice_lista is not empleados:
+            self._reindexar_ids(empleados)
+            self._secundarios = {}
+        return self._indice_ids
+
+    def _reindexar_ids(self, empleados: List[Dict[str, Any]]) -> None:
+        """Reconstruir el índice id -> posición sobre la lista dada."""
+        indice: Dict[Any, int] = {}
+        for i, rec in enumerate(empleados):
+            indice.setdefault(rec.get("id"), i)
+        self._indice_ids = indice
+        self._indice_lista = empleados
 
+    def _secundario(self, nombre: str, empleados: List[Dict[str, Any]], fabrica: Any) -> Any:
+        """Retornar el índice secundario `nombre`, construyéndolo con `fabrica(empleados)`.
+
+        Los índices secundarios exponen agregar_empleado/quitar_empleado y se
+        actualizan en cada add/update/delete.
+        """
+        self._indice(empleados)
+        if nombre not in self._secundarios:
+            self._secundarios[nombre] = fabrica(empleados)
+        return self._secundarios[nombre]
 
     def get_all(self) -> List[Dict[str, Any]]:
         """Retornar todos los empleados."""
-        data = self.load_json()
+        data = self._documento()
         return data.get("empleados", [])
 
+    def iter_empleados(self, tamano_bloque: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+        """Iterar los empleados uno a uno sin cargar el documento completo.
+
+        Si el documento ya está en memoria (caché vigente o lote abierto) se
+        recorre esa copia; en otro caso el archivo se parsea de forma
+        incremental en bloques de `tamano_bloque` caracteres y el resultado no
+        se guarda en la caché. Un archivo inexistente o inválido termina la
+        iteración, igual que `load_json` retorna una lista vacía.
+        """
+        if self._lote_data is not None or (
+            self.cache
+            and self._cache_data is not None
+            and self._firma_archivo() == self._cache_firma
+        ):
+            yield from self.get_all()
+            return
+        if not self.file_path.exists():
+            return
+        try:
+            # Las escrituras reemplazan el archivo: el descriptor abierto sigue
+            # apuntando a la versión leída aunque se suelte el bloqueo
+            with self._bloqueo.compartido():
+                fh = _abrir_texto(self.file_path)
+            with fh:
+                yield from _iterar_empleados(fh, tamano_bloque)
+        except (ValueError, OSError, EOFError, zlib.error):
+            return
+
+    def tabla_contratos(self) -> ContractTable:
+        """Cargar todos los contratos en una `ContractTable` columnar.
+
+        Recorre los empleados con `iter_empleados`, por lo que no necesita
+        mantener el documento completo en memoria.
+        """
+        return ContractTable.from_empleados(self.iter_empleados())
+
+    def get_by_id(self, record_id: Any) -> Optional[Dict[str, Any]]:
+        """Retornar el registro con el id dado, o None si no existe."""
+        empleados = self.get_all()
+        pos = self._indice(empleados).get(record_id)
+        if pos is None:
+            return None
+        return empleados[pos]
+
     def add(self, record: Dict[str, Any]) -> None:
         """Agregar un registro a la colección.
         
         Lanza ValueError si el registro ya existe (basado en el campo 'id').
+        Se guarda una copia: modificar después `record` no altera el documento.
         """
-        data = self.load_json()
+        data = self._documento()
         empleados = data.get("empleados", [])
+        indice = self._indice(empleados)
         record_id = record.get("id")
-        if record_id and any(r.get("id") == record_id for r in empleados):
+        if record_id and record_id in indice:
             raise ValueError(f"Registro con id '{record_id}' ya existe")
+        record = _copiar_registro(record)
         empleados.append(record)
+        indice.setdefault(record_id, len(empleados) - 1)
+        for secundario in self._secundarios.values():
+            secundario.agregar_empleado(record)
         data["empleados"] = empleados
-        self.save_json(data)
+        self._persistir(data, {"op": "add", "record": record})
 
     def update(self, record_id: int, updates: Dict[str, Any]) -> None:
         """Actualizar un registro por id.
@@ -84,26 +803,155 @@ class JsonStorage:
         if "id" in updates and updates["id"] != record_id:
             raise ValueError("No se puede cambiar el id del registro")
         
-        data = self.load_json()
+        data = self._documento()
         empleados = data.get("empleados", [])
-        for i, rec in enumerate(empleados):
-            if rec.get("id") == record_id:
-                empleados[i] = {**rec, **updates}
-                data["empleados"] = empleados
-                self.save_json(data)
-                return
-        
-        raise ValueError(f"Registro con id '{record_id}' no encontrado")
+        pos = self._indice(empleados).get(record_id)
+        if pos is None:
+            raise ValueError(f"Registro con id '{record_id}' no encontrado")
+        anterior = empleados[pos]
+        empleados[pos] = _copiar_registro({**anterior, **updates})
+        for secundario in self._secundarios.values():
+            secundario.quitar_empleado(anterior)
+            secundario.agregar_empleado(empleados[pos])
+        data["empleados"] = empleados
+        self._persistir(data, {"op": "update", "id": record_id, "updates": updates})
 
     def delete(self, record_id: int) -> None:
         """Eliminar un registro por id.
         
         Lanza ValueError si el registro no existe.
         """
-        data = self.load_json()
+        data = self._documento()
         empleados = data.get("empleados", [])
-        new_empleados = [r for r in empleados if r.get("id") != record_id]
-        if len(new_empleados) == len(empleados):
+        if record_id not in self._indice(empleados):
             raise ValueError(f"Registro con id '{record_id}' no encontrado")
-        data["empleados"] = new_empleados
-        self.save_json(data)
+        restantes = []
+        for rec in empleados:
+            if rec.get("id") == record_id:
+                for secundario in self._secundarios.values():
+                    secundario.quitar_empleado(rec)
+            else:
+                restantes.append(rec)
+        # Las posiciones cambian: se reindexan los ids conservando los secundarios
+        self._reindexar_ids(restantes)
+        data["empleados"] = restantes
+        self._persistir(data, {"op": "delete", "id": record_id})
+
+    def query(
+        self,
+        cargo: Optional[str] = None,
+        nombre_prefix: Optional[str] = None,
+        order_by: str = "id",
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Consultar empleados filtrando, ordenando y paginando.
+
+        Args:
+            cargo: Solo empleados con este cargo exacto
+            nombre_prefix: Solo empleados cuyo nombre empieza así (sin
+                           distinguir mayúsculas)
+            order_by: "id", "nombre" o "cargo"; con "-" delante, descendente
+            limit: Cantidad máxima de resultados (None para todos)
+            offset: Resultados a saltar antes del primero
+
+        Returns:
+            Lista de empleados de la página pedida
+
+        Los filtros usan un índice invertido por cargo y un índice ordenado de
+        nombres, mantenidos con cada add/update/delete. Lanza ValueError si
+        los parámetros son inválidos.
+        """
+        campo, descendente = _validar_consulta(order_by, limit, offset)
+        empleados = self.get_all()
+        indice = self._indice(empleados)
+        if nombre_prefix is not None:
+            ids = self._secundario("nombres", empleados, IndiceNombres).con_prefijo(nombre_prefix)
+            orden_indice = "nombre"
+        elif cargo is not None:
+            ids = self._secundario("cargos", empleados, IndiceCargos).ids(cargo)
+            orden_indice = "id"
+        else:
+            ids, orden_indice = None, None
+
+        fin = None if limit is None else offset + limit
+        if ids is not None and campo == orden_indice and not (cargo is not None and nombre_prefix is not None):
+            # Los ids del índice ya están en el orden pedido: basta con recortar la página
+            if descendente:
+                ids = ids[::-1]
+            return [empleados[indice[i]] for i in ids[offset:fin]]
+
+        if ids is None:
+            registros = list(empleados)
+        else:
+            registros = [empleados[indice[i]] for i in ids]
+            if cargo is not None and nombre_prefix is not None:
+                registros = [r for r in registros if r.get("cargo") == cargo]
+        if campo != orden_indice:
+            registros.sort(key=CLAVES_ORDEN[campo])
+        if descendente:
+            registros.reverse()
+        return registros[offset:fin]
+
+    def buscar_por_nombre(self, texto: str, limit: int = 10, umbral: float = UMBRAL_SIMILITUD) -> List[Dict[str, Any]]:
+        """Buscar empleados con nombre parecido a `texto`, tolerando errores de tipeo.
+
+        Usa un índice de trigramas mantenido con cada add/update/delete.
+        Retorna hasta `limit` dicts {"empleado", "similitud"} ordenados de
+        mayor a menor similitud (Jaccard de trigramas, entre `umbral` y 1).
+        """
+        empleados = self.get_all()
+        por_trigramas = self._secundario("trigramas", empleados, IndiceTrigramas)
+        indice = self._indice(empleados)
+        return [
+            {"empleado": empleados[indice[id_empleado]], "similitud": valor}
+            for valor, id_empleado in por_trigramas.buscar(texto, limit, umbral)
+        ]
+
+    def reservar_ids(self, secuencia: str, cantidad: int = 1) -> int:
+        """Reservar `cantidad` valores consecutivos de una secuencia y retornar el primero.
+
+        Las secuencias (`SECUENCIA_EMPLEADOS`, `SECUENCIA_CONTRATOS`) se
+        guardan en 'meta' y nunca retroceden, de modo que los ids de registros
+        eliminados no se reutilizan. Dentro de un lote la reserva se escribe
+        junto con el resto de las operaciones.
+
+        Lanza ValueError si la secuencia no existe o la cantidad no es positiva.
+        """
+        return self._reservar(secuencia, cantidad, lambda: _siguiente_libre(self.get_all(), secuencia))
+
+    def _reservar(self, secuencia: str, cantidad: int, calcular_inicial: Callable[[], int]) -> int:
+        """Reservar ids; `calcular_inicial` da el valor si la secuencia aún no está en 'meta'."""
+        _validar_reserva(secuencia, cantidad)
+        data = self._documento()
+        meta = data.setdefault("meta", {})
+        inicio = meta.get(secuencia)
+        if inicio is None:
+            inicio = calcular_inicial()
+        meta[secuencia] = inicio + cantidad
+        self._persistir(data, {"op": "reservar", "secuencia": secuencia, "siguiente": inicio + cantidad})
+        return inicio
+
+    def contratos_vencidos(self, limite: int) -> List[Dict[str, Any]]:
+        """Retornar los contratos con fecha de fin anterior al ordinal `limite`.
+
+        Cada contrato incluye id_empleado, nombre_empleado y cargo_empleado, en
+        orden de fecha de fin. Usa un índice ordenado de vencimientos que se
+        actualiza con cada add/update/delete.
+        """
+        empleados = self.get_all()
+        vencimientos = self._secundario("vencimientos", empleados, IndiceVencimientos)
+        indice = self._indice(empleados)
+        vencidos = []
+        for _, id_empleado, id_contrato in vencimientos.antes_de(limite):
+            empleado = empleados[indice[id_empleado]]
+            for contrato in empleado.get("contratos", []):
+                if contrato.get("id_contrato") == id_contrato:
+                    vencidos.append({
+                        **contrato,
+                        "id_empleado": empleado.get("id"),
+                        "nombre_empleado": empleado.get("nombre"),
+                        "cargo_empleado": empleado.get("cargo")
+                    })
+                    break
+        return vencidos
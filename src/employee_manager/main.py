@@ -1,81 +1,446 @@
-"""Interfaz principal en terminal usando click + rich."""
+"""Interfaz principal en terminal usando click + rich.
+
+El CLI se ejecuta muchas veces desde scripts, así que el arranque importa lo
+mínimo: rich, los backends y los gestores se importan dentro de cada comando,
+cuando se usan por primera vez.
+"""
 import click
+import sys
+import time
+from functools import partial
+from importlib import import_module
+from itertools import islice
 from pathlib import Path
-from rich.console import Console
-from rich.table import Table
-
-from .json_storage import JsonStorage
-from .gestor_empleados import (
-    agregar_empleado,
-    eliminar_empleado,
-    buscar_empleado,
-    listar_empleados,
-)
-from .gestor_contratos import (
-    asociar_contrato,
-    listar_contratos_vencidos,
-)
-
-console = Console()
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+from . import metricas
+
+if TYPE_CHECKING:
+    from rich.table import Table
+    from .json_storage import JsonStorage
+
+
+class _ConsolaPerezosa:
+    """Crea la `rich.console.Console` real la primera vez que se usa."""
+
+    def __init__(self, **opciones: Any):
+        self._opciones = opciones
+        self._consola = None
+
+    def __getattr__(self, nombre: str) -> Any:
+        if self._consola is None:
+            from rich.console import Console
+            self._consola = Console(**self._opciones)
+        return getattr(self._consola, nombre)
+
+
+console = _ConsolaPerezosa()
 
 DATA_DIR = Path("data")
 EMP_FILE = DATA_DIR / "empleados.json"
 
+# Módulo y clase de cada backend; se importan solo al crear el storage
+BACKENDS = {
+    "json": ("json_storage", "JsonStorage"),
+    "journal": ("journal_storage", "JournalStorage"),
+    "sqlite": ("sqlite_storage", "SqliteStorage"),
+    "sharded": ("sharded_storage", "ShardedStorage"),
+}
+
+# Formatos de archivo de `json_storage.FORMATOS`, repetidos para no importar el módulo al arrancar
+FORMATOS_ARCHIVO = ("pretty", "compact", "gzip", "zlib")
+
+# Nombre del archivo de datos de cada backend dentro del directorio de datos
+ARCHIVOS_BACKEND = {
+    "json": "empleados.json",
+    "journal": "empleados.json",
+    "sqlite": "empleados.db",
+    "sharded": "empleados.shards.json",
+}
+
+
+# Filas de cada tabla al listar empleados sin indicar --page-size
+FILAS_POR_TABLA = 500
+
+COLUMNAS_EMPLEADO = ("id", "nombre", "cargo", "contratos")
+
+FORMATOS_LISTADO = ("table", "jsonl", "csv", "tsv")
+
+
+def _crear_storage(file_path: Optional[str], backend: str = "json") -> "JsonStorage":
+    """Crear el storage del backend indicado sobre el archivo dado.
+
+    Sin archivo se usa el del backend dentro de `DATA_DIR` (ver `ARCHIVOS_BACKEND`).
+    """
+    modulo, clase = BACKENDS[backend]
+    if file_path is None:
+        file_path = str(DATA_DIR / ARCHIVOS_BACKEND[backend])
+    try:
+        return getattr(import_module(f".{modulo}", __package__), clase)(file_path)
+    except ValueError as exc:
+        raise click.ClickException(str(exc))
+
+
+def _print_table(table: "Table") -> None:
+    """Imprimir una tabla, midiendo el tiempo de renderizado si hay métricas activas."""
+    with metricas.medir("rich.imprimir"):
+        console.print(table)
+
+
+def _print_timings(inicio: float) -> None:
+    """Imprimir en stderr el resumen de las métricas registradas y desactivarlas.
+
+    Incluye como "cli.total" el tiempo completo del comando desde `inicio`.
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    metricas.registrar("cli.total", time.perf_counter() - inicio)
+    datos = metricas.resumen()
+    metricas.desactivar()
+    table = Table(title="Tiempos (ms)")
+    table.add_column("Operación", no_wrap=True)
+    for columna in ("Llamadas", "Total", "Media", "Máximo", "Histograma"):
+        table.add_column(columna)
+    for nombre, t in sorted(datos["tiempos"].items(), key=lambda item: -item[1]["total"]):
+        table.add_row(
+            nombre,
+            str(t["llamadas"]),
+            f"{t['total'] * 1000:.2f}",
+            f"{t['media'] * 1000:.3f}",
+            f"{t['maximo'] * 1000:.3f}",
+            " ".join(f"{intervalo}:{n}" for intervalo, n in t["histograma"].items())
+        )
+    salida = Console(stderr=True)
+    salida.print(table)
+    for contador, valor in sorted(datos["contadores"].items()):
+        salida.print(f"{contador}: {valor:,}")
+
 
 @click.group()
-def main():
+@click.option("--timings", is_flag=True, help="Al terminar, imprimir tiempos de storage, gestores y renderizado")
+@click.pass_context
+def main(ctx: click.Context, timings: bool):
     """Interfaz principal para el gestor de empleados y contratos."""
-    pass
+    if timings:
+        metricas.reiniciar()
+        metricas.activar()
+        ctx.call_on_close(partial(_print_timings, time.perf_counter()))
 
 
 @main.command(name="init-db")
 @click.option("--data-dir", "data_dir", default=str(DATA_DIR), help="Directorio donde crear JSON")
-def init_db(data_dir: str):
+@click.option("--shards", type=click.IntRange(min=1), default=1, help="Repartir los empleados en N archivos (backend sharded)")
+@click.option("--format", "formato", type=click.Choice(FORMATOS_ARCHIVO), default="pretty", help="Formato del archivo: JSON indentado, compacto o comprimido")
+def init_db(data_dir: str, shards: int, formato: str):
     """Crear archivo JSON vacío para empleados."""
     p = Path(data_dir)
     p.mkdir(parents=True, exist_ok=True)
-    (p / "empleados.json").write_text('{"empleados": []}', encoding="utf-8")
-    console.print(f":white_check_mark: Base inicializada en [bold]{p}[/bold]")
+    if shards > 1:
+        from .sharded_storage import inicializar_shards
+
+        manifiesto = p / ARCHIVOS_BACKEND["sharded"]
+        inicializar_shards(str(manifiesto), shards, formato)
+        # Fuera de DATA_DIR los comandos no encuentran el manifiesto sin --file
+        uso = "--backend sharded" if p == DATA_DIR else f"--backend sharded --file {manifiesto}"
+        console.print(f":white_check_mark: Base inicializada en [bold]{p}[/bold] con {shards} shards (usar {uso})")
+        return
+    if formato == "pretty":
+        # Caso más común: no hace falta importar json_storage para escribirlo
+        (p / "empleados.json").write_text('{"empleados": []}', encoding="utf-8")
+    else:
+        from .json_storage import inicializar_archivo
+
+        inicializar_archivo(str(p / "empleados.json"), formato)
+    # click.echo en lugar de rich: init-db no necesita cargar rich
+    click.echo(f"✅ Base inicializada en {click.style(str(p), bold=True)}")
+
 
+def _fila_empleado(emp: Dict) -> Tuple:
+    """Valores de las columnas `COLUMNAS_EMPLEADO` para un empleado."""
+    return (emp.get("id", ""), emp.get("nombre", ""), emp.get("cargo", ""), len(emp.get("contratos", [])))
+
+
+def _print_employees_table(
+    storage: "JsonStorage",
+    empleados: Optional[Iterable[Dict]] = None,
+    title: str = "Empleados",
+    filas_por_tabla: int = FILAS_POR_TABLA
+) -> None:
+    """Imprimir tablas de empleados (todos los del storage si no se indican).
+
+    Los empleados se consumen de a `filas_por_tabla` y cada tabla se imprime
+    apenas se completa: la primera fila aparece sin recorrer todo el storage
+    y la memoria usada no depende de la cantidad de empleados.
+    """
+    from rich.table import Table
+
+    if empleados is None:
+        empleados = storage.iter_empleados()
+    empleados = iter(empleados)
+    primera = True
+    while True:
+        bloque = list(islice(empleados, filas_por_tabla))
+        if not bloque and not primera:
+            return
+        table = Table(title=title if primera else None)
+        for columna in ("ID", "Nombre", "Cargo", "Contratos"):
+            table.add_column(columna)
+        for emp in bloque:
+            table.add_row(*(str(valor) for valor in _fila_empleado(emp)))
+        _print_table(table)
+        if len(bloque) < filas_por_tabla:
+            return
+        primera = False
+
+
+def _write_employees(empleados: Iterable[Dict], formato: str) -> None:
+    """Escribir empleados en stdout como JSONL, CSV o TSV a medida que se leen.
+
+    JSONL incluye el registro completo (con sus contratos); CSV y TSV las
+    columnas de la tabla, con cabecera.
+    """
+    import csv
+    import json
+
+    salida = sys.stdout
+    if formato == "jsonl":
+        for emp in empleados:
+            salida.write(json.dumps(emp, ensure_ascii=False) + "\n")
+        return
+    escritor = csv.writer(salida, delimiter="," if formato == "csv" else "\t", lineterminator="\n")
+    escritor.writerow(COLUMNAS_EMPLEADO)
+    for emp in empleados:
+        escritor.writerow(_fila_empleado(emp))
 
-def _print_employees_table(storage: JsonStorage) -> None:
-    """Imprimir tabla de empleados."""
-    empleados = listar_empleados(storage)
-    table = Table(title="Empleados")
+
+def _print_expired_table(contratos_vencidos: list) -> None:
+    """Imprimir tabla de contratos vencidos."""
+    if not contratos_vencidos:
+        console.print(":white_check_mark: No hay contratos vencidos")
+        return
+    from rich.table import Table
+
+    console.print(f"\n[bold]Contratos vencidos:[/bold] {len(contratos_vencidos)}")
+    table = Table()
+    table.add_column("ID Contrato")
+    table.add_column("ID Empleado")
+    table.add_column("Nombre Empleado")
+    table.add_column("Cargo")
+    table.add_column("Fecha Inicio")
+    table.add_column("Fecha Fin")
+    table.add_column("Salario")
+    for c in contratos_vencidos:
+        table.add_row(
+            str(c.get("id_contrato", "")),
+            str(c.get("id_empleado", "")),
+            c.get("nombre_empleado", ""),
+            c.get("cargo_empleado", ""),
+            c.get("fecha_inicio", ""),
+            c.get("fecha_fin", ""),
+            str(c.get("salario", ""))
+        )
+    _print_table(table)
+
+
+@main.command(name="list-employees")
+@click.option("--file", "file_path", default=None, help="Archivo de datos (por defecto el del backend en data/)")
+@click.option("--backend", type=click.Choice(sorted(BACKENDS)), default="json", help="Backend de almacenamiento")
+@click.option("--cargo", default=None, help="Solo empleados con este cargo")
+@click.option("--name", "nombre_prefix", default=None, help="Solo empleados cuyo nombre empieza así")
+@click.option("--sort", "order_by", type=click.Choice(["id", "nombre", "cargo", "-id", "-nombre", "-cargo"]), default="id", help="Orden (con '-' descendente)")
+@click.option("--page", "pagina", type=click.IntRange(min=1), default=None, help="Mostrar solo esta página")
+@click.option("--page-size", "tamano_pagina", type=click.IntRange(min=1), default=None, help=f"Empleados por página/tabla (por defecto {FILAS_POR_TABLA})")
+@click.option("--format", "formato", type=click.Choice(FORMATOS_LISTADO), default="table", help="Formato de salida")
+def cli_list_employees(
+    file_path: Optional[str],
+    backend: str,
+    cargo: str,
+    nombre_prefix: str,
+    order_by: str,
+    pagina: Optional[int],
+    tamano_pagina: Optional[int],
+    formato: str
+):
+    """Listar empleados, opcionalmente filtrados, ordenados y paginados.
+
+    Sin --page se listan todos, escribiendo cada fila (o cada tabla de
+    --page-size filas) a medida que se lee del storage.
+    """
+    from .gestor_empleados import consultar_empleados, iterar_empleados
+
+    storage = _crear_storage(file_path, backend)
+    tamano = tamano_pagina or FILAS_POR_TABLA
+    title = "Empleados"
+    if pagina is not None:
+        empleados = consultar_empleados(storage, cargo, nombre_prefix, order_by, pagina, tamano)
+        title = f"Empleados (página {pagina})"
+    elif cargo is None and nombre_prefix is None and order_by == "id":
+        empleados = iterar_empleados(storage)
+    else:
+        empleados = consultar_empleados(storage, cargo, nombre_prefix, order_by)
+
+    if formato == "table":
+        _print_employees_table(storage, empleados, title, tamano)
+    else:
+        _write_employees(empleados, formato)
+
+
+def _print_search_results(resultados: list) -> None:
+    """Imprimir los resultados de una búsqueda por nombre."""
+    if not resultados:
+        console.print(":x: No se encontraron empleados con un nombre parecido")
+        return
+    from rich.table import Table
+
+    table = Table(title="Resultados de la búsqueda")
     table.add_column("ID")
     table.add_column("Nombre")
     table.add_column("Cargo")
-    table.add_column("Contratos")
-    for emp in empleados:
-        num_contratos = len(emp.get("contratos", []))
+    table.add_column("Similitud")
+    for r in resultados:
+        emp = r["empleado"]
         table.add_row(
             str(emp.get("id", "")),
             emp.get("nombre", ""),
             emp.get("cargo", ""),
-            str(num_contratos)
+            f"{r['similitud']:.0%}"
         )
-    console.print(table)
+    _print_table(table)
 
 
-@main.command(name="list-employees")
-@click.option("--file", "file_path", default=str(EMP_FILE), help="Archivo JSON de empleados")
-def cli_list_employees(file_path: str):
-    """Listar todos los empleados."""
-    storage = JsonStorage(file_path)
-    _print_employees_table(storage)
+@main.command(name="search")
+@click.argument("texto")
+@click.option("--file", "file_path", default=None, help="Archivo de datos (por defecto el del backend en data/)")
+@click.option("--backend", type=click.Choice(sorted(BACKENDS)), default="json", help="Backend de almacenamiento")
+@click.option("--limit", type=click.IntRange(min=1), default=10, help="Cantidad máxima de resultados")
+def cli_search(texto: str, file_path: Optional[str], backend: str, limit: int):
+    """Buscar empleados por nombre (tolera errores de tipeo)."""
+    from .gestor_empleados import buscar_por_nombre
+
+    storage = _crear_storage(file_path, backend)
+    _print_search_results(buscar_por_nombre(texto, storage, limit))
+
+
+@main.command(name="import")
+@click.option("--employees", "empleados_path", type=click.Path(exists=True, dir_okay=False), help="CSV/JSONL de empleados (nombre, cargo)")
+@click.option("--contracts", "contratos_path", type=click.Path(exists=True, dir_okay=False), help="CSV/JSONL de contratos (id_empleado, fecha_inicio, fecha_fin, salario)")
+@click.option("--file", "file_path", default=None, help="Archivo de datos (por defecto el del backend en data/)")
+@click.option("--backend", type=click.Choice(sorted(BACKENDS)), default="json", help="Backend de almacenamiento")
+@click.option("--chunk-size", "tamano_lote", type=click.IntRange(min=1), default=1000, help="Filas escritas por lote")
+@click.option("--errors", "errores_path", default="import_errores.csv", help="Archivo CSV con los errores por fila")
+def cli_import(empleados_path: str, contratos_path: str, file_path: Optional[str], backend: str, tamano_lote: int, errores_path: str):
+    """Importar empleados y contratos de forma masiva."""
+    if not empleados_path and not contratos_path:
+        raise click.UsageError("Indica --employees y/o --contracts")
+    from .importador import escribir_errores, importar_contratos, importar_empleados
+
+    storage = _crear_storage(file_path, backend)
+    resultados = []
+    # Primero los empleados, para que los contratos puedan referenciarlos
+    if empleados_path:
+        resultados.append(importar_empleados(empleados_path, storage, tamano_lote))
+    if contratos_path:
+        resultados.append(importar_contratos(contratos_path, storage, tamano_lote))
+
+    errores = []
+    for r in resultados:
+        filas_seg = r["filas"] / r["segundos"] if r["segundos"] > 0 else float(r["filas"])
+        console.print(
+            f":white_check_mark: {r['archivo']}: {r['importadas']}/{r['filas']} filas importadas "
+            f"({filas_seg:,.0f} filas/s)"
+        )
+        errores.extend(r["errores"])
+    if errores:
+        escribir_errores(errores_path, errores)
+        console.print(f":warning: {len(errores)} filas con errores; detalle en [bold]{errores_path}[/bold]")
+
+
+@main.command(name="expired-contracts")
+@click.option("--file", "file_path", default=None, help="Archivo de datos (por defecto el del backend en data/)")
+@click.option("--backend", type=click.Choice(sorted(BACKENDS)), default="json", help="Backend de almacenamiento")
+@click.option("--date", "fecha_referencia", default=None, help="Fecha de referencia YYYY-MM-DD (por defecto hoy)")
+@click.option("--workers", type=click.IntRange(min=1), default=1, help="Procesos para filtrar en paralelo, uno por shard (solo --backend sharded; los demás usan su índice)")
+def cli_expired_contracts(file_path: Optional[str], backend: str, fecha_referencia: str, workers: int):
+    """Listar los contratos vencidos."""
+    from .gestor_contratos import listar_contratos_vencidos
+
+    storage = _crear_storage(file_path, backend)
+    _print_expired_table(listar_contratos_vencidos(storage, fecha_referencia, workers=workers))
+
+
+@main.command(name="payroll-report")
+@click.option("--file", "file_path", default=None, help="Archivo de datos (por defecto el del backend en data/)")
+@click.option("--backend", type=click.Choice(sorted(BACKENDS)), default="json", help="Backend de almacenamiento")
+@click.option("--bins", type=click.IntRange(min=1), default=10, help="Intervalos del histograma de salarios")
+@click.option("--cargo", default=None, help="Limitar el histograma a un cargo")
+def cli_payroll_report(file_path: Optional[str], backend: str, bins: int, cargo: str):
+    """Resumen de salarios por cargo e histograma de salarios."""
+    from rich.table import Table
+    from .reportes import _columnas_nomina, histograma_salarios, resumen_salarios_por_cargo
+
+    storage = _crear_storage(file_path, backend)
+    try:
+        # Ambos reportes usan las mismas columnas: el storage se recorre una sola vez
+        columnas = _columnas_nomina(storage)
+        resumen = resumen_salarios_por_cargo(storage, columnas)
+        histograma = histograma_salarios(storage, bins=bins, cargo=cargo, columnas=columnas)
+    except RuntimeError as exc:
+        raise click.ClickException(str(exc))
+
+    table = Table(title="Salarios por cargo")
+    table.add_column("Cargo")
+    table.add_column("Contratos", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("Promedio", justify="right")
+    table.add_column("Mediana", justify="right")
+    for fila in resumen:
+        table.add_row(
+            fila["cargo"],
+            str(fila["contratos"]),
+            f"{fila['total']:,.2f}",
+            f"{fila['promedio']:,.2f}" if fila["promedio"] is not None else "-",
+            f"{fila['mediana']:,.2f}" if fila["mediana"] is not None else "-"
+        )
+    _print_table(table)
+
+    table = Table(title=f"Distribución de salarios{f' ({cargo})' if cargo else ''}")
+    table.add_column("Desde", justify="right")
+    table.add_column("Hasta", justify="right")
+    table.add_column("Contratos", justify="right")
+    bordes = histograma["bordes"]
+    for i, conteo in enumerate(histograma["conteos"]):
+        table.add_row(f"{bordes[i]:,.2f}", f"{bordes[i + 1]:,.2f}", str(conteo))
+    _print_table(table)
+
+
+@main.command(name="migrate-sqlite")
+@click.option("--file", "file_path", default=str(EMP_FILE), help="Archivo JSON de empleados a migrar")
+@click.option("--db", "db_path", default=str(DATA_DIR / "empleados.db"), help="Base SQLite de destino")
+def cli_migrate_sqlite(file_path: str, db_path: str):
+    """Migrar un archivo JSON de empleados a una base SQLite."""
+    from .sqlite_storage import migrar_json_a_sqlite
+
+    total = migrar_json_a_sqlite(file_path, db_path)
+    console.print(f":white_check_mark: {total} empleados migrados a [bold]{db_path}[/bold]")
 
 
 @main.command(name="menu")
 @click.option("--data-dir", "data_dir", default=str(DATA_DIR), help="Directorio de datos a usar")
-def menu(data_dir: str):
+@click.option("--backend", type=click.Choice(sorted(BACKENDS)), default="json", help="Backend de almacenamiento")
+def menu(data_dir: str, backend: str):
     """Menú interactivo con opciones numeradas para interactuar con el sistema."""
+    from rich.table import Table
+    from .gestor_contratos import asociar_contrato, listar_contratos_vencidos
+    from .gestor_empleados import agregar_empleado, buscar_empleado, buscar_por_nombre, eliminar_empleado
+
     p = Path(data_dir)
     p.mkdir(parents=True, exist_ok=True)
-    emp_file = p / "empleados.json"
-    if not emp_file.exists():
+    emp_file = p / ARCHIVOS_BACKEND[backend]
+    if backend in ("json", "journal") and not emp_file.exists():
         emp_file.write_text('{"empleados": []}', encoding="utf-8")
 
-    storage = JsonStorage(str(emp_file))
+    storage = _crear_storage(str(emp_file), backend)
 
     while True:
         menu_text = (
@@ -87,6 +452,7 @@ def menu(data_dir: str):
             "[bold]5[/bold]) Asociar contrato a empleado\n"
             "[bold]6[/bold]) Listar contratos vencidos\n"
             "[bold]7[/bold]) Inicializar base (reset)\n"
+            "[bold]8[/bold]) Buscar empleado por nombre\n"
             "[bold]0[/bold]) Salir\n"
         )
         console.print(menu_text)
@@ -135,7 +501,7 @@ def menu(data_dir: str):
                                 c.get("fecha_fin", ""),
                                 str(c.get("salario", ""))
                             )
-                        console.print(table)
+                        _print_table(table)
                 else:
                     console.print(f":x: Empleado con id '{emp_id}' no encontrado")
 
@@ -157,30 +523,11 @@ def menu(data_dir: str):
                 console.print(f":white_check_mark: Contrato '{contrato['id_contrato']}' asociado al empleado '{emp_id}'")
 
             elif choice == 6:
-                contratos_vencidos = listar_contratos_vencidos(storage)
-                if contratos_vencidos:
-                    console.print(f"\n[bold]Contratos vencidos:[/bold] {len(contratos_vencidos)}")
-                    table = Table()
-                    table.add_column("ID Contrato")
-                    table.add_column("ID Empleado")
-                    table.add_column("Nombre Empleado")
-                    table.add_column("Cargo")
-                    table.add_column("Fecha Inicio")
-                    table.add_column("Fecha Fin")
-                    table.add_column("Salario")
-                    for c in contratos_vencidos:
-                        table.add_row(
-                            str(c.get("id_contrato", "")),
-                            str(c.get("id_empleado", "")),
-                            c.get("nombre_empleado", ""),
-                            c.get("cargo_empleado", ""),
-                            c.get("fecha_inicio", ""),
-                            c.get("fecha_fin", ""),
-                            str(c.get("salario", ""))
-                        )
-                    console.print(table)
-                else:
-                    console.print(":white_check_mark: No hay contratos vencidos")
+                _print_expired_table(listar_contratos_vencidos(storage))
+
+            elif choice == 8:
+                texto = click.prompt("Nombre a buscar", type=str)
+                _print_search_results(buscar_por_nombre(texto, storage))
 
             else:
                 console.print(":warning: Opción no válida")
@@ -0,0 +1,152 @@
+"""Instrumentación opcional de las operaciones del storage y los gestores.
+
+Desactivada por defecto: mientras no se llame a `activar()` las funciones
+instrumentadas solo pagan una comprobación de un booleano. Una vez activada
+registra, por nombre de operación:
+
+- cantidad de llamadas, tiempo total, mínimo y máximo, y un histograma de
+  latencias (`LIMITES_HISTOGRAMA`);
+- contadores acumulados (`BYTES_LEIDOS`, `BYTES_ESCRITOS`).
+
+`JsonStorage` separa la lectura/escritura en disco (`disco.leer`,
+`disco.escribir`) del parseo y la serialización (`json.parsear`,
+`json.serializar`). Las mediciones hechas en otros procesos (por ejemplo con
+``workers > 1``) no se suman a las de este proceso.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+import threading
+import time
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Límites superiores (en segundos) de los intervalos del histograma de latencias
+LIMITES_HISTOGRAMA = (0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+
+BYTES_LEIDOS = "bytes_leidos"
+BYTES_ESCRITOS = "bytes_escritos"
+
+_activo = False
+_lock = threading.Lock()
+_tiempos: Dict[str, Dict[str, Any]] = {}
+_contadores: Dict[str, int] = {}
+
+
+def activar() -> None:
+    """Empezar a registrar métricas."""
+    global _activo
+    _activo = True
+
+
+def desactivar() -> None:
+    """Dejar de registrar métricas (las ya registradas se conservan)."""
+    global _activo
+    _activo = False
+
+
+def activo() -> bool:
+    """Indicar si se están registrando métricas."""
+    return _activo
+
+
+def reiniciar() -> None:
+    """Descartar todas las métricas registradas."""
+    with _lock:
+        _tiempos.clear()
+        _contadores.clear()
+
+
+def registrar(nombre: str, segundos: float) -> None:
+    """Registrar una ejecución de `nombre` que tardó `segundos`."""
+    if not _activo:
+        return
+    with _lock:
+        estadistica = _tiempos.get(nombre)
+        if estadistica is None:
+            estadistica = _tiempos[nombre] = {
+                "llamadas": 0,
+                "total": 0.0,
+                "minimo": segundos,
+                "maximo": segundos,
+                "histograma": [0] * (len(LIMITES_HISTOGRAMA) + 1),
+            }
+        estadistica["llamadas"] += 1
+        estadistica["total"] += segundos
+        estadistica["minimo"] = min(estadistica["minimo"], segundos)
+        estadistica["maximo"] = max(estadistica["maximo"], segundos)
+        estadistica["histograma"][bisect_left(LIMITES_HISTOGRAMA, segundos)] += 1
+
+
+def sumar(contador: str, cantidad: int) -> None:
+    """Sumar `cantidad` a un contador (por ejemplo `BYTES_LEIDOS`)."""
+    if not _activo:
+        return
+    with _lock:
+        _contadores[contador] = _contadores.get(contador, 0) + cantidad
+
+
+@contextmanager
+def medir(nombre: str) -> Iterator[None]:
+    """Registrar la duración del bloque bajo `nombre`."""
+    if not _activo:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registrar(nombre, time.perf_counter() - inicio)
+
+
+def instrumentar(nombre: Optional[str] = None) -> Callable[[F], F]:
+    """Decorador que registra la duración de cada llamada a la función.
+
+    Args:
+        nombre: Nombre de la operación; por defecto ``modulo.funcion`` sin el
+                prefijo del paquete.
+    """
+    def decorador(funcion: F) -> F:
+        etiqueta = nombre or f"{funcion.__module__.rsplit('.', 1)[-1]}.{funcion.__name__}"
+
+        @wraps(funcion)
+        def envoltura(*args: Any, **kwargs: Any) -> Any:
+            if not _activo:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                registrar(etiqueta, time.perf_counter() - inicio)
+        return envoltura  # type: ignore[return-value]
+    return decorador
+
+
+def _etiquetas_histograma() -> List[str]:
+    etiquetas = [f"<={limite * 1000:g}ms" for limite in LIMITES_HISTOGRAMA]
+    return etiquetas + [f">{LIMITES_HISTOGRAMA[-1] * 1000:g}ms"]
+
+
+def resumen() -> Dict[str, Any]:
+    """Retornar una copia de las métricas registradas.
+
+    Returns:
+        {"tiempos": {nombre: {"llamadas", "total", "media", "minimo",
+        "maximo", "histograma"}}, "contadores": {nombre: valor}}; los tiempos
+        en segundos y el histograma como {intervalo: cantidad}.
+    """
+    etiquetas = _etiquetas_histograma()
+    with _lock:
+        tiempos = {
+            nombre: {
+                "llamadas": e["llamadas"],
+                "total": e["total"],
+                "media": e["total"] / e["llamadas"],
+                "minimo": e["minimo"],
+                "maximo": e["maximo"],
+                "histograma": {etiqueta: n for etiqueta, n in zip(etiquetas, e["histograma"]) if n},
+            }
+            for nombre, e in _tiempos.items()
+        }
+        return {"tiempos": tiempos, "contadores": dict(_contadores)}
@@ -1,12 +1,57 @@
 """Modelos de datos para empleados y contratos.
 
 Mantener nombres en snake_case para atributos y métodos.
+
+`Employee` y `Contract` usan ``__slots__`` para no reservar un diccionario por
+instancia y se convierten desde/hacia los diccionarios que guarda el storage
+con `from_dict`/`to_dict`. `ContractTable` guarda muchos contratos en columnas
+`array`, con las fechas como ordinales.
 """
-from dataclasses import dataclass, field
-from typing import Optional, List
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .fechas import a_ordinal_o_none, desde_ordinal
+
+
+class Contract:
+    """Representa un contrato laboral asociado a un empleado."""
+
+    __slots__ = ("id_contrato", "fecha_inicio", "fecha_fin", "salario")
+
+    def __init__(self, id_contrato: int, fecha_inicio: str, fecha_fin: str, salario: float):
+        self.id_contrato = id_contrato
+        self.fecha_inicio = fecha_inicio  # fecha ISO YYYY-MM-DD
+        self.fecha_fin = fecha_fin  # fecha ISO YYYY-MM-DD
+        self.salario = salario
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Contract":
+        """Crear un contrato a partir del diccionario guardado en el storage."""
+        return cls(data.get("id_contrato"), data.get("fecha_inicio"), data.get("fecha_fin"), data.get("salario"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retornar el diccionario con el formato del storage."""
+        return {
+            "id_contrato": self.id_contrato,
+            "fecha_inicio": self.fecha_inicio,
+            "fecha_fin": self.fecha_fin,
+            "salario": self.salario
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Contract):
+            return NotImplemented
+        return (self.id_contrato, self.fecha_inicio, self.fecha_fin, self.salario) == (
+            other.id_contrato, other.fecha_inicio, other.fecha_fin, other.salario
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"Contract(id_contrato={self.id_contrato!r}, fecha_inicio={self.fecha_inicio!r}, "
+            f"fecha_fin={self.fecha_fin!r}, salario={self.salario!r})"
+        )
 
 
-@dataclass
 class Employee:
     """Representa a un empleado.
 
@@ -14,17 +59,107 @@ class Employee:
     Los contratos se almacenan dentro del empleado.
     """
 
-    id: int
-    nombre: str
-    cargo: str
-    contratos: List['Contract'] = field(default_factory=list)
+    __slots__ = ("id", "nombre", "cargo", "contratos")
 
+    def __init__(self, id: int, nombre: str, cargo: str, contratos: Optional[List[Contract]] = None):
+        self.id = id
+        self.nombre = nombre
+        self.cargo = cargo
+        self.contratos = contratos if contratos is not None else []
 
-@dataclass
-class Contract:
-    """Representa un contrato laboral asociado a un empleado."""
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Employee":
+        """Crear un empleado (con sus contratos) a partir del diccionario del storage."""
+        return cls(
+            data.get("id"),
+            data.get("nombre"),
+            data.get("cargo"),
+            [Contract.from_dict(c) for c in data.get("contratos", [])]
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retornar el diccionario con el formato del storage."""
+        return {
+            "id": self.id,
+            "nombre": self.nombre,
+            "cargo": self.cargo,
+            "contratos": [c.to_dict() for c in self.contratos]
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Employee):
+            return NotImplemented
+        return (self.id, self.nombre, self.cargo, self.contratos) == (
+            other.id, other.nombre, other.cargo, other.contratos
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"Employee(id={self.id!r}, nombre={self.nombre!r}, cargo={self.cargo!r}, "
+            f"contratos={self.contratos!r})"
+        )
+
+
+class ContractTable:
+    """Tabla columnar de contratos respaldada por `array`.
+
+    Cada contrato ocupa una posición en las columnas id_contrato, id_empleado,
+    inicio, fin y salario (unos 32 bytes por contrato). Las fechas se guardan
+    como ordinales; 0 indica una fecha ausente o inválida. Los ids deben ser
+    enteros y un salario ausente se guarda como NaN.
+    """
+
+    __slots__ = ("id_contrato", "id_empleado", "inicio", "fin", "salario")
+
+    def __init__(self):
+        self.id_contrato = array("q")
+        self.id_empleado = array("q")
+        self.inicio = array("i")
+        self.fin = array("i")
+        self.salario = array("d")
+
+    @classmethod
+    def from_empleados(cls, empleados: Iterable[Dict[str, Any]]) -> "ContractTable":
+        """Construir la tabla recorriendo diccionarios de empleados (p. ej. `iter_empleados`)."""
+        tabla = cls()
+        for empleado in empleados:
+            id_empleado = empleado.get("id")
+            for contrato in empleado.get("contratos", []):
+                tabla.append(
+                    id_empleado,
+                    contrato.get("id_contrato"),
+                    a_ordinal_o_none(contrato.get("fecha_inicio")) or 0,
+                    a_ordinal_o_none(contrato.get("fecha_fin")) or 0,
+                    contrato.get("salario")
+                )
+        return tabla
+
+    def append(self, id_empleado: int, id_contrato: int, inicio: int, fin: int, salario: Optional[float]) -> None:
+        """Agregar un contrato con sus fechas ya convertidas a ordinales."""
+        self.id_empleado.append(id_empleado)
+        self.id_contrato.append(id_contrato)
+        self.inicio.append(inicio)
+        self.fin.append(fin)
+        self.salario.append(float("nan") if salario is None else salario)
+
+    def extend(self, otra: "ContractTable") -> None:
+        """Agregar al final todos los contratos de otra tabla."""
+        for columna in self.__slots__:
+            getattr(self, columna).extend(getattr(otra, columna))
+
+    def __len__(self) -> int:
+        return len(self.id_contrato)
+
+    def contrato(self, i: int) -> Contract:
+        """Retornar el contrato de la posición `i` con sus fechas en texto ISO."""
+        return Contract(
+            self.id_contrato[i],
+            desde_ordinal(self.inicio[i]) if self.inicio[i] else None,
+            desde_ordinal(self.fin[i]) if self.fin[i] else None,
+            self.salario[i]
+        )
 
-    id_contrato: int
-    fecha_inicio: str  # fecha ISO YYYY-MM-DD
-    fecha_fin: str  # fecha ISO YYYY-MM-DD
-    salario: float
+    def __iter__(self) -> Iterator[Contract]:
+        """Iterar los contratos de la tabla como objetos `Contract`."""
+        for i in range(len(self)):
+            yield self.contrato(i)
@@ -2,15 +2,23 @@
 
 Funciones para consultar información combinada de empleados y contratos,
 y generar reportes como contratos vencidos.
+
+Los reportes de nómina (`resumen_salarios_por_cargo`, `histograma_salarios`)
+se calculan con NumPy sobre columnas construidas en una sola pasada por el
+storage.
 """
+from array import array
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import Any, Iterable, List, Optional, Dict, Tuple
 
 from .json_storage import JsonStorage
+from .fechas import a_ordinal, a_ordinal_o_none
+from .metricas import instrumentar
 from .gestor_empleados import buscar_empleado, listar_empleados
-from .gestor_contratos import listar_contratos_vencidos
+from .gestor_contratos import _filtrar_vencidos, _limite_vencimiento, _recorrer_en_paralelo
 
 
+@instrumentar()
 def obtener_empleado_con_contratos(
     storage: JsonStorage,
     id_empleado: int
@@ -28,34 +36,177 @@ def obtener_empleado_con_contratos(
     return empleado
 
 
+def _agrupar_vencidos(
+    empleados: Iterable[Dict],
+    limite: int,
+    desde: Optional[int] = None,
+    cargo: Optional[str] = None
+) -> List[Dict]:
+    """Agrupar por empleado los contratos vencidos en un solo recorrido.
+
+    Retorna un dict {"empleado", "contratos_vencidos"} por cada empleado con
+    al menos un contrato vencido, con sus contratos ordenados por fecha de fin.
+    """
+    grupos = []
+    for empleado in empleados:
+        if cargo is not None and empleado.get("cargo") != cargo:
+            continue
+        vencidos = _filtrar_vencidos((empleado,), limite, desde)
+        if vencidos:
+            vencidos.sort(key=lambda c: a_ordinal(c["fecha_fin"]))
+            grupos.append({"empleado": empleado, "contratos_vencidos": vencidos})
+    return grupos
+
+
+@instrumentar()
 def obtener_empleados_con_contratos_vencidos(
     storage: JsonStorage,
-    fecha_referencia: Optional[str] = None
+    fecha_referencia: Optional[str] = None,
+    workers: int = 1,
+    desde: Optional[str] = None,
+    cargo: Optional[str] = None
 ) -> List[Dict]:
     """Obtener empleados que tienen contratos vencidos.
     
+    Recorre una sola vez los empleados del storage (`iter_empleados`) y
+    agrupa sus contratos vencidos sin volver a buscar cada empleado.
+    
     Args:
         storage: Storage de empleados
         fecha_referencia: Fecha de referencia en formato YYYY-MM-DD.
                         Si es None, usa la fecha actual.
+        workers: Procesos entre los que se reparte el recorrido, uno por
+                 shard (otros storages se recorren en este proceso)
+        desde: Si se indica (YYYY-MM-DD), solo contratos cuya fecha de fin
+               es igual o posterior a esta fecha
+        cargo: Si se indica, solo empleados con ese cargo
         
     Returns:
-        Lista de diccionarios con empleados que tienen contratos vencidos
+        Lista de diccionarios con empleados que tienen contratos vencidos,
+        ordenada por la fecha de fin de su primer contrato vencido.
+        Lista vacía si alguna de las fechas es inválida.
     """
-    contratos_vencidos = listar_contratos_vencidos(storage, fecha_referencia)
+    limite = _limite_vencimiento(fecha_referencia)
+    inicio = a_ordinal_o_none(desde) if desde is not None else None
+    if limite is None or (desde is not None and inicio is None):
+        return []
     
-    # Agrupar por empleado
-    empleados_dict = {}
-    for contrato in contratos_vencidos:
-        id_emp = contrato.get("id_empleado")
-        if id_emp not in empleados_dict:
-            empleado = buscar_empleado(id_emp, storage)
-            if empleado:
-                empleados_dict[id_emp] = {
-                    "empleado": empleado,
-                    "contratos_vencidos": []
-                }
-        if id_emp in empleados_dict:
-            empleados_dict[id_emp]["contratos_vencidos"].append(contrato)
+    if workers > 1:
+        grupos = _recorrer_en_paralelo(storage, workers, _agrupar_vencidos, limite, inicio, cargo)
+    else:
+        grupos = _agrupar_vencidos(storage.iter_empleados(), limite, inicio, cargo)
+    grupos.sort(key=lambda g: a_ordinal(g["contratos_vencidos"][0]["fecha_fin"]))
+    return grupos
+
+
+def _numpy() -> Any:
+    """Importar numpy, que solo requieren los reportes de nómina.
+
+    Se importa al usarlo y no al cargar el módulo porque su importación es
+    más lenta que la de todo el paquete.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("Los reportes de nómina requieren numpy (pip install numpy)")
+    return numpy
+
+
+def _columnas_nomina(storage: JsonStorage) -> Tuple[Any, Any, List[str]]:
+    """Construir las columnas de salario y cargo de todos los contratos.
+
+    Recorre los empleados una sola vez con `iter_empleados`. Retorna
+    (salarios, códigos de cargo, cargos), donde el código de cargo de cada
+    contrato es la posición de su cargo en la lista `cargos`. Los contratos sin
+    salario numérico se omiten.
+    """
+    np = _numpy()
+    salarios = array("d")
+    codigos = array("i")
+    codigo_de: Dict[str, int] = {}
+    for empleado in storage.iter_empleados():
+        codigo = codigo_de.setdefault(empleado.get("cargo") or "", len(codigo_de))
+        for contrato in empleado.get("contratos", []):
+            salario = contrato.get("salario")
+            if isinstance(salario, (int, float)):
+                salarios.append(salario)
+                codigos.append(codigo)
+    return (
+        np.frombuffer(salarios, dtype=np.float64),
+        np.frombuffer(codigos, dtype=np.intc),
+        list(codigo_de),
+    )
+
+
+@instrumentar()
+def resumen_salarios_por_cargo(
+    storage: JsonStorage,
+    columnas: Optional[Tuple[Any, Any, List[str]]] = None
+) -> List[Dict]:
+    """Resumir los salarios de los contratos agrupados por cargo del empleado.
     
-    return list(empleados_dict.values())
+    Args:
+        storage: Storage de empleados
+        columnas: Columnas ya construidas con `_columnas_nomina`, para no
+                  recorrer el storage otra vez (opcional)
+        
+    Returns:
+        Lista de diccionarios (uno por cargo, ordenados por cargo) con
+        cargo, contratos, total, promedio y mediana. Promedio y mediana son
+        None para cargos sin contratos.
+    """
+    np = _numpy()
+    salarios, codigos, cargos = columnas if columnas is not None else _columnas_nomina(storage)
+    conteos = np.bincount(codigos, minlength=len(cargos))
+    totales = np.bincount(codigos, weights=salarios, minlength=len(cargos))
+
+    # Ordenar por (cargo, salario): la mediana de cada grupo queda en el centro de su tramo
+    orden = np.lexsort((salarios, codigos))
+    ordenados = salarios[orden]
+    inicios = np.concatenate(([0], np.cumsum(conteos)[:-1])) if len(cargos) else conteos
+    con_datos = conteos > 0
+    medio_bajo = (inicios + (conteos - 1) // 2)[con_datos]
+    medio_alto = (inicios + conteos // 2)[con_datos]
+    medianas = np.full(len(cargos), np.nan)
+    medianas[con_datos] = (ordenados[medio_bajo] + ordenados[medio_alto]) / 2
+
+    resumen = []
+    for codigo in sorted(range(len(cargos)), key=lambda c: cargos[c]):
+        cantidad = int(conteos[codigo])
+        resumen.append({
+            "cargo": cargos[codigo],
+            "contratos": cantidad,
+            "total": float(totales[codigo]),
+            "promedio": float(totales[codigo] / cantidad) if cantidad else None,
+            "mediana": float(medianas[codigo]) if cantidad else None,
+        })
+    return resumen
+
+
+@instrumentar()
+def histograma_salarios(
+    storage: JsonStorage,
+    bins: int = 10,
+    cargo: Optional[str] = None,
+    columnas: Optional[Tuple[Any, Any, List[str]]] = None
+) -> Dict:
+    """Calcular la distribución de salarios de los contratos.
+    
+    Args:
+        storage: Storage de empleados
+        bins: Cantidad de intervalos de igual ancho
+        cargo: Si se indica, solo contratos de empleados con ese cargo
+        columnas: Columnas ya construidas con `_columnas_nomina` (opcional)
+        
+    Returns:
+        Dict con "bordes" (bins + 1 límites) y "conteos" (bins valores).
+        Ambas listas están vacías si no hay contratos.
+    """
+    np = _numpy()
+    salarios, codigos, cargos = columnas if columnas is not None else _columnas_nomina(storage)
+    if cargo is not None:
+        salarios = salarios[codigos == cargos.index(cargo)] if cargo in cargos else salarios[:0]
+    if salarios.size == 0:
+        return {"bordes": [], "conteos": []}
+    conteos, bordes = np.histogram(salarios, bins=bins)
+    return {"bordes": bordes.tolist(), "conteos": conteos.tolist()}
@@ -0,0 +1,231 @@
+"""Almacenamiento de empleados repartido en varios archivos JSON (shards).
+
+`ShardedStorage` distribuye los empleados entre N archivos según un hash
+estable de su id, de modo que cada add/update/delete reescribe solo el shard
+afectado y no el documento completo. Cada shard es un `JsonStorage`.
+
+Estructura en disco (con N = 4)::
+
+    data/empleados.shards.json       # manifiesto: {"shards": 4}
+    data/empleados.secuencias.json   # secuencias de ids (se crea al primer alta)
+    data/empleados-000.json
+    data/empleados-001.json
+    data/empleados-002.json
+    data/empleados-003.json
+"""
+from contextlib import ExitStack, contextmanager
+from heapq import merge
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import json
+import zlib
+
+from .concurrencia import ConflictoDeVersion, con_reintentos
+from .json_storage import (
+    FORMATO_POR_DEFECTO,
+    JsonStorage,
+    CLAVES_ORDEN,
+    _siguiente_libre,
+    _validar_consulta,
+    inicializar_archivo,
+)
+from .indices import UMBRAL_SIMILITUD
+from .fechas import a_ordinal
+from .models import ContractTable
+
+SUFIJO_MANIFIESTO = ".shards.json"
+
+
+def _ruta_shard(manifiesto: Path, numero: int) -> Path:
+    """Retornar la ruta del shard `numero` junto al manifiesto."""
+    base = manifiesto.name[: -len(SUFIJO_MANIFIESTO)]
+    return manifiesto.with_name(f"{base}-{numero:03d}.json")
+
+
+def _ruta_secuencias(manifiesto: Path) -> Path:
+    """Retornar la ruta del archivo de secuencias de ids junto al manifiesto."""
+    base = manifiesto.name[: -len(SUFIJO_MANIFIESTO)]
+    return manifiesto.with_name(f"{base}.secuencias.json")
+
+
+def inicializar_shards(manifest_path: str, shards: int, formato: str = FORMATO_POR_DEFECTO) -> None:
+    """Crear el manifiesto y `shards` archivos vacíos en el formato dado.
+
+    Lanza ValueError si la cantidad de shards no es positiva, si la ruta no
+    termina en '.shards.json' o si el formato no existe.
+    """
+    manifiesto = Path(manifest_path)
+    if shards < 1:
+        raise ValueError("La cantidad de shards debe ser al menos 1")
+    if not manifiesto.name.endswith(SUFIJO_MANIFIESTO):
+        raise ValueError(f"El manifiesto debe terminar en '{SUFIJO_MANIFIESTO}'")
+    manifiesto.parent.mkdir(parents=True, exist_ok=True)
+    for numero in range(shards):
+        inicializar_archivo(str(_ruta_shard(manifiesto, numero)), formato)
+    manifiesto.write_text(json.dumps({"shards": shards}), encoding="utf-8")
+
+
+class ShardedStorage:
+    """Storage con la interfaz de `JsonStorage` repartido en varios archivos.
+
+    El shard de un empleado se elige con un hash estable del id (el propio
+    valor para ids enteros, CRC32 de su texto en otro caso). Las consultas que
+    recorren todos los empleados combinan los shards en orden de id.
+    """
+
+    def __init__(self, manifest_path: str):
+        self.manifest_path = Path(manifest_path)
+        try:
+            manifiesto = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            cantidad = int(manifiesto["shards"])
+        except (OSError, ValueError, KeyError, TypeError):
+            raise ValueError(
+                f"Manifiesto de shards inválido o inexistente: '{self.manifest_path}' "
+                "(crear con init-db --shards N)"
+            )
+        self.shards: List[JsonStorage] = [
+            JsonStorage(str(_ruta_shard(self.manifest_path, n))) for n in range(cantidad)
+        ]
+        # Solo guarda 'meta' con las secuencias; no participa de los lotes
+        self.secuencias = JsonStorage(str(_ruta_secuencias(self.manifest_path)))
+
+    @property
+    def rutas_shards(self) -> List[str]:
+        """Rutas de los archivos de cada shard."""
+        return [str(s.file_path) for s in self.shards]
+
+    def _shard(self, record_id: Any) -> JsonStorage:
+        """Retornar el shard que guarda el id dado."""
+        if isinstance(record_id, int):
+            clave = record_id
+        else:
+            clave = zlib.crc32(str(record_id).encode("utf-8"))
+        return self.shards[clave % len(self.shards)]
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """Retornar todos los empleados de todos los shards, en orden de id."""
+        return list(merge(*(s.get_all() for s in self.shards), key=lambda e: e.get("id")))
+
+    def iter_empleados(self) -> Iterator[Dict[str, Any]]:
+        """Iterar los empleados de todos los shards, en orden de id."""
+        return merge(*(s.iter_empleados() for s in self.shards), key=lambda e: e.get("id"))
+
+    def tabla_contratos(self) -> ContractTable:
+        """Cargar los contratos de todos los shards en una `ContractTable`."""
+        tabla = ContractTable()
+        for shard in self.shards:
+            tabla.extend(shard.tabla_contratos())
+        return tabla
+
+    def get_by_id(self, record_id: Any) -> Optional[Dict[str, Any]]:
+        """Retornar el registro con el id dado, o None si no existe."""
+        return self._shard(record_id).get_by_id(record_id)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Agregar un registro en su shard.
+
+        Lanza ValueError si el registro ya existe (basado en el campo 'id').
+        """
+        self._shard(record.get("id")).add(record)
+
+    def update(self, record_id: Any, updates: Dict[str, Any]) -> None:
+        """Actualizar un registro por id reescribiendo solo su shard.
+
+        Lanza ValueError si el registro no existe o si se intenta cambiar el id.
+        """
+        self._shard(record_id).update(record_id, updates)
+
+    def delete(self, record_id: Any) -> None:
+        """Eliminar un registro por id reescribiendo solo su shard.
+
+        Lanza ValueError si el registro no existe.
+        """
+        self._shard(record_id).delete(record_id)
+
+    @contextmanager
+    def batch(self) -> Iterator["ShardedStorage"]:
+        """Agrupar operaciones: cada shard modificado se escribe una sola vez al salir.
+
+        Si se lanza una excepción los cambios de todos los shards se descartan.
+        Antes de escribir se toma el bloqueo exclusivo de cada shard modificado
+        y se verifican todas sus versiones, de modo que un conflicto
+        (`ConflictoDeVersion`) también descarta los cambios de todos. Los
+        shards se escriben uno por uno: un error de disco a mitad de la
+        confirmación puede dejar escritos solo algunos.
+        """
+        with ExitStack() as bloqueos:
+            with ExitStack() as lotes:
+                for shard in self.shards:
+                    lotes.enter_context(shard.batch())
+                yield self
+                modificados = [s for s in self.shards if s._lote_ops]
+                # Siempre en el mismo orden, para no bloquearse con otro proceso
+                for shard in modificados:
+                    bloqueos.enter_context(shard._bloqueo.exclusivo())
+                for shard in modificados:
+                    if shard._version_en_disco() != shard._version_cargada(shard._lote_data):
+                        raise ConflictoDeVersion(
+                            f"'{shard.file_path}' fue modificado por otro proceso; repetir la operación"
+                        )
+
+    def query(
+        self,
+        cargo: Optional[str] = None,
+        nombre_prefix: Optional[str] = None,
+        order_by: str = "id",
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Consultar empleados filtrando, ordenando y paginando (ver `JsonStorage.query`).
+
+        Cada shard resuelve la consulta con sus índices hasta el final de la
+        página pedida; los resultados se combinan en orden y se recorta la página.
+        """
+        campo, descendente = _validar_consulta(order_by, limit, offset)
+        hasta = None if limit is None else offset + limit
+        partes = [s.query(cargo, nombre_prefix, order_by, limit=hasta) for s in self.shards]
+        combinados = merge(*partes, key=CLAVES_ORDEN[campo], reverse=descendente)
+        return list(islice(combinados, offset, hasta))
+
+    def buscar_por_nombre(self, texto: str, limit: int = 10, umbral: float = UMBRAL_SIMILITUD) -> List[Dict[str, Any]]:
+        """Buscar empleados con nombre parecido a `texto` (ver `JsonStorage.buscar_por_nombre`).
+
+        Cada shard busca con su índice de trigramas y se conservan los mejores.
+        """
+        encontrados = [r for s in self.shards for r in s.buscar_por_nombre(texto, limit, umbral)]
+        encontrados.sort(key=lambda r: (-r["similitud"], r["empleado"].get("id")))
+        return encontrados[:limit]
+
+    def reservar_ids(self, secuencia: str, cantidad: int = 1) -> int:
+        """Reservar `cantidad` valores consecutivos de una secuencia y retornar el primero.
+
+        Las secuencias son globales y se guardan en su propio archivo, no en
+        los shards: cada alta reescribe solo el shard del empleado. La reserva
+        se confirma de inmediato, también dentro de un lote, así que un lote
+        descartado solo deja ids sin usar y nunca ids repetidos.
+
+        Lanza ValueError si la secuencia no existe o la cantidad no es positiva.
+        """
+        return con_reintentos(lambda: self.secuencias._reservar(
+            secuencia, cantidad, lambda: self._primer_id_libre(secuencia)
+        ))
+
+    def _primer_id_libre(self, secuencia: str) -> int:
+        """Valor inicial de una secuencia que aún no está en el archivo de secuencias.
+
+        Respeta el valor que versiones anteriores guardaban en el 'meta' del
+        primer shard.
+        """
+        anterior = self.shards[0].load_json().get("meta", {}).get(secuencia, 0)
+        return max(anterior, _siguiente_libre(self.iter_empleados(), secuencia))
+
+    def contratos_vencidos(self, limite: int) -> List[Dict[str, Any]]:
+        """Retornar los contratos con fecha de fin anterior al ordinal `limite`.
+
+        Combina los resultados de cada shard manteniendo el orden por fecha de fin.
+        """
+        return list(merge(
+            *(s.contratos_vencidos(limite) for s in self.shards),
+            key=lambda c: a_ordinal(c["fecha_fin"]),
+        ))
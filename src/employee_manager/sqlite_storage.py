@@ -0,0 +1,370 @@
+"""Almacenamiento de empleados y contratos en SQLite.
+
+`SqliteStorage` ofrece la misma interfaz que `JsonStorage` (get_all,
+iter_empleados, get_by_id, add, update, delete y batch) sobre dos tablas normalizadas:
+
+- ``empleados``: id, nombre, cargo (índices por cargo y por nombre)
+- ``contratos``: un registro por contrato (índice por fecha de fin, guardada
+  también como ordinal en la columna ``fin``)
+- ``secuencias``: siguiente id de empleados y de contratos
+
+Además expone `contratos_vencidos` para que los reportes filtren en SQL en lugar
+de recorrer todos los registros en Python.
+"""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+import json
+import sqlite3
+
+from .json_storage import JsonStorage, SECUENCIA_CONTRATOS, _PRIMER_VALOR, _validar_consulta, _validar_reserva
+from .fechas import a_ordinal_o_none
+from .models import ContractTable
+
+_CAMPOS_EMPLEADO = ("id", "nombre", "cargo", "contratos")
+_CAMPOS_CONTRATO = ("id_contrato", "fecha_inicio", "fecha_fin", "salario")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS empleados (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT,
+    cargo TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_empleados_cargo ON empleados (cargo);
+CREATE INDEX IF NOT EXISTS idx_empleados_nombre ON empleados (nombre COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS contratos (
+    id_empleado INTEGER NOT NULL REFERENCES empleados (id),
+    id_contrato INTEGER,
+    fecha_inicio TEXT,
+    fecha_fin TEXT,
+    fin INTEGER,
+    salario REAL,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_contratos_empleado ON contratos (id_empleado);
+CREATE INDEX IF NOT EXISTS idx_contratos_fecha_fin ON contratos (fin);
+
+CREATE TABLE IF NOT EXISTS secuencias (
+    nombre TEXT PRIMARY KEY,
+    siguiente INTEGER NOT NULL
+);
+"""
+
+
+def _extra(record: Dict[str, Any], campos: tuple) -> Optional[str]:
+    """Serializar los campos del registro que no tienen columna propia."""
+    extra = {k: v for k, v in record.items() if k not in campos}
+    return json.dumps(extra, ensure_ascii=False) if extra else None
+
+
+class SqliteStorage:
+    """Storage de empleados sobre una base SQLite.
+
+    Las operaciones fuera de un lote se confirman de inmediato; dentro de
+    `batch()` se confirman juntas al salir del bloque.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.executescript(_ESQUEMA)
+        self._en_lote = False
+
+    def close(self) -> None:
+        """Cerrar la conexión con la base de datos."""
+        self._conn.close()
+
+    def _confirmar(self) -> None:
+        """Confirmar la transacción en curso salvo que haya un lote abierto."""
+        if not self._en_lote:
+            self._conn.commit()
+
+    @contextmanager
+    def batch(self) -> Iterator["SqliteStorage"]:
+        """Agrupar varias operaciones en una sola transacción.
+
+        Si se lanza una excepción dentro del bloque los cambios se descartan.
+        """
+        if self._en_lote:
+            yield self
+            return
+        self._en_lote = True
+        try:
+            yield self
+        except BaseException:
+            self._en_lote = False
+            self._conn.rollback()
+            raise
+        self._en_lote = False
+        self._conn.commit()
+
+    def _contrato_desde_fila(self, fila: tuple) -> Dict[str, Any]:
+        """Construir el diccionario de contrato a partir de una fila de la tabla."""
+        id_contrato, fecha_inicio, fecha_fin, salario, extra = fila
+        contrato = {
+            "id_contrato": id_contrato,
+            "fecha_inicio": fecha_inicio,
+            "fecha_fin": fecha_fin,
+            "salario": salario,
+        }
+        if extra:
+            contrato.update(json.loads(extra))
+        return contrato
+
+    def _empleado_desde_fila(self, fila: tuple, contratos: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Construir el diccionario de empleado a partir de una fila de la tabla."""
+        id_, nombre, cargo, extra = fila
+        empleado = {"id": id_, "nombre": nombre, "cargo": cargo}
+        if extra:
+            empleado.update(json.loads(extra))
+        empleado["contratos"] = contratos
+        return empleado
+
+    def _contratos_de(self, record_id: Any) -> List[Dict[str, Any]]:
+        """Retornar los contratos de un empleado en orden de inserción."""
+        filas = self._conn.execute(
+            "SELECT id_contrato, fecha_inicio, fecha_fin, salario, extra "
+            "FROM contratos WHERE id_empleado = ? ORDER BY rowid",
+            (record_id,),
+        )
+        return [self._contrato_desde_fila(f) for f in filas]
+
+    def _insertar_contratos(self, record_id: Any, contratos: List[Dict[str, Any]]) -> None:
+        """Insertar la lista de contratos de un empleado."""
+        self._conn.executemany(
+            "INSERT INTO contratos (id_empleado, id_contrato, fecha_inicio, fecha_fin, fin, salario, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    record_id,
+                    c.get("id_contrato"),
+                    c.get("fecha_inicio"),
+                    c.get("fecha_fin"),
+                    a_ordinal_o_none(c.get("fecha_fin")),
+                    c.get("salario"),
+                    _extra(c, _CAMPOS_CONTRATO),
+                )
+                for c in contratos
+            ],
+        )
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """Retornar todos los empleados con sus contratos."""
+        contratos: Dict[Any, List[Dict[str, Any]]] = {}
+        filas = self._conn.execute(
+            "SELECT id_empleado, id_contrato, fecha_inicio, fecha_fin, salario, extra "
+            "FROM contratos ORDER BY rowid"
+        )
+        for fila in filas:
+            contratos.setdefault(fila[0], []).append(self._contrato_desde_fila(fila[1:]))
+        filas = self._conn.execute("SELECT id, nombre, cargo, extra FROM empleados ORDER BY id")
+        return [self._empleado_desde_fila(f, contratos.get(f[0], [])) for f in filas]
+
+    def iter_empleados(self) -> Iterator[Dict[str, Any]]:
+        """Iterar los empleados con sus contratos sin materializar la tabla completa.
+
+        Recorre empleados y contratos en orden de id de empleado y los combina
+        a medida que avanza.
+        """
+        # Cursores propios: el recorrido puede intercalarse con otras consultas
+        contratos = self._conn.cursor().execute(
+            "SELECT id_empleado, id_contrato, fecha_inicio, fecha_fin, salario, extra "
+            "FROM contratos ORDER BY id_empleado, rowid"
+        )
+        empleados = self._conn.cursor().execute("SELECT id, nombre, cargo, extra FROM empleados ORDER BY id")
+        pendiente = contratos.fetchone()
+        for fila in empleados:
+            propios = []
+            # Contratos de ids menores sin empleado asociado se descartan
+            while pendiente is not None and pendiente[0] < fila[0]:
+                pendiente = contratos.fetchone()
+            while pendiente is not None and pendiente[0] == fila[0]:
+                propios.append(self._contrato_desde_fila(pendiente[1:]))
+                pendiente = contratos.fetchone()
+            yield self._empleado_desde_fila(fila, propios)
+
+    def tabla_contratos(self) -> ContractTable:
+        """Cargar todos los contratos en una `ContractTable` leyendo solo la tabla de contratos."""
+        tabla = ContractTable()
+        filas = self._conn.execute(
+            "SELECT id_empleado, id_contrato, fecha_inicio, fin, salario FROM contratos ORDER BY id_empleado, rowid"
+        )
+        for id_empleado, id_contrato, fecha_inicio, fin, salario in filas:
+            tabla.append(id_empleado, id_contrato, a_ordinal_o_none(fecha_inicio) or 0, fin or 0, salario)
+        return tabla
+
+    def get_by_id(self, record_id: Any) -> Optional[Dict[str, Any]]:
+        """Retornar el empleado con el id dado, o None si no existe."""
+        fila = self._conn.execute(
+            "SELECT id, nombre, cargo, extra FROM empleados WHERE id = ?", (record_id,)
+        ).fetchone()
+        if fila is None:
+            return None
+        return self._empleado_desde_fila(fila, self._contratos_de(record_id))
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Agregar un empleado con sus contratos.
+
+        Lanza ValueError si el registro ya existe (basado en el campo 'id').
+        """
+        record_id = record.get("id")
+        if record_id and self.get_by_id(record_id) is not None:
+            raise ValueError(f"Registro con id '{record_id}' ya existe")
+        cursor = self._conn.execute(
+            "INSERT INTO empleados (id, nombre, cargo, extra) VALUES (?, ?, ?, ?)",
+            (record_id, record.get("nombre"), record.get("cargo"), _extra(record, _CAMPOS_EMPLEADO)),
+        )
+        self._insertar_contratos(cursor.lastrowid, record.get("contratos", []))
+        self._confirmar()
+
+    def update(self, record_id: Any, updates: Dict[str, Any]) -> None:
+        """Actualizar un empleado por id.
+
+        Lanza ValueError si el registro no existe.
+        No permite cambiar el id del registro.
+        """
+        if "id" in updates and updates["id"] != record_id:
+            raise ValueError("No se puede cambiar el id del registro")
+        actual = self.get_by_id(record_id)
+        if actual is None:
+            raise ValueError(f"Registro con id '{record_id}' no encontrado")
+        nuevo = {**actual, **updates}
+        self._conn.execute(
+            "UPDATE empleados SET nombre = ?, cargo = ?, extra = ? WHERE id = ?",
+            (nuevo.get("nombre"), nuevo.get("cargo"), _extra(nuevo, _CAMPOS_EMPLEADO), record_id),
+        )
+        if "contratos" in updates:
+            self._conn.execute("DELETE FROM contratos WHERE id_empleado = ?", (record_id,))
+            self._insertar_contratos(record_id, nuevo.get("contratos", []))
+        self._confirmar()
+
+    def delete(self, record_id: Any) -> None:
+        """Eliminar un empleado y sus contratos por id.
+
+        Lanza ValueError si el registro no existe.
+        """
+        cursor = self._conn.execute("DELETE FROM empleados WHERE id = ?", (record_id,))
+        if cursor.rowcount == 0:
+            raise ValueError(f"Registro con id '{record_id}' no encontrado")
+        self._conn.execute("DELETE FROM contratos WHERE id_empleado = ?", (record_id,))
+        self._confirmar()
+
+    def query(
+        self,
+        cargo: Optional[str] = None,
+        nombre_prefix: Optional[str] = None,
+        order_by: str = "id",
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Consultar empleados filtrando, ordenando y paginando en SQL.
+
+        Mismos parámetros que `JsonStorage.query`. El prefijo de nombre no
+        distingue mayúsculas (solo para letras ASCII, como LIKE en SQLite).
+        """
+        campo, descendente = _validar_consulta(order_by, limit, offset)
+        condiciones, parametros = [], []
+        if cargo is not None:
+            condiciones.append("cargo = ?")
+            parametros.append(cargo)
+        if nombre_prefix is not None:
+            escapado = nombre_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            condiciones.append("nombre LIKE ? ESCAPE '\\'")
+            parametros.append(escapado + "%")
+        direccion = " DESC" if descendente else ""
+        orden = {
+            "id": f"id{direccion}",
+            "nombre": f"nombre COLLATE NOCASE{direccion}, id{direccion}",
+            "cargo": f"cargo{direccion}, id{direccion}",
+        }[campo]
+        sql = "SELECT id, nombre, cargo, extra FROM empleados"
+        if condiciones:
+            sql += " WHERE " + " AND ".join(condiciones)
+        sql += f" ORDER BY {orden} LIMIT ? OFFSET ?"
+        filas = self._conn.execute(sql, (*parametros, -1 if limit is None else limit, offset)).fetchall()
+        return [self._empleado_desde_fila(f, self._contratos_de(f[0])) for f in filas]
+
+    def reservar_ids(self, secuencia: str, cantidad: int = 1) -> int:
+        """Reservar `cantidad` valores consecutivos de una secuencia y retornar el primero.
+
+        Lanza ValueError si la secuencia no existe o la cantidad no es positiva.
+        """
+        _validar_reserva(secuencia, cantidad)
+        inicio = self._siguiente(secuencia)
+        self._fijar_secuencia(secuencia, inicio + cantidad)
+        self._confirmar()
+        return inicio
+
+    def _siguiente(self, secuencia: str) -> int:
+        """Retornar el próximo valor de la secuencia sin reservarlo.
+
+        Si la secuencia aún no está en la tabla, el mayor id existente más uno.
+        """
+        fila = self._conn.execute("SELECT siguiente FROM secuencias WHERE nombre = ?", (secuencia,)).fetchone()
+        if fila is not None:
+            return fila[0]
+        if secuencia == SECUENCIA_CONTRATOS:
+            mayor = self._conn.execute("SELECT MAX(id_contrato) FROM contratos").fetchone()[0]
+        else:
+            mayor = self._conn.execute("SELECT MAX(id) FROM empleados").fetchone()[0]
+        return max((mayor or 0) + 1, _PRIMER_VALOR[secuencia])
+
+    def _fijar_secuencia(self, secuencia: str, siguiente: int) -> None:
+        """Guardar el próximo valor de la secuencia (sin confirmar la transacción)."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO secuencias (nombre, siguiente) VALUES (?, ?)",
+            (secuencia, siguiente),
+        )
+
+    def contratos_vencidos(self, limite: int) -> List[Dict[str, Any]]:
+        """Retornar los contratos con fecha de fin anterior al ordinal `limite`.
+
+        Cada contrato incluye id_empleado, nombre_empleado y cargo_empleado.
+        El filtro se resuelve con el índice sobre la fecha de fin.
+        """
+        filas = self._conn.execute(
+            "SELECT c.id_contrato, c.fecha_inicio, c.fecha_fin, c.salario, c.extra, "
+            "e.id, e.nombre, e.cargo "
+            "FROM contratos c JOIN empleados e ON e.id = c.id_empleado "
+            "WHERE c.fin < ? ORDER BY c.fin",
+            (limite,),
+        )
+        vencidos = []
+        for fila in filas:
+            vencidos.append({
+                **self._contrato_desde_fila(fila[:5]),
+                "id_empleado": fila[5],
+                "nombre_empleado": fila[6],
+                "cargo_empleado": fila[7],
+            })
+        return vencidos
+
+
+def migrar_json_a_sqlite(json_path: str, db_path: str) -> int:
+    """Copiar los empleados de un archivo JSON a una base SQLite.
+
+    También copia las secuencias de ids de 'meta' (sin retroceder las que ya
+    tenga la base), para que los ids de registros eliminados antes de migrar
+    no se reutilicen.
+
+    Retorna la cantidad de empleados migrados. Lanza ValueError si algún id ya
+    existe en la base, sin dejar cambios a medias.
+    """
+    documento = JsonStorage(json_path, cache=False).load_json()
+    empleados = documento.get("empleados", [])
+    meta = documento.get("meta", {})
+    storage = SqliteStorage(db_path)
+    try:
+        with storage.batch():
+            for empleado in empleados:
+                storage.add(empleado)
+            for secuencia in _PRIMER_VALOR:
+                siguiente = meta.get(secuencia)
+                if isinstance(siguiente, int) and siguiente > storage._siguiente(secuencia):
+                    storage._fijar_secuencia(secuencia, siguiente)
+    finally:
+        storage.close()
+    return len(empleados)
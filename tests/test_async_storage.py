@@ -0,0 +1,122 @@
+"""Pruebas para el storage y los gestores asíncronos."""
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+from employee_manager import gestor_async
+from employee_manager.async_storage import AsyncJsonStorage
+from employee_manager.json_storage import JsonStorage
+
+
+def _make_storage():
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".json")
+    path = tmp.name
+    tmp.close()
+    return AsyncJsonStorage(path), path
+
+
+def test_gestores_async():
+    storage, path = _make_storage()
+
+    async def escenario():
+        async with storage:
+            empleados = await asyncio.gather(
+                *(gestor_async.agregar_empleado(f"Empleado {i}", "Dev", storage) for i in range(20))
+            )
+            await gestor_async.asociar_contrato(3, "2023-01-01", "2023-12-31", 3000, storage)
+            encontrado = await gestor_async.buscar_empleado(3, storage)
+            vencidos = await gestor_async.listar_contratos_vencidos(storage, "2024-01-01")
+            return empleados, encontrado, vencidos
+
+    try:
+        empleados, encontrado, vencidos = asyncio.run(escenario())
+        # Las escrituras concurrentes se serializan: ids únicos y consecutivos
+        assert sorted(e["id"] for e in empleados) == list(range(1, 21))
+        assert encontrado["contratos"][0]["id_contrato"] == 101
+        assert [c["id_empleado"] for c in vencidos] == [3]
+        assert len(JsonStorage(path, cache=False).get_all()) == 20
+    finally:
+        os.remove(path)
+
+
+def test_lecturas_concurrentes_se_combinan():
+    storage, path = _make_storage()
+    llamadas = []
+
+    def carga_lenta(valor):
+        llamadas.append(valor)
+        time.sleep(0.05)
+        return valor * 2
+
+    async def escenario():
+        async with storage:
+            iguales = await asyncio.gather(*(storage.leer(carga_lenta, 1) for _ in range(5)))
+            distinta = await storage.leer(carga_lenta, 2)
+            otra_vez = await storage.leer(carga_lenta, 1)
+            return iguales, distinta, otra_vez
+
+    try:
+        iguales, distinta, otra_vez = asyncio.run(escenario())
+        assert iguales == [2] * 5
+        assert (distinta, otra_vez) == (4, 2)
+        # Cinco lecturas concurrentes, una sola ejecución; las posteriores vuelven a ejecutar
+        assert llamadas == [1, 2, 1]
+    finally:
+        os.remove(path)
+
+
+def test_lecturas_corren_a_la_vez_y_las_escrituras_solas():
+    storage, path = _make_storage()
+    # Si las lecturas se serializaran, la barrera vencería esperando a la segunda
+    barrera = threading.Barrier(2, timeout=5)
+    eventos = []
+
+    def leer(valor):
+        barrera.wait()
+        time.sleep(0.05)
+        eventos.append(f"fin lectura {valor}")
+        return valor
+
+    def escribir():
+        eventos.append("escritura")
+
+    async def escenario():
+        async with storage:
+            lecturas = asyncio.gather(storage.leer(leer, 1), storage.leer(leer, 2))
+            await asyncio.sleep(0.01)
+            await storage.escribir(escribir)
+            return await lecturas
+
+    try:
+        assert asyncio.run(escenario()) == [1, 2]
+        assert eventos[-1] == "escritura"
+    finally:
+        os.remove(path)
+
+
+def test_cerrar_no_bloquea_el_event_loop():
+    storage, path = _make_storage()
+    ticks = []
+
+    async def contar():
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0.01)
+
+    async def escenario():
+        contador = asyncio.ensure_future(contar())
+        async with storage:
+            escritura = asyncio.ensure_future(storage.escribir(time.sleep, 0.2))
+            await asyncio.sleep(0.01)
+            antes = len(ticks)
+        # Al salir se esperó la escritura en curso sin frenar al contador
+        contador.cancel()
+        assert escritura.done()
+        return len(ticks) - antes
+
+    try:
+        assert asyncio.run(escenario()) >= 5
+    finally:
+        os.remove(path)
@@ -0,0 +1,62 @@
+"""Pruebas para el generador de datasets y los benchmarks."""
+import os
+import tempfile
+
+from click.testing import CliRunner
+
+from benchmarks.__main__ import main
+from benchmarks.comparacion import comparar
+from benchmarks.ejecucion import OPERACIONES, cargar_resultados, ejecutar
+from benchmarks.generador import escribir_dataset, generar_empleados
+from employee_manager import gestor_contratos, gestor_empleados
+from employee_manager.json_storage import JsonStorage
+
+
+def test_generador_es_determinista_y_compatible_con_el_storage():
+    assert list(generar_empleados(50, semilla=3)) == list(generar_empleados(50, semilla=3))
+    assert list(generar_empleados(50, semilla=3)) != list(generar_empleados(50, semilla=4))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "empleados.json")
+        escribir_dataset(path, 200, semilla=1)
+        storage = JsonStorage(path)
+        empleados = storage.get_all()
+        assert [e["id"] for e in empleados] == list(range(1, 201))
+        ids_contratos = [c["id_contrato"] for e in empleados for c in e["contratos"]]
+        assert ids_contratos == list(range(101, 101 + len(ids_contratos)))
+        assert list(storage.iter_empleados()) == empleados
+
+        # Las secuencias guardadas continúan después de los datos generados
+        assert gestor_empleados.agregar_empleado("Ana", "Dev", storage)["id"] == 201
+        contrato = gestor_contratos.asociar_contrato(201, "2024-01-01", "2024-12-31", 3000, storage)
+        assert contrato["id_contrato"] == 101 + len(ids_contratos)
+
+
+def test_ejecutar_mide_todas_las_operaciones():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        resultados = ejecutar([100], tmpdir, repeticiones=2)
+        assert [r["operacion"] for r in resultados["resultados"]] == [n for n, _ in OPERACIONES]
+        assert all(0 <= r["minimo"] <= r["mediana"] for r in resultados["resultados"])
+
+        salida = os.path.join(tmpdir, "resultados.json")
+        res = CliRunner().invoke(main, [
+            "run", "--sizes", "100", "--repeat", "1", "--op", "storage.get_by_id",
+            "--data-dir", tmpdir, "--output", salida,
+        ])
+        assert res.exit_code == 0, res.output
+        assert [r["operacion"] for r in cargar_resultados(salida)["resultados"]] == ["storage.get_by_id"]
+
+
+def test_comparar_marca_regresiones():
+    def resultados(**medianas):
+        return {"resultados": [
+            {"tamano": 1000, "operacion": op, "mediana": m} for op, m in medianas.items()
+        ]}
+
+    base = resultados(add=0.010, get=0.00001)
+    actual = resultados(add=0.020, get=0.00003)
+    filas = {f["operacion"]: f for f in comparar(base, actual)}
+    assert filas["add"]["regresion"] and filas["add"]["cambio"] == 1.0
+    # Más lento en términos relativos, pero por debajo de la diferencia mínima
+    assert not filas["get"]["regresion"]
+    assert not comparar(base, resultados(add=0.011))[0]["regresion"]
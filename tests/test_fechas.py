@@ -0,0 +1,23 @@
+"""Pruebas para la conversión de fechas a ordinales."""
+from datetime import date, datetime
+
+import pytest
+
+from employee_manager.fechas import a_ordinal, a_ordinal_o_none, desde_ordinal
+
+
+@pytest.mark.parametrize("fecha", ["2024-01-05", "2024-1-5", "2024-02-29", "0001-01-01", "9999-12-31"])
+def test_a_ordinal_coincide_con_strptime(fecha):
+    assert a_ordinal(fecha) == datetime.strptime(fecha, "%Y-%m-%d").toordinal()
+
+
+@pytest.mark.parametrize("fecha", ["2023-02-29", "2024-13-01", "20240105", "2024/01/05", "2024- 1-05", "", None, 20240105])
+def test_fechas_invalidas(fecha):
+    with pytest.raises(ValueError):
+        a_ordinal(fecha)
+    assert a_ordinal_o_none(fecha) is None
+
+
+def test_desde_ordinal_retorna_iso():
+    assert desde_ordinal(a_ordinal("2024-1-5")) == "2024-01-05"
+    assert desde_ordinal(date(2025, 3, 1).toordinal()) == "2025-03-01"
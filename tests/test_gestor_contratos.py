@@ -4,7 +4,7 @@ import tempfile
 
 import pytest
 
-from employee_manager import gestor_contratos
+from employee_manager import gestor_contratos, gestor_empleados
 from employee_manager.models import Contract
 from employee_manager.json_storage import JsonStorage
 
@@ -110,3 +110,91 @@ def test_add_contract_validate_employee():
             gestor_contratos.add_contract(storage, c2, validate_employee=employee_exists)
     finally:
         os.remove(path)
+
+
+def _agregar_con_contratos(storage):
+    ana = gestor_empleados.agregar_empleado("Ana", "Dev", storage)
+    luis = gestor_empleados.agregar_empleado("Luis", "QA", storage)
+    gestor_contratos.asociar_contrato(ana["id"], "2023-01-01", "2024-03-31", 3000, storage)
+    gestor_contratos.asociar_contrato(luis["id"], "2023-01-01", "2023-12-31", 2800, storage)
+    gestor_contratos.asociar_contrato(ana["id"], "2024-04-01", "2099-12-31", 3200, storage)
+    return ana, luis
+
+
+def test_listar_contratos_vencidos_por_fecha_de_fin():
+    storage, path = _make_storage()
+    try:
+        ana, luis = _agregar_con_contratos(storage)
+
+        vencidos = gestor_contratos.listar_contratos_vencidos(storage, "2024-06-01")
+        assert [(c["nombre_empleado"], c["fecha_fin"]) for c in vencidos] == [
+            ("Luis", "2023-12-31"),
+            ("Ana", "2024-03-31"),
+        ]
+        assert gestor_contratos.listar_contratos_vencidos(storage, "2023-12-31") == []
+        assert len(gestor_contratos.listar_contratos_vencidos(storage)) == 2
+        assert gestor_contratos.listar_contratos_vencidos(storage, "31/12/2024") == []
+    finally:
+        os.remove(path)
+
+
+def test_indice_de_vencimientos_se_actualiza_incrementalmente():
+    storage, path = _make_storage()
+    try:
+        ana, luis = _agregar_con_contratos(storage)
+        assert len(gestor_contratos.listar_contratos_vencidos(storage, "2024-06-01")) == 2
+        indice = storage._secundarios["vencimientos"]
+
+        gestor_contratos.asociar_contrato(luis["id"], "2024-01-01", "2024-05-15", 2900, storage)
+        gestor_empleados.eliminar_empleado(ana["id"], storage)
+        vencidos = gestor_contratos.listar_contratos_vencidos(storage, "2024-06-01")
+
+        assert storage._secundarios["vencimientos"] is indice
+        assert [(c["id_empleado"], c["id_contrato"]) for c in vencidos] == [(2, 102), (2, 104)]
+        # Un storage sin caché relee el archivo y llega al mismo resultado
+        assert gestor_contratos.listar_contratos_vencidos(JsonStorage(path, cache=False), "2024-06-01") == vencidos
+    finally:
+        os.remove(path)
+
+
+def test_listar_contratos_vencidos_incremental():
+    storage, path = _make_storage()
+    try:
+        _agregar_con_contratos(storage)
+        esperado = gestor_contratos.listar_contratos_vencidos(storage, "2024-06-01")
+
+        incremental = gestor_contratos.listar_contratos_vencidos(
+            JsonStorage(path), "2024-06-01", incremental=True
+        )
+        assert sorted(incremental, key=lambda c: c["fecha_fin"]) == esperado
+    finally:
+        os.remove(path)
+
+
+def test_listar_contratos_vencidos_en_paralelo():
+    storage, path = _make_storage()
+    try:
+        _agregar_con_contratos(storage)
+        esperado = gestor_contratos.listar_contratos_vencidos(storage, "2024-06-01")
+
+        assert gestor_contratos.listar_contratos_vencidos(storage, "2024-06-01", workers=2) == esperado
+        assert gestor_contratos.listar_contratos_vencidos(storage, "2020-01-01", workers=2) == []
+    finally:
+        os.remove(path)
+
+
+def test_listar_contratos_vencidos_sin_shards_no_crea_procesos(monkeypatch):
+    import concurrent.futures
+
+    storage, path = _make_storage()
+    try:
+        _agregar_con_contratos(storage)
+        esperado = gestor_contratos.listar_contratos_vencidos(storage, "2024-06-01")
+
+        def sin_procesos(*args, **kwargs):
+            raise AssertionError("no se esperaba un pool de procesos")
+
+        monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", sin_procesos)
+        assert gestor_contratos.listar_contratos_vencidos(storage, "2024-06-01", workers=4) == esperado
+    finally:
+        os.remove(path)
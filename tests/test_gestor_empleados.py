@@ -3,8 +3,10 @@ import os
 import tempfile
 
 import pytest
+from click.testing import CliRunner
 
 from employee_manager import gestor_empleados
+from employee_manager.main import main
 from employee_manager.models import Employee
 from employee_manager.json_storage import JsonStorage
 
@@ -66,3 +68,77 @@ def test_get_update_delete_employee():
             gestor_empleados.delete_employee(storage, "nonexistent")
     finally:
         os.remove(path)
+
+
+def test_agregar_y_buscar_empleado():
+    storage, path = _make_storage()
+    try:
+        ana = gestor_empleados.agregar_empleado("Ana", "Desarrolladora", storage)
+        luis = gestor_empleados.agregar_empleado("Luis", "Diseñador", storage)
+        assert (ana["id"], luis["id"]) == (1, 2)
+
+        assert gestor_empleados.buscar_empleado(2, storage)["nombre"] == "Luis"
+        assert gestor_empleados.eliminar_empleado(1, storage) is True
+        assert gestor_empleados.buscar_empleado(1, storage) is None
+        assert gestor_empleados.eliminar_empleado(1, storage) is False
+    finally:
+        os.remove(path)
+
+
+def test_ids_de_empleados_eliminados_no_se_reutilizan():
+    storage, path = _make_storage()
+    try:
+        gestor_empleados.agregar_empleado("Ana", "Dev", storage)
+        luis = gestor_empleados.agregar_empleado("Luis", "QA", storage)
+        assert gestor_empleados.eliminar_empleado(luis["id"], storage) is True
+
+        eva = gestor_empleados.agregar_empleado("Eva", "Dev", storage)
+        assert eva["id"] == 3
+    finally:
+        os.remove(path)
+
+
+def test_consultar_empleados_y_comando_list_employees():
+    storage, path = _make_storage()
+    try:
+        for nombre, cargo in [("Ana", "Desarrollador"), ("Luis", "QA"), ("Andrés", "Desarrollador")]:
+            gestor_empleados.agregar_empleado(nombre, cargo, storage)
+
+        pagina = gestor_empleados.consultar_empleados(storage, cargo="Desarrollador", pagina=2, tamano_pagina=1)
+        assert [e["nombre"] for e in pagina] == ["Andrés"]
+        with pytest.raises(ValueError, match="página"):
+            gestor_empleados.consultar_empleados(storage, pagina=0)
+
+        resultado = CliRunner().invoke(main, [
+            "list-employees", "--file", path, "--cargo", "Desarrollador", "--sort", "-nombre", "--page", "1", "--page-size", "1",
+        ])
+        assert resultado.exit_code == 0, resultado.output
+        assert "Andrés" in resultado.output and "Ana" not in resultado.output
+    finally:
+        os.remove(path)
+
+
+def test_buscar_por_nombre_tolera_errores_de_tipeo():
+    storage, path = _make_storage()
+    try:
+        for nombre in ["Juan Pérez", "Juana Paz", "María López", "Pedro Juárez"]:
+            gestor_empleados.agregar_empleado(nombre, "Dev", storage)
+
+        resultados = gestor_empleados.buscar_por_nombre("jaun perez", storage)
+        assert resultados[0]["empleado"]["nombre"] == "Juan Pérez"
+        assert all(r["similitud"] >= 0.3 for r in resultados)
+        assert "María López" not in [r["empleado"]["nombre"] for r in resultados]
+        assert len(gestor_empleados.buscar_por_nombre("juan", storage, limit=1)) == 1
+
+        # El índice se mantiene al agregar y eliminar empleados
+        nuevo = gestor_empleados.agregar_empleado("Juan Peres", "QA", storage)
+        assert gestor_empleados.buscar_por_nombre("Juan Peres", storage)[0]["empleado"]["id"] == nuevo["id"]
+        gestor_empleados.eliminar_empleado(nuevo["id"], storage)
+        ids = [r["empleado"]["id"] for r in gestor_empleados.buscar_por_nombre("Juan Peres", storage)]
+        assert nuevo["id"] not in ids
+
+        resultado = CliRunner().invoke(main, ["search", "Maria Lopes", "--file", path])
+        assert resultado.exit_code == 0, resultado.output
+        assert "María López" in resultado.output
+    finally:
+        os.remove(path)
@@ -0,0 +1,46 @@
+"""Pruebas del costo de importación del paquete y del CLI."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import employee_manager
+
+# Tiempo máximo (segundos) que puede tardar `import employee_manager.main`
+PRESUPUESTO_IMPORTACION = 0.12
+
+# Módulos pesados que solo deben cargarse cuando un comando los usa
+MODULOS_DIFERIDOS = ("rich", "numpy", "asyncio", "sqlite3", "multiprocessing", "employee_manager.reportes")
+
+SRC = str(Path(employee_manager.__file__).resolve().parents[1])
+
+
+def _python(codigo: str, *opciones: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [SRC, os.environ.get("PYTHONPATH")]))}
+    return subprocess.run(
+        [sys.executable, *opciones, "-c", codigo], env=env, capture_output=True, text=True, check=True
+    )
+
+
+def test_importar_el_cli_no_carga_dependencias_pesadas():
+    salida = _python("import sys, employee_manager.main; print('\\n'.join(sys.modules))").stdout.split()
+    cargados = [m for m in MODULOS_DIFERIDOS if m in salida]
+    assert cargados == []
+
+
+def test_tiempo_de_importacion_del_cli():
+    tiempos = []
+    for _ in range(3):
+        informe = _python("import employee_manager.main", "-X", "importtime").stderr
+        linea = next(l for l in informe.splitlines() if l.rstrip().endswith("| employee_manager.main"))
+        tiempos.append(int(linea.split("|")[1]) / 1e6)
+    assert min(tiempos) < PRESUPUESTO_IMPORTACION, f"import employee_manager.main tardó {min(tiempos):.3f}s"
+
+
+def test_submodulos_se_cargan_al_accederlos():
+    assert "reportes" in dir(employee_manager)
+    assert employee_manager.reportes.obtener_empleados_con_contratos_vencidos
+    with pytest.raises(AttributeError):
+        employee_manager.inexistente
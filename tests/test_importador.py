@@ -0,0 +1,141 @@
+"""Pruebas para la importación masiva."""
+import csv
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from employee_manager.json_storage import JsonStorage
+from employee_manager.importador import importar_empleados, importar_contratos
+from employee_manager import gestor_empleados, importador
+from employee_manager.main import main
+
+
+def _write(path: Path, text: str) -> str:
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_importar_empleados_csv_por_lotes(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(os.path.join(tmp, "empleados.json"))
+        storage.add({"id": 7, "nombre": "Existente", "cargo": "CE", "contratos": []})
+        ruta = _write(Path(tmp, "emps.csv"), "nombre,cargo\nAna,Dev\n,Dev\nLuis,QA\nEva,\nMia,PM\n")
+
+        saves = []
+        original_save = storage.save_json
+        monkeypatch.setattr(storage, "save_json", lambda data: saves.append(1) or original_save(data))
+        resultado = importar_empleados(ruta, storage, tamano_lote=2)
+
+        assert resultado["filas"] == 5
+        assert resultado["importadas"] == 3
+        assert [e["fila"] for e in resultado["errores"]] == [3, 5]
+        assert len(saves) == 3
+        assert [(e["id"], e["nombre"]) for e in storage.get_all()[1:]] == [(8, "Ana"), (9, "Luis"), (10, "Mia")]
+
+
+def test_importar_contratos_jsonl_valida_cada_fila():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(os.path.join(tmp, "empleados.json"))
+        storage.add({"id": 1, "nombre": "Ana", "cargo": "Dev", "contratos": []})
+        filas = [
+            {"id_empleado": 1, "fecha_inicio": "2024-01-01", "fecha_fin": "2024-12-31", "salario": 3000},
+            {"id_empleado": 2, "fecha_inicio": "2024-01-01", "fecha_fin": "2024-12-31", "salario": 3000},
+            {"id_empleado": 1, "fecha_inicio": "2024-05-01", "fecha_fin": "2024-01-01", "salario": 3000},
+            {"id_empleado": 1, "fecha_inicio": "2025-01-01", "fecha_fin": "2025-12-31", "salario": "x"},
+            {"id_empleado": 1, "fecha_inicio": "2025-01-01", "fecha_fin": "2025-12-31", "salario": 3500},
+        ]
+        ruta = _write(Path(tmp, "contratos.jsonl"), "\n".join(json.dumps(f) for f in filas) + "\nno-json\n")
+
+        resultado = importar_contratos(ruta, storage, tamano_lote=10)
+
+        assert resultado["importadas"] == 2
+        assert [e["fila"] for e in resultado["errores"]] == [2, 3, 4, 6]
+        contratos = storage.get_by_id(1)["contratos"]
+        assert [c["id_contrato"] for c in contratos] == [101, 102]
+
+
+def test_importar_empleados_reporta_tipos_y_json_invalidos_por_fila():
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = JsonStorage(os.path.join(tmp, "empleados.json"))
+        lineas = [
+            json.dumps({"nombre": "Ana", "cargo": "Dev"}),
+            json.dumps({"nombre": 123, "cargo": "Dev"}),
+            json.dumps({"nombre": "Luis", "cargo": ["QA"]}),
+            "{no-json",
+            json.dumps(["Eva", "PM"]),
+            json.dumps({"nombre": "Mia", "cargo": "PM"}),
+        ]
+        ruta = _write(Path(tmp, "emps.jsonl"), "\n".join(lineas) + "\n")
+
+        resultado = importar_empleados(ruta, storage)
+
+        assert resultado["filas"] == 6
+        assert resultado["importadas"] == 2
+        errores = {e["fila"]: e["error"] for e in resultado["errores"]}
+        assert errores[2] == "El nombre debe ser texto"
+        assert errores[3] == "El cargo debe ser texto"
+        assert errores[4].startswith("JSON inválido")
+        assert errores[5].startswith("JSON inválido")
+        assert [e["nombre"] for e in storage.get_all()] == ["Ana", "Mia"]
+
+
+def test_import_command_reports_rate_and_error_file():
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmp:
+        emp_file = os.path.join(tmp, "empleados.json")
+        emps = _write(Path(tmp, "emps.csv"), "nombre,cargo\nAna,Dev\nLuis,\n")
+        contratos = _write(Path(tmp, "contratos.csv"), "id_empleado,fecha_inicio,fecha_fin,salario\n1,2024-01-01,2024-06-30,2500\n")
+        errores = os.path.join(tmp, "errores.csv")
+
+        res = runner.invoke(main, [
+            "import", "--employees", emps, "--contracts", contratos,
+            "--file", emp_file, "--errors", errores,
+        ])
+
+        assert res.exit_code == 0, res.output
+        assert "filas/s" in res.output
+        assert len(JsonStorage(emp_file).get_by_id(1)["contratos"]) == 1
+        with open(errores, encoding="utf-8") as fh:
+            assert [r["fila"] for r in csv.DictReader(fh)] == ["3"]
+
+
+def test_import_retries_batch_after_concurrent_write(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "empleados.json")
+        storage = JsonStorage(path)
+        otro = JsonStorage(path)
+        emps = _write(Path(tmp, "emps.csv"), "nombre,cargo\nAna,Dev\nLuis,QA\n")
+        contratos = _write(Path(tmp, "contratos.jsonl"), json.dumps({
+            "id_empleado": 1, "fecha_inicio": "2024-01-01", "fecha_fin": "2024-12-31", "salario": 3000,
+        }) + "\n")
+
+        # Otro proceso escribe mientras el primer intento de cada importación está abierto
+        pendientes = {"empleados": "Bea", "contratos": "Eva"}
+        original_get_next_id = importador._get_next_id
+        original_asociar = importador.asociar_contrato
+
+        def escribir_concurrente(importacion):
+            nombre = pendientes.pop(importacion, None)
+            if nombre:
+                gestor_empleados.agregar_empleado(nombre, "Ops", otro)
+
+        monkeypatch.setattr(
+            importador, "_get_next_id",
+            lambda s, cantidad=1: escribir_concurrente("empleados") or original_get_next_id(s, cantidad),
+        )
+        monkeypatch.setattr(
+            importador, "asociar_contrato",
+            lambda *args: escribir_concurrente("contratos") or original_asociar(*args),
+        )
+
+        assert importar_empleados(emps, storage)["importadas"] == 2
+        resultado = importar_contratos(contratos, storage)
+        assert resultado["importadas"] == 1
+        assert resultado["errores"] == []
+
+        final = JsonStorage(path, cache=False).get_all()
+        assert [(e["id"], e["nombre"]) for e in final] == [(1, "Bea"), (2, "Ana"), (3, "Luis"), (4, "Eva")]
+        assert [c["id_contrato"] for c in final[0]["contratos"]] == [101]
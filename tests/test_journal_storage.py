@@ -0,0 +1,217 @@
+"""Pruebas para JournalStorage."""
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from employee_manager.journal_storage import JournalStorage
+from employee_manager.concurrencia import ConflictoDeVersion
+from employee_manager import gestor_empleados, gestor_contratos
+
+
+def _make_storage(**kwargs):
+    tmpdir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmpdir.name, "empleados.json")
+    return JournalStorage(path, **kwargs), path, tmpdir
+
+
+def test_mutations_append_to_journal_without_rewriting_snapshot():
+    storage, path, tmpdir = _make_storage()
+    try:
+        storage.add({"id": 1, "nombre": "Ana"})
+        storage.add({"id": 2, "nombre": "Luis"})
+        storage.update(1, {"nombre": "Ana Maria"})
+        storage.delete(2)
+
+        assert not os.path.exists(path)
+        with open(path + ".journal", encoding="utf-8") as fh:
+            ops = [json.loads(line)["op"] for line in fh]
+        assert ops == ["add", "add", "update", "delete"]
+
+        # Una instancia nueva reproduce la bitácora
+        reopened = JournalStorage(path)
+        assert reopened.get_all() == [{"id": 1, "nombre": "Ana Maria"}]
+    finally:
+        tmpdir.cleanup()
+
+
+def test_compaction_writes_snapshot_and_clears_journal():
+    storage, path, tmpdir = _make_storage(compact_every=3)
+    try:
+        for i in range(1, 5):
+            storage.add({"id": i, "nombre": f"Empleado {i}"})
+
+        with open(path, encoding="utf-8") as fh:
+            snapshot = json.load(fh)
+        assert [r["id"] for r in snapshot["empleados"]] == [1, 2, 3]
+        assert snapshot["meta"]["journal_seq"] == 3
+
+        reopened = JournalStorage(path)
+        assert [r["id"] for r in reopened.get_all()] == [1, 2, 3, 4]
+    finally:
+        tmpdir.cleanup()
+
+
+def test_replay_skips_entries_already_in_snapshot_and_torn_tail():
+    storage, path, tmpdir = _make_storage()
+    try:
+        storage.add({"id": 1, "nombre": "Ana"})
+        with open(path + ".journal", encoding="utf-8") as fh:
+            journal = fh.read()
+        storage.compact()
+
+        # Simular una compactación interrumpida antes de borrar la bitácora,
+        # seguida de una escritura incompleta
+        with open(path + ".journal", "w", encoding="utf-8") as fh:
+            fh.write(journal + '{"seq": 2, "op": "add"')
+
+        assert JournalStorage(path).get_all() == [{"id": 1, "nombre": "Ana"}]
+    finally:
+        tmpdir.cleanup()
+
+
+def test_append_after_torn_tail_is_not_lost_on_reopen():
+    storage, path, tmpdir = _make_storage()
+    try:
+        gestor_empleados.agregar_empleado("Ana", "Desarrolladora", storage)
+        # Un proceso que se interrumpió a mitad de una escritura
+        with open(path + ".journal", "a", encoding="utf-8") as fh:
+            fh.write('{"seq": 3, "op": "reservar", "secuen')
+
+        writer = JournalStorage(path)
+        gestor_empleados.agregar_empleado("Luis", "Analista", writer)
+        assert [e["nombre"] for e in writer.get_all()] == ["Ana", "Luis"]
+
+        reopened = JournalStorage(path)
+        assert [(e["id"], e["nombre"]) for e in reopened.get_all()] == [(1, "Ana"), (2, "Luis")]
+        gestor_empleados.agregar_empleado("Eva", "QA", reopened)
+        assert [e["id"] for e in JournalStorage(path).get_all()] == [1, 2, 3]
+        with open(path + ".journal", encoding="utf-8") as fh:
+            assert [json.loads(line)["seq"] for line in fh] == [1, 2, 3, 4, 5, 6]
+    finally:
+        tmpdir.cleanup()
+
+
+def test_reader_applies_only_new_entries_and_keeps_indexes(monkeypatch):
+    storage, path, tmpdir = _make_storage()
+    try:
+        escritor = JournalStorage(path)
+        for nombre, cargo in [("Ana", "Dev"), ("Luis", "QA"), ("Eva", "Dev")]:
+            gestor_empleados.agregar_empleado(nombre, cargo, escritor)
+        assert [e["nombre"] for e in storage.query(cargo="Dev")] == ["Ana", "Eva"]
+        documento = storage.load_json()
+
+        escritor.update(1, {"cargo": "QA"})
+        escritor.delete(3)
+        gestor_empleados.agregar_empleado("Bea", "Dev", escritor)
+
+        # Solo se parsean las entradas nuevas, sobre el documento en memoria
+        parseadas = []
+        original_loads = json.loads
+        monkeypatch.setattr(json, "loads", lambda s, **kw: parseadas.append(1) or original_loads(s, **kw))
+        assert [e["nombre"] for e in storage.query(cargo="Dev")] == ["Bea"]
+        assert [e["nombre"] for e in storage.query(cargo="QA")] == ["Ana", "Luis"]
+        assert storage.load_json() is documento
+        assert len(parseadas) == 4
+    finally:
+        tmpdir.cleanup()
+
+
+def test_managers_work_on_journal_storage():
+    storage, path, tmpdir = _make_storage()
+    try:
+        emp = gestor_empleados.agregar_empleado("Ana", "Desarrolladora", storage)
+        gestor_contratos.asociar_contrato(emp["id"], "2024-01-01", "2024-12-31", 3000, storage)
+
+        reopened = JournalStorage(path)
+        encontrado = gestor_empleados.buscar_empleado(emp["id"], reopened)
+        assert encontrado["contratos"][0]["id_contrato"] == 101
+
+        with pytest.raises(ValueError, match="ya existe"):
+            reopened.add({"id": emp["id"], "nombre": "Otra"})
+    finally:
+        tmpdir.cleanup()
+
+
+def test_batch_appends_all_operations_in_one_write():
+    storage, path, tmpdir = _make_storage()
+    try:
+        with storage.batch():
+            for i in range(1, 4):
+                gestor_empleados.agregar_empleado(f"Empleado {i}", "Analista", storage)
+
+        with open(path + ".journal", encoding="utf-8") as fh:
+            entradas = [json.loads(line) for line in fh]
+        assert [e["seq"] for e in entradas] == [1, 2, 3, 4, 5, 6]
+        assert [e["op"] for e in entradas] == ["reservar", "add"] * 3
+        assert [r["id"] for r in JournalStorage(path).get_all()] == [1, 2, 3]
+
+        with pytest.raises(ValueError):
+            with storage.batch():
+                storage.add({"id": 4, "nombre": "Temporal"})
+                storage.add({"id": 1, "nombre": "Duplicado"})
+        assert [r["id"] for r in storage.get_all()] == [1, 2, 3]
+    finally:
+        tmpdir.cleanup()
+
+
+def test_concurrent_append_from_stale_sequence_raises_conflict():
+    storage, path, tmpdir = _make_storage()
+    try:
+        otro = JournalStorage(path)
+        storage.add({"id": 1, "nombre": "Ana"})
+        with pytest.raises(ConflictoDeVersion):
+            with storage.batch():
+                storage.add({"id": 2, "nombre": "Luis"})
+                otro.add({"id": 3, "nombre": "Eva"})
+
+        assert [r["id"] for r in JournalStorage(path).get_all()] == [1, 3]
+        storage.add({"id": 2, "nombre": "Luis"})
+        assert [r["id"] for r in JournalStorage(path).get_all()] == [1, 3, 2]
+    finally:
+        tmpdir.cleanup()
+
+
+def test_compressed_snapshot_with_plain_journal():
+    storage, path, tmpdir = _make_storage(compact_every=3, formato="gzip")
+    try:
+        for i in range(1, 5):
+            storage.add({"id": i, "nombre": f"Empleado {i}"})
+
+        with open(path, "rb") as fh:
+            assert fh.read(2) == b"\x1f\x8b"
+        with open(path + ".journal", encoding="utf-8") as fh:
+            assert [json.loads(line)["seq"] for line in fh] == [4]
+
+        reopened = JournalStorage(path)
+        assert [r["id"] for r in reopened.get_all()] == [1, 2, 3, 4]
+        # Sin indicar formato, la compactación conserva la compresión
+        reopened.compact()
+        with open(path, "rb") as fh:
+            assert fh.read(2) == b"\x1f\x8b"
+    finally:
+        tmpdir.cleanup()
+
+
+def _agregar_en_proceso(path):
+    storage = JournalStorage(path, compact_every=25)
+    ids = [gestor_empleados.agregar_empleado(f"Empleado {i}", "Dev", storage)["id"] for i in range(10)]
+    for id_empleado in ids:
+        gestor_contratos.asociar_contrato(id_empleado, "2024-01-01", "2024-12-31", 1000, storage)
+    return ids
+
+
+def test_concurrent_processes_do_not_lose_journal_writes():
+    storage, path, tmpdir = _make_storage()
+    try:
+        with ProcessPoolExecutor(max_workers=6) as executor:
+            ids = [i for parte in executor.map(_agregar_en_proceso, [path] * 6) for i in parte]
+
+        empleados = JournalStorage(path).get_all()
+        assert sorted(ids) == list(range(1, 61))
+        assert sorted(e["id"] for e in empleados) == list(range(1, 61))
+        assert sorted(c["id_contrato"] for e in empleados for c in e["contratos"]) == list(range(101, 161))
+    finally:
+        tmpdir.cleanup()
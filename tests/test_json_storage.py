@@ -1,5 +1,10 @@
 """Pruebas para JsonStorage."""
+from concurrent.futures import ProcessPoolExecutor
+
 from employee_manager.json_storage import JsonStorage
+from employee_manager import json_storage
+from employee_manager.concurrencia import ConflictoDeVersion
+from employee_manager import gestor_empleados, gestor_contratos
 import tempfile
 import os
 import json
@@ -176,3 +181,482 @@ def test_delete_nonexistent_raises():
     finally:
         if os.path.exists(path):
             os.remove(path)
+
+
+def test_cache_reuses_parsed_document(monkeypatch):
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".json")
+    path = temp_file.name
+    temp_file.close()
+
+    try:
+        storage = JsonStorage(path)
+        storage.add({"id": 1, "nombre": "Ana"})
+
+        calls = []
+        original_loads = json.loads
+        monkeypatch.setattr(json, "loads", lambda s, **kw: calls.append(1) or original_loads(s, **kw))
+        storage.get_all()
+        storage.update(1, {"nombre": "Ana Maria"})
+        storage.get_all()
+        assert calls == []
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def test_cache_reloads_when_file_changes():
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".json")
+    path = temp_file.name
+    temp_file.close()
+
+    try:
+        storage = JsonStorage(path)
+        storage.add({"id": 1, "nombre": "Ana"})
+        assert len(storage.get_all()) == 1
+
+        # Otro proceso reescribe el archivo
+        JsonStorage(path, cache=False).add({"id": 2, "nombre": "Luis"})
+        assert [r["id"] for r in storage.get_all()] == [1, 2]
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def test_cache_disabled_rereads_file(monkeypatch):
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".json")
+    path = temp_file.name
+    temp_file.close()
+
+    try:
+        storage = JsonStorage(path, cache=False)
+        storage.add({"id": 1, "nombre": "Ana"})
+
+        calls = []
+        original_loads = json.loads
+        monkeypatch.setattr(json, "loads", lambda s, **kw: calls.append(1) or original_loads(s, **kw))
+        storage.get_all()
+        storage.get_all()
+        assert len(calls) == 2
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def test_get_by_id_follows_add_update_delete():
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".json")
+    path = temp_file.name
+    temp_file.close()
+
+    try:
+        storage = JsonStorage(path)
+        storage.add({"id": 1, "nombre": "Ana"})
+        storage.add({"id": 2, "nombre": "Luis"})
+        storage.add({"id": 3, "nombre": "Eva"})
+        assert storage.get_by_id(2)["nombre"] == "Luis"
+
+        storage.update(3, {"nombre": "Eva Maria"})
+        assert storage.get_by_id(3)["nombre"] == "Eva Maria"
+
+        storage.delete(1)
+        assert storage.get_by_id(1) is None
+        assert storage.get_by_id(3)["nombre"] == "Eva Maria"
+        assert storage.get_by_id(99) is None
+
+        # Una instancia sin caché ve el mismo estado
+        assert JsonStorage(path, cache=False).get_by_id(2)["nombre"] == "Luis"
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@pytest.mark.parametrize("cache", [True, False])
+def test_batch_writes_once_on_exit(monkeypatch, cache):
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".json")
+    path = temp_file.name
+    temp_file.close()
+
+    try:
+        storage = JsonStorage(path, cache=cache)
+        saves = []
+        original_save = storage.save_json
+        monkeypatch.setattr(storage, "save_json", lambda data: saves.append(1) or original_save(data))
+
+        with storage.batch():
+            for i in range(1, 51):
+                storage.add({"id": i, "nombre": f"Empleado {i}"})
+            storage.update(1, {"nombre": "Primero"})
+            storage.delete(50)
+            assert storage.get_by_id(1)["nombre"] == "Primero"
+
+        assert len(saves) == 1
+        reloaded = JsonStorage(path, cache=False).get_all()
+        assert len(reloaded) == 49
+        assert reloaded[0]["nombre"] == "Primero"
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@pytest.mark.parametrize("cache", [True, False])
+def test_batch_discards_changes_on_exception(cache):
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".json")
+    path = temp_file.name
+    temp_file.close()
+
+    try:
+        storage = JsonStorage(path, cache=cache)
+        storage.add({"id": 1, "nombre": "Ana"})
+
+        with pytest.raises(RuntimeError):
+            with storage.batch():
+                storage.add({"id": 2, "nombre": "Luis"})
+                with storage.batch():
+                    storage.update(1, {"nombre": "Cambiada"})
+                raise RuntimeError("fallo en medio del lote")
+
+        assert storage.get_all() == [{"id": 1, "nombre": "Ana"}]
+        assert storage.get_by_id(2) is None
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@pytest.mark.parametrize("tamano_bloque", [1, 7, 64, 1 << 16])
+@pytest.mark.parametrize("documento", [
+    {"meta": {"version": 12345, "etiquetas": ["a", "]"]}, "empleados": [
+        {"id": 1, "nombre": "Ana \"la\" Núñez", "cargo": "Dev", "contratos": [
+            {"id_contrato": 101, "fecha_inicio": "2024-01-01", "fecha_fin": "2024-12-31", "salario": 3000.5},
+        ]},
+        {"id": 2, "nombre": "Luis {[,]}", "cargo": "QA", "contratos": []},
+    ]},
+    [{"id": 10, "nombre": "Lista antigua"}],
+    {"empleados": []},
+])
+def test_iter_empleados_matches_full_parse(documento, tamano_bloque):
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".json")
+    path = temp_file.name
+    temp_file.close()
+
+    try:
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(documento, fh, ensure_ascii=False, indent=2)
+        storage = JsonStorage(path)
+        assert list(storage.iter_empleados(tamano_bloque)) == JsonStorage(path, cache=False).get_all()
+        # La iteración incremental no llena la caché
+        assert storage._cache_data is None
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def test_iter_empleados_invalid_or_missing_file():
+    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".json")
+    path = temp_file.name
+    temp_file.close()
+
+    try:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write('{"empleados": [{"id": 1}, {"id": ')
+        assert list(JsonStorage(path).iter_empleados(4)) == [{"id": 1}]
+        os.remove(path)
+        assert list(JsonStorage(path).iter_empleados()) == []
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def test_write_based_on_stale_version_raises_conflict():
+    tmpdir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmpdir.name, "empleados.json")
+    try:
+        primero = JsonStorage(path)
+        segundo = JsonStorage(path)
+        primero.add({"id": 1, "nombre": "Ana"})
+        assert segundo.get_all() == [{"id": 1, "nombre": "Ana"}]
+
+        # El primero lee la versión 1 y el segundo escribe antes de que confirme
+        with pytest.raises(ConflictoDeVersion):
+            with primero.batch():
+                primero.add({"id": 3, "nombre": "Eva"})
+                segundo.add({"id": 2, "nombre": "Luis"})
+        with open(path, encoding="utf-8") as fh:
+            assert next(iter(json.load(fh))) == "meta"
+
+        # El conflicto descarta la caché: al repetir se parte de los datos actuales
+        primero.add({"id": 3, "nombre": "Eva"})
+        assert [r["id"] for r in JsonStorage(path).get_all()] == [1, 2, 3]
+        assert JsonStorage(path).load_json()["meta"]["version"] == 3
+    finally:
+        tmpdir.cleanup()
+
+
+def _agregar_en_proceso(path):
+    storage = JsonStorage(path)
+    ids = [gestor_empleados.agregar_empleado(f"Empleado {i}", "Dev", storage)["id"] for i in range(5)]
+    for id_empleado in ids:
+        gestor_contratos.asociar_contrato(id_empleado, "2024-01-01", "2024-12-31", 1000, storage)
+    return ids
+
+
+def test_concurrent_processes_do_not_lose_writes():
+    tmpdir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmpdir.name, "empleados.json")
+    try:
+        with ProcessPoolExecutor(max_workers=8) as executor:
+            ids = [i for parte in executor.map(_agregar_en_proceso, [path] * 8) for i in parte]
+
+        empleados = JsonStorage(path).get_all()
+        assert sorted(ids) == list(range(1, 41))
+        assert sorted(e["id"] for e in empleados) == list(range(1, 41))
+        assert all(len(e["contratos"]) == 1 for e in empleados)
+    finally:
+        tmpdir.cleanup()
+
+
+def test_reservar_ids_persists_sequences_in_meta():
+    tmpdir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmpdir.name, "empleados.json")
+    try:
+        # Documento anterior a las secuencias: el primer valor sale de un recorrido
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"empleados": [{"id": 7, "contratos": [{"id_contrato": 130}]}, {"id": "x"}]}, fh)
+        storage = JsonStorage(path)
+        assert storage.reservar_ids("next_id", 5) == 8
+        assert storage.reservar_ids("next_id") == 13
+        assert storage.reservar_ids("next_contract_id") == 131
+
+        storage.delete(7)
+        reabierto = JsonStorage(path)
+        assert reabierto.load_json()["meta"]["next_id"] == 14
+        assert reabierto.reservar_ids("next_id") == 14
+        assert JsonStorage(os.path.join(tmpdir.name, "vacio.json")).reservar_ids("next_contract_id") == 101
+
+        with pytest.raises(ValueError, match="Secuencia"):
+            storage.reservar_ids("otra")
+        with pytest.raises(ValueError, match="al menos 1"):
+            storage.reservar_ids("next_id", 0)
+    finally:
+        tmpdir.cleanup()
+
+
+def _empleados_de_consulta():
+    return [
+        {"id": 1, "nombre": "ana", "cargo": "Desarrollador"},
+        {"id": 2, "nombre": "Luis", "cargo": "QA"},
+        {"id": 3, "nombre": "Andrés", "cargo": "Desarrollador"},
+        {"id": 4, "nombre": "Beatriz", "cargo": "Desarrollador"},
+        {"id": 5, "nombre": "Anabel", "cargo": "QA"},
+    ]
+
+
+def test_query_filters_sorts_and_paginates_with_indexes():
+    tmpdir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmpdir.name, "empleados.json")
+    try:
+        storage = JsonStorage(path)
+        with storage.batch():
+            for empleado in _empleados_de_consulta():
+                storage.add(empleado)
+
+        def ids(**kwargs):
+            return [e["id"] for e in storage.query(**kwargs)]
+
+        assert ids() == [1, 2, 3, 4, 5]
+        assert ids(cargo="Desarrollador") == [1, 3, 4]
+        assert ids(cargo="Desarrollador", limit=2, offset=1) == [3, 4]
+        assert ids(nombre_prefix="AN") == [1, 3, 5]
+        assert ids(nombre_prefix="AN", order_by="nombre") == [1, 5, 3]
+        assert ids(nombre_prefix="an", cargo="QA") == [5]
+        assert ids(order_by="-nombre") == [2, 4, 3, 5, 1]
+        assert ids(order_by="cargo", limit=3) == [1, 3, 4]
+        assert ids(cargo="Gerente") == []
+
+        # Los índices se mantienen con cada add/update/delete
+        indices = dict(storage._secundarios)
+        storage.update(4, {"cargo": "QA", "nombre": "Ángela"})
+        storage.delete(1)
+        storage.add({"id": 6, "nombre": "Anita", "cargo": "Desarrollador"})
+        assert ids(cargo="Desarrollador") == [3, 6]
+        assert ids(cargo="QA") == [2, 4, 5]
+        assert ids(nombre_prefix="an", order_by="nombre") == [5, 3, 6]
+        assert all(storage._secundarios[k] is v for k, v in indices.items())
+
+        with pytest.raises(ValueError, match="ordenar"):
+            storage.query(order_by="salario")
+        with pytest.raises(ValueError, match="negativos"):
+            storage.query(limit=-1)
+    finally:
+        tmpdir.cleanup()
+
+
+@pytest.mark.parametrize("formato,cabecera", [
+    ("pretty", b"{\n"),
+    ("compact", b'{"'),
+    ("gzip", b"\x1f\x8b"),
+    ("zlib", b"\x78\x9c"),
+])
+def test_formats_round_trip_and_are_detected_on_load(formato, cabecera):
+    tmpdir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmpdir.name, "empleados.json")
+    try:
+        storage = JsonStorage(path, formato=formato)
+        for i in range(1, 21):
+            storage.add({"id": i, "nombre": f"Empleado {i}", "cargo": "Dev", "contratos": []})
+        with open(path, "rb") as fh:
+            assert fh.read(2) == cabecera
+
+        # Sin indicar formato se detecta al leer y se conserva al escribir
+        otro = JsonStorage(path, cache=False)
+        assert [e["id"] for e in otro.get_all()] == list(range(1, 21))
+        assert [e["id"] for e in otro.iter_empleados(tamano_bloque=16)] == list(range(1, 21))
+        otro.delete(20)
+        with open(path, "rb") as fh:
+            assert fh.read(2) == cabecera
+        assert otro.load_json()["meta"]["version"] == 21
+
+        # Una escritura concurrente se detecta leyendo solo 'meta' del archivo
+        with pytest.raises(ConflictoDeVersion):
+            with storage.batch():
+                storage.delete(19)
+                otro.delete(18)
+    finally:
+        tmpdir.cleanup()
+
+
+def test_format_can_be_converted_and_compression_shrinks_file():
+    tmpdir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmpdir.name, "empleados.json")
+    try:
+        storage = JsonStorage(path)
+        for i in range(1, 101):
+            storage.add({"id": i, "nombre": f"Empleado {i}", "cargo": "Dev", "contratos": []})
+        tamanos = {"pretty": os.path.getsize(path)}
+        for formato in ("compact", "gzip"):
+            JsonStorage(path, formato=formato).update(1, {"cargo": "QA"})
+            tamanos[formato] = os.path.getsize(path)
+        assert tamanos["gzip"] < tamanos["compact"] < tamanos["pretty"]
+
+        JsonStorage(path, formato="pretty").update(1, {"cargo": "Dev"})
+        with open(path, encoding="utf-8") as fh:
+            assert "formato" not in json.load(fh)["meta"]
+        with pytest.raises(ValueError, match="Formato"):
+            JsonStorage(path, formato="bz2")
+    finally:
+        tmpdir.cleanup()
+
+
+@pytest.mark.parametrize("formato", ["pretty", "compact"])
+def test_saves_reencode_only_changed_employees(monkeypatch, formato):
+    tmpdir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmpdir.name, "empleados.json")
+    referencia = os.path.join(tmpdir.name, "referencia.json")
+
+    def assert_igual_a_serializacion_completa():
+        # Los fragmentos empalmados dan los mismos bytes que codificar todo el documento
+        with open(path, "rb") as fh:
+            contenido = fh.read()
+        JsonStorage(referencia, cache=False, formato=formato).save_json(json.loads(contenido))
+        with open(referencia, "rb") as fh:
+            assert contenido == fh.read()
+
+    try:
+        storage = JsonStorage(path, formato=formato)
+        with storage.batch():
+            for i in range(1, 51):
+                storage.add({
+                    "id": i,
+                    "nombre": f"Empleado Ñandú {i}",
+                    "cargo": "Dev",
+                    "contratos": [{"id_contrato": 100 + i, "fecha_fin": None, "salario": 1000.5}],
+                    "extra": {},
+                })
+        assert_igual_a_serializacion_completa()
+
+        codificados = []
+        original = json_storage._codificar_empleado
+        monkeypatch.setattr(
+            json_storage,
+            "_codificar_empleado",
+            lambda empleado, f: codificados.append(empleado["id"]) or original(empleado, f),
+        )
+        gestor_contratos.asociar_contrato(7, "2024-01-01", "2025-01-01", 2000.0, storage)
+        assert codificados == [7]
+        assert_igual_a_serializacion_completa()
+
+        codificados.clear()
+        storage.add({"id": 51, "nombre": "Nuevo", "cargo": "QA", "contratos": []})
+        storage.delete(3)
+        assert codificados == [51]
+        assert_igual_a_serializacion_completa()
+
+        # Sin caché del documento no hay fragmentos que reutilizar
+        codificados.clear()
+        storage.invalidate_cache()
+        storage.update(8, {"cargo": "QA"})
+        assert len(codificados) == 50
+        assert_igual_a_serializacion_completa()
+        assert [e["cargo"] for e in JsonStorage(path, cache=False).get_all() if e["id"] in (7, 8)] == ["Dev", "QA"]
+    finally:
+        tmpdir.cleanup()
+
+
+def test_fragments_follow_reloads_and_added_records_are_copied():
+    tmpdir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmpdir.name, "empleados.json")
+    try:
+        storage = JsonStorage(path)
+        ana = gestor_empleados.agregar_empleado("Ana", "Dev", storage)
+        gestor_empleados.agregar_empleado("Luis", "Dev", storage)
+        assert storage._fragmentos
+
+        # Modificar el registro retornado no cambia el documento ni el archivo
+        ana["cargo"] = "QA"
+        storage.update(2, {"cargo": "QA"})
+        assert storage.get_by_id(1)["cargo"] == "Dev"
+        with open(path, encoding="utf-8") as fh:
+            assert [e["cargo"] for e in json.load(fh)["empleados"]] == ["Dev", "QA"]
+
+        # Releer un archivo modificado por otro proceso descarta los fragmentos viejos
+        JsonStorage(path, cache=False).update(1, {"cargo": "Ops"})
+        assert storage.get_by_id(1)["cargo"] == "Ops"
+        assert storage._fragmentos == {}
+        storage.update(2, {"cargo": "Dev"})
+        assert set(storage._fragmentos) == {id(e) for e in storage.get_all()}
+
+        # Las listas pasadas a update tampoco quedan compartidas con el documento
+        contratos = [{"id_contrato": 101, "salario": 1000}]
+        storage.update(1, {"contratos": contratos})
+        contratos.append({"id_contrato": 102, "salario": 2000})
+        contratos[0]["salario"] = 5000
+        storage.update(2, {"cargo": "QA"})
+        with open(path, encoding="utf-8") as fh:
+            assert json.load(fh)["empleados"][0]["contratos"] == [{"id_contrato": 101, "salario": 1000}]
+        assert storage.get_by_id(1)["contratos"] == [{"id_contrato": 101, "salario": 1000}]
+    finally:
+        tmpdir.cleanup()
+
+
+def test_version_check_on_legacy_file_reads_only_first_block():
+    tmpdir = tempfile.TemporaryDirectory()
+    path = os.path.join(tmpdir.name, "empleados.json")
+    try:
+        empleados = [{"id": i, "nombre": f"Empleado {i}", "cargo": "Dev", "contratos": []} for i in range(1, 5001)]
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"empleados": empleados}, fh, indent=2)
+
+        leidos = []
+        with open(path, encoding="utf-8") as fh:
+            original_read = fh.read
+            fh.read = lambda n=-1: leidos.append(n) or original_read(n)
+            assert json_storage._leer_meta(fh) == {}
+        assert len(leidos) == 1
+
+        storage = JsonStorage(path)
+        assert gestor_empleados.agregar_empleado("Ana", "Dev", storage)["id"] == 5001
+        with open(path, encoding="utf-8") as fh:
+            documento = json.load(fh)
+        assert list(documento)[0] == "meta"
+        assert documento["meta"]["version"] == 1
+        assert len(documento["empleados"]) == 5001
+    finally:
+        tmpdir.cleanup()
@@ -28,3 +28,111 @@ def test_init_db_and_list_commands():
         assert res3.exit_code == 0
     finally:
         tmpdir.cleanup()
+
+
+def _make_employees_file(tmpdir, cantidad):
+    from employee_manager import gestor_empleados
+    from employee_manager.json_storage import JsonStorage
+
+    path = str(Path(tmpdir, "empleados.json"))
+    storage = JsonStorage(path)
+    for i in range(1, cantidad + 1):
+        gestor_empleados.agregar_empleado(f"Empleado {i}", "Dev" if i % 2 else "QA", storage)
+    return path
+
+
+def test_list_employees_formats():
+    import json
+
+    runner = CliRunner()
+    tmpdir = tempfile.TemporaryDirectory()
+    try:
+        path = _make_employees_file(tmpdir.name, 3)
+
+        res = runner.invoke(main, ["list-employees", "--file", path, "--format", "jsonl"])
+        assert res.exit_code == 0, res.output
+        assert [json.loads(linea)["id"] for linea in res.output.splitlines()] == [1, 2, 3]
+
+        res = runner.invoke(main, ["list-employees", "--file", path, "--format", "csv", "--cargo", "Dev"])
+        assert res.output.splitlines() == ["id,nombre,cargo,contratos", "1,Empleado 1,Dev,0", "3,Empleado 3,Dev,0"]
+
+        res = runner.invoke(main, ["list-employees", "--file", path, "--format", "tsv", "--page", "2", "--page-size", "2"])
+        assert res.output.splitlines() == ["id\tnombre\tcargo\tcontratos", "3\tEmpleado 3\tDev\t0"]
+    finally:
+        tmpdir.cleanup()
+
+
+def test_list_employees_prints_one_table_per_page():
+    runner = CliRunner()
+    tmpdir = tempfile.TemporaryDirectory()
+    try:
+        path = _make_employees_file(tmpdir.name, 5)
+        res = runner.invoke(main, ["list-employees", "--file", path, "--page-size", "2"])
+        assert res.exit_code == 0, res.output
+        # Tres tablas (2 + 2 + 1 filas), cada una con su cabecera
+        assert res.output.count("Nombre") == 3
+        assert all(f"Empleado {i}" in res.output for i in range(1, 6))
+    finally:
+        tmpdir.cleanup()
+
+
+def test_employees_table_is_printed_before_reading_everything():
+    import pytest
+    from employee_manager import main as cli
+
+    def empleados():
+        yield {"id": 1, "nombre": "Ana", "cargo": "Dev"}
+        yield {"id": 2, "nombre": "Luis", "cargo": "QA"}
+        raise RuntimeError("no debería leerse antes de imprimir la primera tabla")
+
+    with cli.console.capture() as captura:
+        with pytest.raises(RuntimeError):
+            cli._print_employees_table(None, empleados(), filas_por_tabla=2)
+    assert "Ana" in captura.get() and "Luis" in captura.get()
+
+
+def test_init_db_format_creates_compressed_store():
+    import gzip
+
+    from employee_manager.main import FORMATOS_ARCHIVO
+    from employee_manager.json_storage import FORMATOS, JsonStorage
+
+    assert FORMATOS_ARCHIVO == FORMATOS
+    runner = CliRunner()
+    tmpdir = tempfile.TemporaryDirectory()
+    try:
+        res = runner.invoke(main, ["init-db", "--data-dir", tmpdir.name, "--format", "gzip"])
+        assert res.exit_code == 0, res.output
+        path = Path(tmpdir.name, "empleados.json")
+        assert gzip.decompress(path.read_bytes()) == b'{"meta":{"formato":"gzip"},"empleados":[]}'
+
+        JsonStorage(str(path)).add({"id": 1, "nombre": "Ana", "cargo": "Dev"})
+        assert path.read_bytes()[:2] == b"\x1f\x8b"
+        res = runner.invoke(main, ["list-employees", "--file", str(path), "--format", "csv"])
+        assert res.output.splitlines()[1] == "1,Ana,Dev,0"
+
+        res = runner.invoke(main, ["init-db", "--data-dir", tmpdir.name, "--shards", "2", "--format", "zlib"])
+        assert res.exit_code == 0, res.output
+        assert Path(tmpdir.name, "empleados-000.json").read_bytes()[:1] == b"\x78"
+    finally:
+        tmpdir.cleanup()
+
+
+def test_default_file_follows_backend():
+    import json
+
+    from employee_manager.json_storage import JsonStorage
+
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        assert runner.invoke(main, ["init-db"]).exit_code == 0
+        JsonStorage("data/empleados.json").add({"id": 1, "nombre": "Ana", "cargo": "Dev", "contratos": []})
+        res = runner.invoke(main, ["migrate-sqlite"])
+        assert res.exit_code == 0, res.output
+
+        res = runner.invoke(main, ["list-employees", "--backend", "sqlite", "--format", "csv"])
+        assert res.exit_code == 0, res.output
+        assert res.output.splitlines()[1] == "1,Ana,Dev,0"
+        # El archivo JSON no se abre como base SQLite
+        with open("data/empleados.json", encoding="utf-8") as fh:
+            assert json.load(fh)["empleados"][0]["nombre"] == "Ana"
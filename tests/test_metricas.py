@@ -0,0 +1,68 @@
+"""Pruebas para la instrumentación opcional (métricas)."""
+import os
+import tempfile
+
+import pytest
+from click.testing import CliRunner
+
+from employee_manager import gestor_contratos, gestor_empleados, metricas
+from employee_manager.json_storage import JsonStorage
+from employee_manager.journal_storage import JournalStorage
+from employee_manager.main import main
+
+
+@pytest.fixture
+def storage():
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".json")
+    tmp.close()
+    metricas.reiniciar()
+    yield JsonStorage(tmp.name)
+    metricas.desactivar()
+    metricas.reiniciar()
+    os.remove(tmp.name)
+
+
+def test_desactivadas_no_registran_nada(storage):
+    gestor_empleados.agregar_empleado("Ana", "Dev", storage)
+    assert metricas.resumen() == {"tiempos": {}, "contadores": {}}
+
+
+def test_registra_llamadas_latencias_y_bytes(storage):
+    metricas.activar()
+    ana = gestor_empleados.agregar_empleado("Ana", "Dev", storage)
+    gestor_contratos.asociar_contrato(ana["id"], "2023-01-01", "2023-12-31", 3000, storage)
+    storage.invalidate_cache()
+    gestor_empleados.buscar_empleado(ana["id"], storage)
+
+    datos = metricas.resumen()
+    tiempos = datos["tiempos"]
+    assert tiempos["gestor_empleados.agregar_empleado"]["llamadas"] == 1
+    assert tiempos["gestor_contratos.asociar_contrato"]["llamadas"] == 1
+    # asociar_contrato busca al empleado antes de agregarle el contrato
+    assert tiempos["gestor_empleados.buscar_empleado"]["llamadas"] == 2
+    assert tiempos["storage.load_json"]["llamadas"] >= 1
+    for nombre in ("storage.save_json", "json.serializar", "disco.escribir", "json.parsear", "disco.leer"):
+        estadistica = tiempos[nombre]
+        assert sum(estadistica["histograma"].values()) == estadistica["llamadas"]
+        assert 0 <= estadistica["minimo"] <= estadistica["media"] <= estadistica["maximo"]
+
+    tamano = os.path.getsize(storage.file_path)
+    assert datos["contadores"][metricas.BYTES_LEIDOS] == tamano
+    assert datos["contadores"][metricas.BYTES_ESCRITOS] >= tamano
+
+
+def test_journal_load_json_is_timed(storage):
+    journal = JournalStorage(str(storage.file_path))
+    gestor_empleados.agregar_empleado("Ana", "Dev", journal)
+    metricas.activar()
+    JournalStorage(str(storage.file_path)).get_all()
+    assert metricas.resumen()["tiempos"]["storage.load_json"]["llamadas"] == 1
+    os.remove(journal.journal_path)
+
+
+def test_timings_imprime_resumen(storage):
+    gestor_empleados.agregar_empleado("Ana", "Dev", storage)
+    res = CliRunner().invoke(main, ["--timings", "list-employees", "--file", str(storage.file_path), "--cargo", "Dev"])
+    assert res.exit_code == 0, res.output
+    assert "cli.total" in res.output and "consultar_empleados" in res.output
+    assert not metricas.activo()
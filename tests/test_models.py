@@ -1,5 +1,5 @@
 """Pruebas (esqueleto) para los modelos."""
-from employee_manager.models import Employee, Contract
+from employee_manager.models import Employee, Contract, ContractTable
 
 
 def test_create_employee():
@@ -12,3 +12,39 @@ def test_create_contract():
     contract = Contract(id="c1", employee_id="e1", start_date="2025-01-01")
     assert contract.employee_id == "e1"
     assert contract.start_date == "2025-01-01"
+
+
+def test_employee_dict_round_trip():
+    data = {
+        "id": 1,
+        "nombre": "Ana",
+        "cargo": "Dev",
+        "contratos": [
+            {"id_contrato": 101, "fecha_inicio": "2024-01-01", "fecha_fin": "2024-12-31", "salario": 3000}
+        ],
+    }
+    employee = Employee.from_dict(data)
+    assert employee.contratos == [Contract(101, "2024-01-01", "2024-12-31", 3000)]
+    assert employee.to_dict() == data
+    assert not hasattr(employee, "__dict__")
+
+
+def test_contract_table_columns():
+    empleados = [
+        {"id": 1, "contratos": [
+            {"id_contrato": 101, "fecha_inicio": "2024-01-01", "fecha_fin": "2024-12-31", "salario": 3000},
+            {"id_contrato": 102, "fecha_inicio": "2025-1-1", "fecha_fin": None, "salario": 3100.5},
+        ]},
+        {"id": 2, "contratos": []},
+        {"id": 3, "contratos": [
+            {"id_contrato": 101, "fecha_inicio": "2023-05-01", "fecha_fin": "2023-10-31", "salario": 2500},
+        ]},
+    ]
+    tabla = ContractTable.from_empleados(empleados)
+
+    assert len(tabla) == 3
+    assert list(tabla.id_empleado) == [1, 1, 3]
+    assert list(tabla.salario) == [3000.0, 3100.5, 2500.0]
+    assert tabla.fin[1] == 0
+    assert tabla.contrato(1) == Contract(102, "2025-01-01", None, 3100.5)
+    assert [c.id_contrato for c in tabla] == [101, 102, 101]
@@ -0,0 +1,83 @@
+"""Pruebas para los reportes de nómina calculados con NumPy."""
+import os
+import tempfile
+
+import pytest
+from click.testing import CliRunner
+
+pytest.importorskip("numpy")
+
+from employee_manager import gestor_contratos, gestor_empleados
+from employee_manager.json_storage import JsonStorage
+from employee_manager.reportes import resumen_salarios_por_cargo, histograma_salarios
+from employee_manager.main import main
+
+
+def _make_storage():
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".json")
+    path = tmp.name
+    tmp.close()
+    return JsonStorage(path), path
+
+
+def _agregar_nomina(storage):
+    ana = gestor_empleados.agregar_empleado("Ana", "Dev", storage)
+    luis = gestor_empleados.agregar_empleado("Luis", "QA", storage)
+    eva = gestor_empleados.agregar_empleado("Eva", "Dev", storage)
+    gestor_empleados.agregar_empleado("Sol", "Soporte", storage)
+    gestor_contratos.asociar_contrato(ana["id"], "2023-01-01", "2023-12-31", 3000, storage)
+    gestor_contratos.asociar_contrato(ana["id"], "2024-01-01", "2024-12-31", 3200, storage)
+    gestor_contratos.asociar_contrato(eva["id"], "2024-01-01", "2024-12-31", 5000, storage)
+    gestor_contratos.asociar_contrato(luis["id"], "2024-01-01", "2024-12-31", 2800, storage)
+
+
+def test_resumen_salarios_por_cargo():
+    storage, path = _make_storage()
+    try:
+        _agregar_nomina(storage)
+        resumen = {fila["cargo"]: fila for fila in resumen_salarios_por_cargo(storage)}
+
+        assert list(resumen) == ["Dev", "QA", "Soporte"]
+        assert resumen["Dev"] == {
+            "cargo": "Dev", "contratos": 3, "total": 11200.0,
+            "promedio": pytest.approx(11200 / 3), "mediana": 3200.0,
+        }
+        assert resumen["QA"]["mediana"] == 2800.0
+        assert resumen["Soporte"] == {
+            "cargo": "Soporte", "contratos": 0, "total": 0.0, "promedio": None, "mediana": None,
+        }
+    finally:
+        os.remove(path)
+
+
+def test_histograma_salarios():
+    storage, path = _make_storage()
+    try:
+        assert histograma_salarios(storage) == {"bordes": [], "conteos": []}
+
+        _agregar_nomina(storage)
+        histograma = histograma_salarios(storage, bins=2)
+        assert histograma["bordes"] == [2800.0, 3900.0, 5000.0]
+        assert histograma["conteos"] == [3, 1]
+
+        assert histograma_salarios(storage, bins=2, cargo="Dev")["conteos"] == [2, 1]
+        assert histograma_salarios(storage, cargo="Gerente")["conteos"] == []
+    finally:
+        os.remove(path)
+
+
+def test_payroll_report_reads_storage_once(monkeypatch):
+    storage, path = _make_storage()
+    try:
+        _agregar_nomina(storage)
+        lecturas = []
+        original_iter = JsonStorage.iter_empleados
+        monkeypatch.setattr(JsonStorage, "iter_empleados", lambda self: lecturas.append(1) or original_iter(self))
+
+        res = CliRunner().invoke(main, ["payroll-report", "--file", path, "--bins", "2"])
+
+        assert res.exit_code == 0, res.output
+        assert "Dev" in res.output and "5,000.00" in res.output
+        assert len(lecturas) == 1
+    finally:
+        os.remove(path)
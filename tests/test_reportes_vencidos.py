@@ -0,0 +1,65 @@
+"""Pruebas para el reporte de empleados con contratos vencidos."""
+import os
+import tempfile
+
+from employee_manager import gestor_contratos, gestor_empleados
+from employee_manager.json_storage import JsonStorage
+from employee_manager.reportes import obtener_empleados_con_contratos_vencidos
+
+
+def _make_storage():
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".json")
+    path = tmp.name
+    tmp.close()
+    return JsonStorage(path), path
+
+
+def _agregar_con_contratos(storage):
+    ana = gestor_empleados.agregar_empleado("Ana", "Dev", storage)
+    luis = gestor_empleados.agregar_empleado("Luis", "QA", storage)
+    eva = gestor_empleados.agregar_empleado("Eva", "Dev", storage)
+    gestor_contratos.asociar_contrato(ana["id"], "2023-01-01", "2024-03-31", 3000, storage)
+    gestor_contratos.asociar_contrato(ana["id"], "2022-01-01", "2022-12-31", 2500, storage)
+    gestor_contratos.asociar_contrato(luis["id"], "2023-01-01", "2023-06-30", 2800, storage)
+    gestor_contratos.asociar_contrato(eva["id"], "2024-01-01", "2099-12-31", 4000, storage)
+
+
+def _resumen(grupos):
+    return [
+        (g["empleado"]["nombre"], [c["fecha_fin"] for c in g["contratos_vencidos"]])
+        for g in grupos
+    ]
+
+
+def test_agrupa_contratos_vencidos_por_empleado():
+    storage, path = _make_storage()
+    try:
+        _agregar_con_contratos(storage)
+        grupos = obtener_empleados_con_contratos_vencidos(storage, "2024-06-01")
+
+        assert _resumen(grupos) == [
+            ("Ana", ["2022-12-31", "2024-03-31"]),
+            ("Luis", ["2023-06-30"]),
+        ]
+        assert grupos[0]["contratos_vencidos"][0]["nombre_empleado"] == "Ana"
+        assert len(grupos[0]["empleado"]["contratos"]) == 2
+        assert obtener_empleados_con_contratos_vencidos(storage, "2024-06-01", workers=2) == grupos
+        assert obtener_empleados_con_contratos_vencidos(storage, "2024-13-01") == []
+    finally:
+        os.remove(path)
+
+
+def test_filtra_por_rango_de_fechas_y_cargo():
+    storage, path = _make_storage()
+    try:
+        _agregar_con_contratos(storage)
+
+        grupos = obtener_empleados_con_contratos_vencidos(storage, "2024-06-01", desde="2023-01-01")
+        assert _resumen(grupos) == [("Luis", ["2023-06-30"]), ("Ana", ["2024-03-31"])]
+
+        grupos = obtener_empleados_con_contratos_vencidos(storage, "2024-06-01", cargo="Dev")
+        assert _resumen(grupos) == [("Ana", ["2022-12-31", "2024-03-31"])]
+
+        assert obtener_empleados_con_contratos_vencidos(storage, "2024-06-01", desde="ayer") == []
+    finally:
+        os.remove(path)
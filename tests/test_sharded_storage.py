@@ -0,0 +1,156 @@
+"""Pruebas para ShardedStorage."""
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from employee_manager.sharded_storage import ShardedStorage, inicializar_shards
+from employee_manager.concurrencia import ConflictoDeVersion
+from employee_manager import gestor_empleados, gestor_contratos
+from employee_manager.main import main
+
+
+def _make_storage(shards=4):
+    tmpdir = tempfile.TemporaryDirectory()
+    manifest = os.path.join(tmpdir.name, "empleados.shards.json")
+    inicializar_shards(manifest, shards)
+    return ShardedStorage(manifest), tmpdir
+
+
+def _shard_ids(path):
+    with open(path, encoding="utf-8") as fh:
+        return [e["id"] for e in json.load(fh)["empleados"]]
+
+
+def test_employees_are_spread_and_only_one_shard_is_rewritten():
+    storage, tmpdir = _make_storage()
+    try:
+        for i in range(1, 9):
+            gestor_empleados.agregar_empleado(f"Empleado {i}", "Dev", storage)
+        assert [_shard_ids(p) for p in storage.rutas_shards] == [[4, 8], [1, 5], [2, 6], [3, 7]]
+
+        antes = [os.stat(p).st_mtime_ns for p in storage.rutas_shards]
+        gestor_contratos.asociar_contrato(6, "2024-01-01", "2024-06-30", 3000, storage)
+        despues = [os.stat(p).st_mtime_ns for p in storage.rutas_shards]
+        assert [a != d for a, d in zip(antes, despues)] == [False, False, True, False]
+
+        assert [e["id"] for e in storage.get_all()] == list(range(1, 9))
+        assert [e["id"] for e in storage.iter_empleados()] == list(range(1, 9))
+        assert gestor_empleados.buscar_empleado(6, storage)["contratos"][0]["id_contrato"] == 101
+        assert gestor_empleados.eliminar_empleado(6, storage) is True
+        assert gestor_empleados.buscar_empleado(6, storage) is None
+    finally:
+        tmpdir.cleanup()
+
+
+def test_expired_contracts_merge_shards_by_end_date():
+    storage, tmpdir = _make_storage(shards=3)
+    try:
+        for i in range(1, 4):
+            gestor_empleados.agregar_empleado(f"Empleado {i}", "Dev", storage)
+        gestor_contratos.asociar_contrato(1, "2023-01-01", "2023-09-30", 3000, storage)
+        gestor_contratos.asociar_contrato(2, "2023-01-01", "2023-03-31", 3000, storage)
+        gestor_contratos.asociar_contrato(3, "2023-01-01", "2023-06-30", 3000, storage)
+
+        vencidos = gestor_contratos.listar_contratos_vencidos(storage, "2024-01-01")
+        assert [c["id_empleado"] for c in vencidos] == [2, 3, 1]
+        assert gestor_contratos.listar_contratos_vencidos(storage, "2024-01-01", workers=2) == vencidos
+    finally:
+        tmpdir.cleanup()
+
+
+def test_batch_rolls_back_every_shard():
+    storage, tmpdir = _make_storage(shards=2)
+    try:
+        with pytest.raises(ValueError):
+            with storage.batch():
+                storage.add({"id": 1, "nombre": "Ana"})
+                storage.add({"id": 2, "nombre": "Luis"})
+                storage.add({"id": 1, "nombre": "Duplicada"})
+        assert storage.get_all() == []
+    finally:
+        tmpdir.cleanup()
+
+
+def test_conflict_in_one_shard_discards_every_shard_and_ids_are_not_reused():
+    storage, tmpdir = _make_storage(shards=2)
+    try:
+        otro = ShardedStorage(str(storage.manifest_path))
+        gestor_empleados.agregar_empleado("Ana", "Dev", storage)
+        with pytest.raises(ConflictoDeVersion):
+            with storage.batch():
+                gestor_empleados.agregar_empleado("Luis", "Dev", storage)
+                gestor_empleados.agregar_empleado("Eva", "Dev", storage)
+                # Otro proceso escribe en el shard de Luis antes de confirmar el lote
+                gestor_empleados.agregar_empleado("Bea", "QA", otro)
+
+        reabierto = ShardedStorage(str(storage.manifest_path))
+        assert [(e["id"], e["nombre"]) for e in reabierto.get_all()] == [(1, "Ana"), (4, "Bea")]
+        assert gestor_empleados.agregar_empleado("Luis", "Dev", storage)["id"] == 5
+        assert gestor_empleados.agregar_empleado("Eva", "Dev", otro)["id"] == 6
+    finally:
+        tmpdir.cleanup()
+
+
+def test_init_db_with_shards_and_missing_manifest():
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmp:
+        res = runner.invoke(main, ["init-db", "--data-dir", tmp, "--shards", "3"])
+        assert res.exit_code == 0, res.output
+        assert sorted(p.name for p in Path(tmp).iterdir()) == [
+            "empleados-000.json", "empleados-001.json", "empleados-002.json", "empleados.shards.json",
+        ]
+        manifest = str(Path(tmp, "empleados.shards.json"))
+        res = runner.invoke(main, ["list-employees", "--file", manifest, "--backend", "sharded"])
+        assert res.exit_code == 0, res.output
+
+        res = runner.invoke(main, ["list-employees", "--file", str(Path(tmp, "otro.shards.json")), "--backend", "sharded"])
+        assert res.exit_code != 0
+        assert "init-db --shards" in res.output
+
+
+def test_init_db_with_shards_in_default_dir_works_with_backend_only():
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        res = runner.invoke(main, ["init-db", "--shards", "2"])
+        assert res.exit_code == 0, res.output
+        assert "--file" not in res.output
+
+        storage = ShardedStorage("data/empleados.shards.json")
+        gestor_empleados.agregar_empleado("Ana", "Dev", storage)
+        res = runner.invoke(main, ["list-employees", "--backend", "sharded", "--format", "csv"])
+        assert res.exit_code == 0, res.output
+        assert res.output.splitlines()[1] == "1,Ana,Dev,0"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        res = runner.invoke(main, ["init-db", "--data-dir", tmp, "--shards", "2"])
+        assert str(Path(tmp, "empleados.shards.json")) in res.output.replace("\n", "")
+
+
+def test_query_merges_shards_before_paginating():
+    storage, tmpdir = _make_storage(shards=3)
+    try:
+        for nombre, cargo in [("Ana", "Dev"), ("Luis", "QA"), ("Andrea", "Dev"), ("Bea", "Dev"), ("Anibal", "QA")]:
+            gestor_empleados.agregar_empleado(nombre, cargo, storage)
+
+        assert [e["id"] for e in storage.query(cargo="Dev", limit=2, offset=1)] == [3, 4]
+        assert [e["nombre"] for e in storage.query(nombre_prefix="an", order_by="nombre")] == ["Ana", "Andrea", "Anibal"]
+        assert [e["id"] for e in storage.query(order_by="-id", limit=2)] == [5, 4]
+    finally:
+        tmpdir.cleanup()
+
+
+def test_buscar_por_nombre_merges_shards():
+    storage, tmpdir = _make_storage(shards=3)
+    try:
+        for nombre in ["Juan Pérez", "Juana Paz", "María López", "Pedro Juárez", "Juan Peres"]:
+            gestor_empleados.agregar_empleado(nombre, "Dev", storage)
+
+        resultados = storage.buscar_por_nombre("juan perez", limit=2)
+        assert [r["empleado"]["nombre"] for r in resultados] == ["Juan Pérez", "Juan Peres"]
+        assert resultados[0]["similitud"] >= resultados[1]["similitud"]
+    finally:
+        tmpdir.cleanup()
@@ -0,0 +1,198 @@
+"""Pruebas para SqliteStorage."""
+import os
+import tempfile
+
+import pytest
+from click.testing import CliRunner
+
+from employee_manager.json_storage import JsonStorage
+from employee_manager.sqlite_storage import SqliteStorage, migrar_json_a_sqlite
+from employee_manager import gestor_empleados, gestor_contratos
+from employee_manager.main import main
+
+
+def _make_storage():
+    tmpdir = tempfile.TemporaryDirectory()
+    return SqliteStorage(os.path.join(tmpdir.name, "empleados.db")), tmpdir
+
+
+def test_crud_round_trip():
+    storage, tmpdir = _make_storage()
+    try:
+        storage.add({"id": 1, "nombre": "Ana", "cargo": "Dev", "contratos": [], "email": "ana@x.co"})
+        storage.add({"id": 2, "nombre": "Luis", "cargo": "QA", "contratos": []})
+        with pytest.raises(ValueError, match="ya existe"):
+            storage.add({"id": 1, "nombre": "Otra", "cargo": "Dev", "contratos": []})
+
+        storage.update(2, {"cargo": "Lead QA"})
+        assert storage.get_by_id(2)["cargo"] == "Lead QA"
+        assert storage.get_by_id(1)["email"] == "ana@x.co"
+        with pytest.raises(ValueError, match="No se puede cambiar el id"):
+            storage.update(2, {"id": 3})
+
+        storage.delete(1)
+        assert [e["id"] for e in storage.get_all()] == [2]
+        with pytest.raises(ValueError, match="no encontrado"):
+            storage.delete(1)
+    finally:
+        storage.close()
+        tmpdir.cleanup()
+
+
+def test_managers_and_expired_contracts_use_sql():
+    storage, tmpdir = _make_storage()
+    try:
+        ana = gestor_empleados.agregar_empleado("Ana", "Dev", storage)
+        luis = gestor_empleados.agregar_empleado("Luis", "QA", storage)
+        gestor_contratos.asociar_contrato(ana["id"], "2023-01-01", "2023-12-31", 3000, storage)
+        gestor_contratos.asociar_contrato(ana["id"], "2024-01-01", "2099-12-31", 3200, storage)
+        gestor_contratos.asociar_contrato(luis["id"], "2023-01-01", "2024-6-1", 2800, storage)
+
+        vencidos = gestor_contratos.listar_contratos_vencidos(storage, "2024-07-01")
+        assert [(c["id_empleado"], c["id_contrato"]) for c in vencidos] == [(1, 101), (2, 103)]
+        assert vencidos[1]["nombre_empleado"] == "Luis"
+        assert vencidos[1]["fecha_fin"] == "2024-6-1"
+
+        assert len(gestor_contratos.listar_contratos_vencidos(storage)) == 2
+        assert gestor_contratos.listar_contratos_vencidos(storage, "2023-12-31") == []
+    finally:
+        storage.close()
+        tmpdir.cleanup()
+
+
+def test_batch_rolls_back_on_error():
+    storage, tmpdir = _make_storage()
+    try:
+        with pytest.raises(ValueError):
+            with storage.batch():
+                storage.add({"id": 1, "nombre": "Ana", "cargo": "Dev", "contratos": []})
+                storage.add({"id": 1, "nombre": "Ana", "cargo": "Dev", "contratos": []})
+        assert storage.get_all() == []
+    finally:
+        storage.close()
+        tmpdir.cleanup()
+
+
+def test_migrate_sqlite_command():
+    runner = CliRunner()
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "empleados.json")
+        db_path = os.path.join(tmp, "empleados.db")
+        origen = JsonStorage(json_path)
+        emp = gestor_empleados.agregar_empleado("Ana", "Dev", origen)
+        gestor_contratos.asociar_contrato(emp["id"], "2024-01-01", "2024-12-31", 3000, origen)
+
+        res = runner.invoke(main, ["migrate-sqlite", "--file", json_path, "--db", db_path])
+        assert res.exit_code == 0, res.output
+
+        storage = SqliteStorage(db_path)
+        try:
+            assert storage.get_all() == origen.get_all()
+        finally:
+            storage.close()
+
+
+def test_migration_keeps_sequences_of_deleted_records():
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "empleados.json")
+        db_path = os.path.join(tmp, "empleados.db")
+        origen = JsonStorage(json_path)
+        for nombre in ("Ana", "Luis", "Eva"):
+            gestor_empleados.agregar_empleado(nombre, "Dev", origen)
+        gestor_contratos.asociar_contrato(1, "2024-01-01", "2024-12-31", 3000, origen)
+        gestor_contratos.asociar_contrato(3, "2024-01-01", "2024-12-31", 3000, origen)
+        gestor_empleados.eliminar_empleado(3, origen)
+
+        assert migrar_json_a_sqlite(json_path, db_path) == 2
+        storage = SqliteStorage(db_path)
+        try:
+            assert gestor_empleados.agregar_empleado("Bea", "QA", storage)["id"] == 4
+            contrato = gestor_contratos.asociar_contrato(4, "2025-01-01", "2025-12-31", 3100, storage)
+            assert contrato["id_contrato"] == 103
+        finally:
+            storage.close()
+
+
+def test_iter_empleados_merges_contracts():
+    storage, tmpdir = _make_storage()
+    try:
+        for nombre in ("Ana", "Luis", "Eva"):
+            gestor_empleados.agregar_empleado(nombre, "Dev", storage)
+        gestor_contratos.asociar_contrato(3, "2024-01-01", "2024-12-31", 3000, storage)
+        gestor_contratos.asociar_contrato(1, "2024-01-01", "2024-12-31", 3000, storage)
+        gestor_contratos.asociar_contrato(3, "2025-01-01", "2025-12-31", 3100, storage)
+
+        assert list(storage.iter_empleados()) == storage.get_all()
+        assert [len(e["contratos"]) for e in storage.iter_empleados()] == [1, 0, 2]
+    finally:
+        storage.close()
+        tmpdir.cleanup()
+
+
+def test_tabla_contratos_matches_json_storage():
+    storage, tmpdir = _make_storage()
+    try:
+        origen = JsonStorage(os.path.join(tmpdir.name, "empleados.json"))
+        for destino in (origen, storage):
+            gestor_empleados.agregar_empleado("Ana", "Dev", destino)
+            gestor_empleados.agregar_empleado("Luis", "QA", destino)
+            gestor_contratos.asociar_contrato(2, "2024-01-01", "2024-12-31", 3000, destino)
+            gestor_contratos.asociar_contrato(1, "2024-2-1", "2025-01-31", 2500, destino)
+
+        tabla_sql, tabla_json = storage.tabla_contratos(), origen.tabla_contratos()
+        for columna in ("id_empleado", "id_contrato", "inicio", "fin", "salario"):
+            assert getattr(tabla_sql, columna) == getattr(tabla_json, columna)
+    finally:
+        storage.close()
+        tmpdir.cleanup()
+
+
+def test_reservar_ids_uses_sequence_table():
+    storage, tmpdir = _make_storage()
+    try:
+        storage.add({"id": 4, "nombre": "Ana", "cargo": "Dev", "contratos": [{"id_contrato": 120}]})
+        assert storage.reservar_ids("next_id", 10) == 5
+        assert storage.reservar_ids("next_contract_id") == 121
+        storage.delete(4)
+        assert gestor_empleados.agregar_empleado("Luis", "QA", storage)["id"] == 15
+    finally:
+        storage.close()
+        tmpdir.cleanup()
+
+
+@pytest.mark.parametrize("kwargs", [
+    {},
+    {"cargo": "Dev", "limit": 2, "offset": 1},
+    {"nombre_prefix": "an"},
+    {"nombre_prefix": "A", "cargo": "QA"},
+    {"order_by": "-nombre", "limit": 3},
+    {"order_by": "cargo"},
+])
+def test_query_matches_json_storage(kwargs):
+    storage, tmpdir = _make_storage()
+    try:
+        json_storage = JsonStorage(os.path.join(tmpdir.name, "empleados.json"))
+        for i, (nombre, cargo) in enumerate([("Ana", "Dev"), ("luis", "QA"), ("Andrea", "QA"), ("Bea", "Dev"), ("Anibal", "Dev")], 1):
+            registro = {"id": i, "nombre": nombre, "cargo": cargo, "contratos": []}
+            storage.add(registro)
+            json_storage.add(dict(registro))
+        assert storage.query(**kwargs) == json_storage.query(**kwargs)
+    finally:
+        storage.close()
+        tmpdir.cleanup()
+
+
+def test_buscar_por_nombre_matches_json_storage():
+    storage, tmpdir = _make_storage()
+    json_storage = JsonStorage(os.path.join(tmpdir.name, "empleados.json"))
+    try:
+        for nombre in ["Juan Pérez", "Juana Paz", "María López", "Pedro Juárez"]:
+            gestor_empleados.agregar_empleado(nombre, "Dev", storage)
+            gestor_empleados.agregar_empleado(nombre, "Dev", json_storage)
+
+        for texto in ["jaun perez", "maria", "Juarez"]:
+            assert (gestor_empleados.buscar_por_nombre(texto, storage)
+                    == gestor_empleados.buscar_por_nombre(texto, json_storage))
+    finally:
+        storage.close()
+        tmpdir.cleanup()